@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import UserProfile, Job, JobApplication
+from .models import UserProfile, Job, JobApplication, Skill, OutboxEmail, StoredFile
 
 @admin.register(UserProfile)
 class UserProfileAdmin(admin.ModelAdmin):
@@ -18,3 +18,19 @@ class JobApplicationAdmin(admin.ModelAdmin):
     list_display = ['job', 'applicant', 'applied_at']
     list_filter = ['applied_at']
     search_fields = ['job__title', 'applicant__user__username']
+
+@admin.register(Skill)
+class SkillAdmin(admin.ModelAdmin):
+    list_display = ['name']
+    search_fields = ['name']
+
+@admin.register(OutboxEmail)
+class OutboxEmailAdmin(admin.ModelAdmin):
+    list_display = ['subject', 'status', 'attempts', 'next_attempt_at', 'created_at']
+    list_filter = ['status']
+    search_fields = ['subject', 'last_error']
+
+@admin.register(StoredFile)
+class StoredFileAdmin(admin.ModelAdmin):
+    list_display = ['name', 'size', 'ref_count', 'created_at']
+    search_fields = ['name', 'sha256']
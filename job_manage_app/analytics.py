@@ -0,0 +1,206 @@
+from collections import Counter, defaultdict
+from datetime import timedelta
+from django.db import transaction
+from django.db.models import Count, F, Q
+from django.db.models.functions import Greatest, TruncDate
+from django.utils import timezone
+from .models import Job, JobApplication, JobSkill, JobDailyStats, CategoryDailyStats, SkillDemand
+
+# Periods offered on the analytics page, in days
+ANALYTICS_PERIODS = [7, 30, 90]
+TOP_SKILLS = 20
+
+
+def _add(model, key_fields, field, counts):
+    """Add counts ({key tuple: amount}) to model.field, creating missing rows.
+
+    Rows are inserted at 0 with INSERT OR IGNORE and then incremented with
+    F(), so concurrent writers cannot lose each other's additions. Keys with
+    the same amount share one UPDATE. Decrements stop at 0, so a row that is
+    missing or behind (say, from before a backfill) cannot fail a save.
+    """
+    if not counts:
+        return
+    model.objects.bulk_create(
+        [model(**dict(zip(key_fields, key))) for key in counts], batch_size=500, ignore_conflicts=True,
+    )
+    by_amount = defaultdict(list)
+    for key, amount in counts.items():
+        by_amount[amount].append(key)
+    for amount, keys in by_amount.items():
+        value = F(field) + amount if amount >= 0 else Greatest(F(field) + amount, 0)
+        for start in range(0, len(keys), 100):
+            match = Q()
+            for key in keys[start:start + 100]:
+                match |= Q(**dict(zip(key_fields, key)))
+            model.objects.filter(match).update(**{field: value})
+
+def record_jobs(jobs):
+    # Count newly created jobs per category and day and per required skill
+    jobs = list(jobs)
+    if not jobs:
+        return
+    _add(CategoryDailyStats, ('category', 'day'), 'jobs_posted',
+         Counter((job.category, timezone.localdate(job.created_at)) for job in jobs))
+    skills = JobSkill.objects.filter(job__in=[job.pk for job in jobs]).values_list('skill_id', flat=True)
+    _add(SkillDemand, ('skill_id',), 'jobs_posted', Counter((skill_id,) for skill_id in skills))
+
+def record_application(application):
+    # The rollups count events: deleting an application or job later does not
+    # subtract them (a job's daily rows go with the job)
+    day = timezone.localdate(application.applied_at)
+    # The category and the skill ids in one query, a row per skill (or one
+    # row with no skill)
+    rows = list(Job.objects.filter(pk=application.job_id).values_list('category', 'job_skills__skill_id'))
+    category = rows[0][0] if rows else None
+    _add(JobDailyStats, ('job_id', 'day'), 'applications', {(application.job_id, day): 1})
+    _add(CategoryDailyStats, ('category', 'day'), 'applications', {(category, day): 1})
+    _add(SkillDemand, ('skill_id',), 'applications', {(skill_id,): 1 for _, skill_id in rows if skill_id is not None})
+
+def move_job(job, previous_category, previous_skills=None):
+    """Move an edited job's counts from its old category and skills to the new ones.
+
+    The applications the job has had so far (its JobDailyStats rows) move
+    with it, so the rollups stay what backfill_analytics would write.
+    previous_skills is None when the required skills did not change.
+    """
+    per_day = dict(JobDailyStats.objects.filter(job=job).values_list('day', 'applications'))
+    if job.category != previous_category:
+        posted = timezone.localdate(job.created_at)
+        for category, sign in ((previous_category, -1), (job.category, 1)):
+            _add(CategoryDailyStats, ('category', 'day'), 'jobs_posted', {(category, posted): sign})
+            _add(CategoryDailyStats, ('category', 'day'), 'applications',
+                 {(category, day): sign * applications for day, applications in per_day.items()})
+    if previous_skills is None:
+        return
+    skills = set(JobSkill.objects.filter(job=job).values_list('skill_id', flat=True))
+    applications = sum(per_day.values())
+    for skill_ids, sign in ((previous_skills - skills, -1), (skills - previous_skills, 1)):
+        _add(SkillDemand, ('skill_id',), 'jobs_posted', {(skill_id,): sign for skill_id in skill_ids})
+        if applications:
+            _add(SkillDemand, ('skill_id',), 'applications', {(skill_id,): sign * applications for skill_id in skill_ids})
+
+def _job_ranges(batch_size):
+    # (first, last) job ids of consecutive batches
+    last = 0
+    while True:
+        ids = list(Job.objects.filter(pk__gt=last).order_by('pk').values_list('pk', flat=True)[:batch_size])
+        if not ids:
+            return
+        yield ids[0], ids[-1]
+        last = ids[-1]
+
+def rebuild_rollups(batch_size=1000):
+    """Recompute every rollup from the jobs and applications that exist now.
+
+    Each GROUP BY covers one range of job ids, so it reads that range through
+    the job indexes instead of grouping whole tables at once. Category and
+    skill totals are summed across batches in memory (a few rows per day).
+    Runs in one transaction; returns the number of rows written per table.
+    """
+    category_jobs, category_applications = Counter(), Counter()
+    skill_jobs, skill_applications = Counter(), Counter()
+    with transaction.atomic():
+        for model in (JobDailyStats, CategoryDailyStats, SkillDemand):
+            model.objects.all().delete()
+        job_days = 0
+        for first, last in _job_ranges(batch_size):
+            jobs = Job.objects.filter(pk__gte=first, pk__lte=last)
+            applications = JobApplication.objects.filter(job__gte=first, job__lte=last)
+            for row in jobs.values('category', day=TruncDate('created_at')).annotate(n=Count('id')).order_by():
+                category_jobs[row['category'], row['day']] += row['n']
+            rows = list(
+                applications.values('job_id', 'job__category', day=TruncDate('applied_at'))
+                .annotate(n=Count('id')).order_by()
+            )
+            JobDailyStats.objects.bulk_create(
+                [JobDailyStats(job_id=row['job_id'], day=row['day'], applications=row['n']) for row in rows],
+                batch_size=1000,
+            )
+            job_days += len(rows)
+            for row in rows:
+                category_applications[row['job__category'], row['day']] += row['n']
+            job_skills = JobSkill.objects.filter(job__gte=first, job__lte=last)
+            for row in job_skills.values('skill_id').annotate(n=Count('id')).order_by():
+                skill_jobs[row['skill_id']] += row['n']
+            for row in applications.values(skill=F('job__job_skills__skill_id')).annotate(n=Count('id')).order_by():
+                if row['skill'] is not None:   # jobs without skills
+                    skill_applications[row['skill']] += row['n']
+
+        CategoryDailyStats.objects.bulk_create([
+            CategoryDailyStats(category=category, day=day, jobs_posted=category_jobs[category, day],
+                               applications=category_applications[category, day])
+            for category, day in category_jobs.keys() | category_applications.keys()
+        ], batch_size=1000)
+        SkillDemand.objects.bulk_create([
+            SkillDemand(skill_id=skill_id, jobs_posted=skill_jobs[skill_id], applications=skill_applications[skill_id])
+            for skill_id in skill_jobs.keys() | skill_applications.keys()
+        ], batch_size=1000)
+    return {
+        'job_days': job_days,
+        'category_days': len(category_jobs.keys() | category_applications.keys()),
+        'skills': len(skill_jobs.keys() | skill_applications.keys()),
+    }
+
+def recruiter_report(profile, days):
+    """Everything the analytics page shows, read from the rollups only.
+
+    Three queries: the recruiter's job-days in the period, the category-days
+    in this and the previous period, and the most demanded skills. The rows
+    are few (jobs x days, categories x days), so they are summed here rather
+    than grouped and sorted in SQL.
+    """
+    today = timezone.localdate()
+    since = today - timedelta(days=days - 1)
+    dates = [since + timedelta(days=offset) for offset in range(days)]
+
+    daily = Counter()
+    jobs = {}
+    job_days = JobDailyStats.objects.filter(job__recruiter=profile, day__gte=since).values_list(
+        'job_id', 'job__title', 'day', 'applications',
+    )
+    for job_id, title, day, applications in job_days:
+        daily[day] += applications
+        job = jobs.setdefault(job_id, {'id': job_id, 'title': title, 'applications': 0})
+        job['applications'] += applications
+    jobs = sorted(jobs.values(), key=lambda job: (-job['applications'], job['id']))
+
+    labels = dict(Job.CATEGORY_CHOICES)
+    categories = {}
+    category_days = CategoryDailyStats.objects.filter(day__gte=since - timedelta(days=days)).values_list(
+        'category', 'day', 'jobs_posted', 'applications',
+    )
+    for category, day, jobs_posted, applications in category_days:
+        row = categories.setdefault(category, {
+            'category': category, 'label': labels.get(category, category),
+            'jobs_posted': 0, 'applications': 0, 'previous_applications': 0,
+        })
+        if day >= since:
+            row['jobs_posted'] += jobs_posted
+            row['applications'] += applications
+        else:
+            row['previous_applications'] += applications
+    for row in categories.values():
+        row['per_job'] = round(row['applications'] / row['jobs_posted'], 1) if row['jobs_posted'] else None
+        previous = row['previous_applications']
+        row['change'] = round((row['applications'] - previous) * 100 / previous) if previous else None
+
+    skills = [
+        {'name': demand.skill.name, 'jobs_posted': demand.jobs_posted, 'applications': demand.applications,
+         'per_job': round(demand.applications / demand.jobs_posted, 1) if demand.jobs_posted else None}
+        for demand in SkillDemand.objects.select_related('skill').order_by('-jobs_posted', 'skill')[:TOP_SKILLS]
+    ]
+
+    peak = max(daily.values(), default=0)
+    return {
+        'days': days,
+        'since': since,
+        'total_applications': sum(daily.values()),
+        'daily': [
+            {'day': day, 'applications': daily[day], 'percent': round(daily[day] * 100 / peak) if peak else 0}
+            for day in reversed(dates)
+        ],
+        'jobs': jobs,
+        'categories': sorted(categories.values(), key=lambda row: (-row['applications'], row['category'])),
+        'skills': skills,
+    }
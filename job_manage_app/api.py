@@ -0,0 +1,120 @@
+from django.conf import settings
+from django.db.models import F
+from django.http import JsonResponse
+
+# Public field name -> ORM lookup for each resource, and the fields returned
+# when ?fields= is not given. Large text columns are opt-in.
+JOB_FIELDS = {
+    'id': 'id',
+    'title': 'title',
+    'category': 'category',
+    'number_of_openings': 'number_of_openings',
+    'description': 'description',
+    'required_skills': 'required_skills',
+    'application_count': 'application_count',
+    'created_at': 'created_at',
+    'company': 'recruiter__company_name',
+    'recruiter_name': 'recruiter__display_name',
+}
+JOB_DEFAULT_FIELDS = ['id', 'title', 'category', 'company', 'created_at']
+
+SEEKER_MATCH_FIELDS = {
+    'job_id': 'job_id',
+    'title': 'job__title',
+    'category': 'job__category',
+    'company': 'job__recruiter__company_name',
+    'match_percentage': 'match_percentage',
+    'matched_count': 'matched_count',
+}
+SEEKER_MATCH_DEFAULT_FIELDS = ['job_id', 'title', 'company', 'match_percentage']
+
+CANDIDATE_MATCH_FIELDS = {
+    'seeker_id': 'seeker_id',
+    'name': 'seeker__display_name',
+    'skills': 'seeker__skills',
+    'match_percentage': 'match_percentage',
+    'matched_count': 'matched_count',
+}
+CANDIDATE_MATCH_DEFAULT_FIELDS = ['seeker_id', 'name', 'match_percentage']
+
+SEEKER_APPLICATION_FIELDS = {
+    'id': 'id',
+    'job_id': 'job_id',
+    'title': 'job__title',
+    'company': 'job__recruiter__company_name',
+    'applied_at': 'applied_at',
+}
+SEEKER_APPLICATION_DEFAULT_FIELDS = ['id', 'job_id', 'title', 'applied_at']
+
+RECRUITER_APPLICATION_FIELDS = {
+    'id': 'id',
+    'job_id': 'job_id',
+    'title': 'job__title',
+    'applicant_id': 'applicant_id',
+    'name': 'applicant__display_name',
+    'email': 'applicant__user__email',
+    'skills': 'applicant__skills',
+    'applied_at': 'applied_at',
+}
+RECRUITER_APPLICATION_DEFAULT_FIELDS = ['id', 'job_id', 'name', 'applied_at']
+
+
+class ApiError(Exception):
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+
+def request_profile(request):
+    # The API answers with JSON errors instead of redirecting to the login page
+    if not request.user.is_authenticated:
+        raise ApiError('Authentication required', status=401)
+    if request.profile is None:
+        raise ApiError('Complete your profile first', status=403)
+    return request.profile
+
+def parse_fields(param, available, default):
+    # "?fields=id,title" -> ['id', 'title'], in the order asked for
+    if not param:
+        return list(default)
+    fields = list(dict.fromkeys(name.strip() for name in param.split(',') if name.strip()))
+    unknown = [name for name in fields if name not in available]
+    if unknown or not fields:
+        raise ApiError(f"Unknown fields: {', '.join(unknown) or '(none given)'}. Available: {', '.join(available)}")
+    return fields
+
+def parse_limit(param):
+    # Page size from ?limit=, capped at API_MAX_PAGE_SIZE
+    if not param:
+        return None
+    try:
+        limit = int(param)
+    except ValueError:
+        raise ApiError('limit must be a whole number')
+    return max(1, min(limit, getattr(settings, 'API_MAX_PAGE_SIZE', 100)))
+
+def select_fields(queryset, fields, available, ordering):
+    """Turn queryset into a .values() queryset of the requested fields.
+
+    The ordering keys are always selected too, because keyset_paginate
+    builds the cursors from them. Joined fields come in through F() under
+    their public name.
+    """
+    names = list(dict.fromkeys(fields + [key.lstrip('-') for key in ordering]))
+    plain = [name for name in names if available.get(name, name) == name]
+    aliased = {name: F(available[name]) for name in names if available.get(name, name) != name}
+    return queryset.values(*plain, **aliased)
+
+def page_payload(page, fields):
+    # Drop the ordering keys nobody asked for
+    return {
+        'results': [{name: row[name] for name in fields} for row in page],
+        'next_cursor': page.next_cursor,
+        'previous_cursor': page.previous_cursor,
+    }
+
+def api_response(data, status=200):
+    return JsonResponse(data, status=status, json_dumps_params={'separators': (',', ':')})
+
+def api_error(message, status=400):
+    return api_response({'error': message}, status=status)
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class JobManageAppConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'job_manage_app'
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,16 @@
+from django.urls import path
+from . import async_views
+from .urls import urlpatterns as sync_urlpatterns
+
+# Same routes as urls.py, with the read-heavy pages swapped for async views
+ASYNC_VIEWS = {
+    'home': async_views.home,
+    'job_list': async_views.job_list,
+    'dashboard': async_views.dashboard,
+    'my_applications': async_views.my_applications,
+}
+
+urlpatterns = [
+    path(str(pattern.pattern), ASYNC_VIEWS.get(pattern.name, pattern.callback), name=pattern.name)
+    for pattern in sync_urlpatterns
+]
@@ -0,0 +1,97 @@
+"""Async versions of the read-heavy views, served under ASGI.
+
+These mirror home, job_list, dashboard and my_applications in views.py
+but use the async ORM API, so an ASGI server does not need a worker
+thread per request. Templates are rendered synchronously, so everything
+they touch (including user.userprofile in base.html) is loaded first.
+"""
+from django.conf import settings
+from django.contrib import messages
+from django.contrib.auth.decorators import login_required
+from django.shortcuts import render, redirect
+from .auth import aload_profile
+from .counters import aattach_application_counts
+from .fragments import aattach_job_cards
+from .models import Job, JobApplication
+from .pagination import akeyset_paginate
+from .result_cache import acached_job_result, normalize_search
+from .search import search_jobs
+from .skills import amatched_jobs_for_seeker
+
+
+async def load_profile(request):
+    # ProfileMiddleware has normally done this already; then it is free
+    request.profile = await aload_profile(request)
+    return request.profile
+
+async def home(request):
+    await load_profile(request)
+    return render(request, 'jobportal/home.html')
+
+async def job_list(request):
+    await load_profile(request)
+    search_query = request.GET.get('search')
+    category = request.GET.get('category')
+    cursor = request.GET.get('cursor')
+
+    async def fetch_page():
+        jobs = Job.objects.select_related('recruiter')
+        ordering = ['-created_at', '-id']
+        if search_query:
+            jobs = search_jobs(jobs, search_query)
+            if 'search_rank' in jobs.query.annotations:
+                ordering.insert(0, 'search_rank')
+        if category:
+            jobs = jobs.filter(category=category)
+        page = await akeyset_paginate(jobs, ordering, cursor, with_count=True)
+        await aattach_job_cards(page, 'job_list')
+        return page
+
+    params = {
+        'search': normalize_search(search_query),
+        'category': category,
+        'cursor': cursor,
+        'per_page': settings.PAGINATION_PAGE_SIZE,
+    }
+    context = {
+        'jobs': await aattach_application_counts(await acached_job_result('job_list', params, fetch_page)),
+        'search_query': search_query,
+        'selected_category': category,
+        'categories': Job.CATEGORY_CHOICES,
+    }
+    return render(request, 'jobportal/job_list.html', context)
+
+@login_required
+async def dashboard(request):
+    profile = await load_profile(request)
+    if profile is None:
+        messages.error(request, 'Please complete your profile.')
+        return redirect('profile')
+
+    context = {'profile': profile}
+    if profile.user_type == 'recruiter':
+        jobs = [job async for job in Job.objects.filter(recruiter=profile).select_related('recruiter')]
+        context['jobs'] = await aattach_job_cards(jobs, 'recruiter_job')
+    else:
+        context['matched_jobs'] = await amatched_jobs_for_seeker(profile, limit=5)  # Top 5 matches
+        await aattach_job_cards([match.job for match in context['matched_jobs']], 'match')
+    return render(request, 'jobportal/dashboard.html', context)
+
+@login_required
+async def my_applications(request):
+    profile = await load_profile(request)
+    if profile is None:
+        messages.error(request, 'Please complete your profile first.')
+        return redirect('profile')
+    if profile.user_type != 'jobseeker':
+        messages.error(request, 'Only job seekers can view applications.')
+        return redirect('dashboard')
+
+    applications = await akeyset_paginate(
+        JobApplication.objects.filter(applicant=profile).select_related('job__recruiter'),
+        ['-applied_at', '-id'], request.GET.get('cursor'), with_count=True,
+    )
+    return render(request, 'jobportal/my_applications.html', {
+        'applications': applications,
+        'profile': profile
+    })
@@ -0,0 +1,75 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import caches
+from django.core.exceptions import ObjectDoesNotExist
+from django.db import transaction
+from .models import UserProfile
+
+USER_CACHE_KEY = 'auth-user:{}'
+
+
+def get_user_cache():
+    # None when USER_CACHE_ALIAS is None (no shared cache configured)
+    alias = getattr(settings, 'USER_CACHE_ALIAS', 'sessions')
+    return caches[alias] if alias else None
+
+def profile_of(user):
+    # The user's UserProfile, or None when signed out or without one
+    try:
+        return user.userprofile if user.is_authenticated else None
+    except ObjectDoesNotExist:
+        return None
+
+async def aload_profile(request):
+    """Resolve request.user for async code and return its profile (or None).
+
+    Templates are rendered synchronously, so the profile is cached on the
+    user (even a missing one) and base.html never queries.
+    """
+    user = request.user = await request.auser()
+    if not user.is_authenticated:
+        return None
+    related = get_user_model().userprofile.related
+    if not related.is_cached(user):
+        # Users not loaded by ProfileBackend
+        related.set_cached_value(user, await UserProfile.objects.filter(user=user).afirst())
+    return related.get_cached_value(user)
+
+def forget_cached_users(user_ids):
+    """Drop the cached users once the current transaction commits.
+
+    Call after any write to a user or profile row that skips the model
+    signals. Deleting before the commit would let a concurrent request read
+    the old row and cache it again. The ids are read now, while the caller's
+    rows are still in place.
+    """
+    cache = get_user_cache()
+    if cache is None:
+        return
+    keys = [USER_CACHE_KEY.format(user_id) for user_id in user_ids]
+    if keys:
+        transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+class ProfileBackend(ModelBackend):
+    """ModelBackend whose request user comes with its UserProfile attached.
+
+    The user and profile are read in one joined query and, when a user
+    cache is configured, cached, so with cached sessions a warm request
+    makes no auth queries at all. A missing profile is cached too
+    (user.userprofile raises without a query). The signals drop the entry
+    whenever the user or profile changes.
+    """
+
+    def get_user(self, user_id):
+        cache = get_user_cache()
+        key = USER_CACHE_KEY.format(user_id)
+        user = cache.get(key) if cache is not None else None
+        if user is None:
+            user = get_user_model()._default_manager.select_related('userprofile').filter(pk=user_id).first()
+            if user is None:
+                return None
+            if cache is not None:
+                cache.set(key, user, getattr(settings, 'USER_CACHE_TIMEOUT', 300))
+        return user if self.user_can_authenticate(user) else None
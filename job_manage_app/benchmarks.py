@@ -0,0 +1,70 @@
+import math
+import subprocess
+from django.conf import settings
+from django.db.models import Count
+from django.urls import reverse
+from django.utils import timezone
+
+
+def percentile(values, pct):
+    # Nearest-rank percentile of an unsorted list
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(math.ceil(pct / 100 * len(ordered)), 1)
+    return ordered[rank - 1]
+
+def summarize_latencies(seconds):
+    milliseconds = [value * 1000 for value in seconds]
+    return {
+        'samples': len(milliseconds),
+        'mean_ms': round(sum(milliseconds) / len(milliseconds), 3) if milliseconds else None,
+        'p50_ms': round(percentile(milliseconds, 50), 3) if milliseconds else None,
+        'p95_ms': round(percentile(milliseconds, 95), 3) if milliseconds else None,
+        'p99_ms': round(percentile(milliseconds, 99), 3) if milliseconds else None,
+        'max_ms': round(max(milliseconds), 3) if milliseconds else None,
+    }
+
+def run_metadata(**extra):
+    # Enough context to compare two JSON reports from different commits
+    try:
+        commit = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=settings.BASE_DIR,
+            capture_output=True, text=True, timeout=5,
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    return {'commit': commit, 'timestamp': timezone.now().isoformat(), **extra}
+
+def pick_profile(username, user_type, busiest_by):
+    # The named profile, or the one with the most related rows (None if there is none)
+    from .models import UserProfile
+    profiles = UserProfile.objects.select_related('user').filter(user_type=user_type)
+    if username:
+        return profiles.filter(user__username=username).first()
+    return profiles.annotate(weight=Count(busiest_by)).order_by('-weight', 'id').first()
+
+def view_cases(job, search):
+    # (name, who, url, params) for the main views; who is "anonymous", "seeker" or "recruiter"
+    return [
+        ('home', 'anonymous', reverse('home'), {}),
+        ('job_list', 'anonymous', reverse('job_list'), {}),
+        ('job_list_search', 'anonymous', reverse('job_list'), {'search': search}),
+        ('job_list_category', 'anonymous', reverse('job_list'), {'category': job.category}),
+        ('dashboard_seeker', 'seeker', reverse('dashboard'), {}),
+        ('dashboard_recruiter', 'recruiter', reverse('dashboard'), {}),
+        ('skill_match_seeker', 'seeker', reverse('skill_match'), {}),
+        ('skill_match_recruiter', 'recruiter', reverse('skill_match'), {}),
+        ('apply_job', 'seeker', reverse('apply_job', args=[job.id]), {}),
+        ('my_applications', 'seeker', reverse('my_applications'), {}),
+        ('all_applications', 'recruiter', reverse('all_applications'), {}),
+        ('job_applications', 'recruiter', reverse('job_applications', args=[job.id]), {}),
+        ('candidate_search', 'recruiter', reverse('candidate_search'), {'q': search}),
+        ('recruiter_analytics', 'recruiter', reverse('recruiter_analytics'), {'days': 90}),
+        ('api_jobs', 'anonymous', reverse('api_jobs'), {}),
+        ('api_jobs_search', 'anonymous', reverse('api_jobs'), {'search': search}),
+        ('api_matches_seeker', 'seeker', reverse('api_matches'), {}),
+        ('api_matches_recruiter', 'recruiter', reverse('api_matches'), {'job': job.id}),
+        ('api_applications_seeker', 'seeker', reverse('api_applications'), {}),
+        ('api_applications_recruiter', 'recruiter', reverse('api_applications'), {}),
+    ]
@@ -0,0 +1,55 @@
+from django.db.models import Count, F, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+from .auth import forget_cached_users
+from .models import UserProfile, Job, JobApplication
+
+
+def adjust_application_counts(job_id, delta):
+    """Add delta to a job's application_count and its recruiter's total.
+
+    F() expressions make the database do the arithmetic, so concurrent
+    applications to the same job cannot overwrite each other's increment.
+    """
+    Job.objects.filter(pk=job_id).update(application_count=F('application_count') + delta)
+    recruiters = UserProfile.objects.filter(job=job_id)
+    recruiters.update(applications_received=F('applications_received') + delta)
+    # The signed-in recruiter's cached profile carries the old total
+    forget_cached_users(recruiters.values_list('user_id', flat=True))
+
+def attach_application_counts(jobs):
+    """Set each job's application_count from the database.
+
+    Cached job pages are invalidated by job saves only, not by applications,
+    so the counter is read live for the page's jobs (one primary key query).
+    """
+    counts = dict(Job.objects.filter(pk__in=[job.pk for job in jobs]).values_list('pk', 'application_count'))
+    for job in jobs:
+        job.application_count = counts.get(job.pk, job.application_count)
+    return jobs
+
+async def aattach_application_counts(jobs):
+    counts = {
+        pk: count
+        async for pk, count in Job.objects.filter(pk__in=[job.pk for job in jobs]).values_list('pk', 'application_count')
+    }
+    for job in jobs:
+        job.application_count = counts.get(job.pk, job.application_count)
+    return jobs
+
+def _counted(queryset, group_by):
+    # Correlated COUNT subquery, 0 when there are no rows
+    counts = queryset.order_by().values(group_by).annotate(total=Count('id')).values('total')
+    return Coalesce(Subquery(counts), Value(0))
+
+def reconcile_application_counts():
+    """Recount every job's and recruiter's applications; return (jobs, recruiters) fixed."""
+    job_total = _counted(JobApplication.objects.filter(job=OuterRef('pk')), 'job')
+    jobs = Job.objects.annotate(actual=job_total).exclude(application_count=F('actual'))
+    fixed_jobs = jobs.update(application_count=job_total)
+
+    recruiter_total = _counted(JobApplication.objects.filter(job__recruiter=OuterRef('pk')), 'job__recruiter')
+    recruiters = UserProfile.objects.annotate(actual=recruiter_total).exclude(applications_received=F('actual'))
+    drifted_users = list(recruiters.values_list('user_id', flat=True))
+    fixed_recruiters = recruiters.update(applications_received=recruiter_total)
+    forget_cached_users(drifted_users)
+    return fixed_jobs, fixed_recruiters
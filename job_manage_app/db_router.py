@@ -0,0 +1,45 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from django.conf import settings
+
+# Only the portal's own tables are read from the read connection; sessions
+# and auth stay on the primary so a login is visible on the next request
+ROUTED_APPS = {'job_manage_app'}
+
+_read_only = ContextVar('read_only_request', default=False)
+
+
+@contextmanager
+def read_only():
+    # Mark the current request (or block of code) as safe to read from READ_DATABASE
+    token = _read_only.set(True)
+    try:
+        yield
+    finally:
+        _read_only.reset(token)
+
+
+class ReadReplicaRouter:
+    """Send reads made inside read_only() to the settings.READ_DATABASE alias.
+
+    ReadOnlyRequestMiddleware wraps GET and HEAD requests in read_only().
+    Writes, migrations and everything outside those requests use "default".
+    With READ_DATABASE unset the router does nothing.
+    """
+
+    def db_for_read(self, model, **hints):
+        if _read_only.get() and model._meta.app_label in ROUTED_APPS:
+            return settings.READ_DATABASE
+        return None
+
+    def db_for_write(self, model, **hints):
+        # Objects loaded from the read connection are saved to the primary
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        if {obj1._state.db, obj2._state.db} <= {'default', settings.READ_DATABASE}:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, **hints):
+        return db == 'default'
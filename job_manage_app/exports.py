@@ -0,0 +1,69 @@
+import csv
+import json
+from django.db.models import OuterRef, Subquery
+from .models import JobApplication, JobMatch
+
+EXPORT_FORMATS = {'csv': 'text/csv; charset=utf-8', 'jsonl': 'application/x-ndjson'}
+EXPORT_COLUMNS = [
+    'application_id', 'job_id', 'job_title', 'applicant_name', 'email',
+    'skills', 'match_percentage', 'applied_at', 'resume_url',
+]
+EXPORT_CHUNK_SIZE = 2000   # rows fetched per database round trip
+WRITE_BUFFER_SIZE = 64 * 1024   # bytes of output joined per chunk sent to the server
+
+
+class _Echo:
+    # csv.writer target that hands each formatted line straight back
+    def write(self, value):
+        return value
+
+
+def application_rows(recruiter, job=None):
+    """One joined query over a recruiter's applications, as value tuples.
+
+    The match percentage comes from JobMatch through a correlated subquery,
+    so no row needs a second query.
+    """
+    applications = JobApplication.objects.filter(job__recruiter=recruiter)
+    if job is not None:
+        applications = applications.filter(job=job)
+    match = JobMatch.objects.filter(job=OuterRef('job'), seeker=OuterRef('applicant')).values('match_percentage')[:1]
+    return (
+        applications
+        .annotate(match_percentage=Subquery(match))
+        .order_by('-applied_at', '-id')
+        .values_list(
+            'id', 'job_id', 'job__title', 'applicant__display_name', 'applicant__user__email',
+            'applicant__skills', 'match_percentage', 'applied_at', 'applicant_id', 'applicant__resume',
+        )
+    )
+
+def export_records(rows, resume_url):
+    # resume_url(profile_id) builds the download link; formatting per row is plain Python
+    for app_id, job_id, title, name, email, skills, pct, applied_at, applicant_id, resume in rows.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+        yield [
+            app_id, job_id, title, name, email, skills or '',
+            round(pct, 1) if pct is not None else None,
+            applied_at.isoformat(), resume_url(applicant_id) if resume else '',
+        ]
+
+def _buffered(lines):
+    # Join small lines so the server is not handed one write per row
+    buffer, size = [], 0
+    for line in lines:
+        buffer.append(line)
+        size += len(line)
+        if size >= WRITE_BUFFER_SIZE:
+            yield ''.join(buffer)
+            buffer, size = [], 0
+    if buffer:
+        yield ''.join(buffer)
+
+def stream_csv(records):
+    writer = csv.writer(_Echo())
+    # The header goes out before the query runs, so the download starts at once
+    yield writer.writerow(EXPORT_COLUMNS)
+    yield from _buffered(writer.writerow(['' if value is None else value for value in record]) for record in records)
+
+def stream_jsonl(records):
+    yield from _buffered(json.dumps(dict(zip(EXPORT_COLUMNS, record))) + '\n' for record in records)
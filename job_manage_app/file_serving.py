@@ -0,0 +1,92 @@
+import re
+from django.conf import settings
+from django.http import FileResponse, HttpResponse, HttpResponseNotModified
+from django.utils.http import content_disposition_header
+
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+class _FileRange:
+    # Reads at most length bytes from offset; no tell/seek, so FileResponse
+    # leaves Content-Length to us
+    def __init__(self, file, offset, length):
+        file.seek(offset)
+        self.file = file
+        self.remaining = length
+        self.name = file.name
+
+    def read(self, size=-1):
+        if self.remaining <= 0:
+            return b''
+        size = self.remaining if size < 0 else min(size, self.remaining)
+        data = self.file.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def close(self):
+        self.file.close()
+
+
+def parse_range(header, size):
+    """Return (start, end) inclusive for a single byte range, or None.
+
+    Multiple ranges and malformed headers return None, which means serve
+    the whole file. An unsatisfiable range returns (size, size).
+    """
+    match = RANGE_RE.match(header.strip())
+    if not match or match.groups() == ('', ''):
+        return None
+    first, last = match.groups()
+    if not first:
+        # bytes=-500 is the last 500 bytes
+        length = int(last)
+        if length == 0:
+            return size, size
+        return max(size - length, 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if last and int(last) < start:
+        return None
+    if start >= size:
+        return size, size
+    return start, end
+
+def serve_stored_file(request, storage, name, filename=''):
+    """Stream a stored file with ETag revalidation and single byte ranges.
+
+    With RESUME_SENDFILE_HEADER set (X-Accel-Redirect for nginx,
+    X-Sendfile for Apache) the body and ranges are left to the proxy.
+    """
+    etag = storage.etag(name)
+    disposition = content_disposition_header(False, filename) if filename else None
+    headers = {'ETag': etag, 'Cache-Control': 'private, no-cache', 'Accept-Ranges': 'bytes'}
+    if disposition:
+        headers['Content-Disposition'] = disposition
+    if etag in [tag.strip() for tag in request.headers.get('If-None-Match', '').split(',')]:
+        return HttpResponseNotModified(headers={'ETag': etag})
+
+    sendfile_header = getattr(settings, 'RESUME_SENDFILE_HEADER', None)
+    if sendfile_header:
+        response = HttpResponse(headers=headers)
+        prefix = getattr(settings, 'RESUME_SENDFILE_PREFIX', '')
+        response[sendfile_header] = f'{prefix}{name}' if sendfile_header == 'X-Accel-Redirect' else storage.path(name)
+        # Let the proxy pick the type from the file
+        del response['Content-Type']
+        return response
+
+    size = storage.size(name)
+    byte_range = None
+    if 'Range' in request.headers and request.headers.get('If-Range', etag) == etag:
+        byte_range = parse_range(request.headers['Range'], size)
+    if byte_range is None:
+        response = FileResponse(storage.open(name, 'rb'), filename=filename)
+    elif byte_range[0] >= size:
+        return HttpResponse(status=416, headers={'Content-Range': f'bytes */{size}'})
+    else:
+        start, end = byte_range
+        response = FileResponse(_FileRange(storage.open(name, 'rb'), start, end - start + 1), status=206, filename=filename)
+        response['Content-Length'] = end - start + 1
+        response['Content-Range'] = f'bytes {start}-{end}/{size}'
+    for header, value in headers.items():
+        response[header] = value
+    return response
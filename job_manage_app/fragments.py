@@ -0,0 +1,79 @@
+import threading
+from django.conf import settings
+from django.core.cache import caches
+from django.template.loader import get_template
+from django.utils.safestring import mark_safe
+
+# The viewer-independent part of a job card, one template per page layout.
+# Match percentages, applied state and counters stay in the page templates.
+JOB_CARD_TEMPLATES = {
+    'job_list': 'jobportal/cards/job_list.html',
+    'recruiter_job': 'jobportal/cards/recruiter_job.html',
+    'match': 'jobportal/cards/match.html',
+    'skill_match': 'jobportal/cards/skill_match.html',
+}
+
+# Per-process counters, reported by the request_stats endpoint; the lock
+# keeps increments from threads serving requests at once from being lost
+counters = {'hits': 0, 'misses': 0}
+_counters_lock = threading.Lock()
+
+
+def _count(hits=0, misses=0):
+    with _counters_lock:
+        counters['hits'] += hits
+        counters['misses'] += misses
+
+def get_fragment_cache():
+    return caches[getattr(settings, 'FRAGMENT_CACHE_ALIAS', 'fragments')]
+
+def job_card_key(layout, job):
+    # A saved job or recruiter profile (company name) gets a new key, so
+    # fragments never need deleting; old ones expire or are culled
+    return f'job-card:{layout}:{job.id}:{job.updated_at.timestamp()}:{job.recruiter.updated_at.timestamp()}'
+
+def _attach(layout, jobs, keys, cached):
+    # Render the fragments missing from cached; returns them by key for set_many
+    template = get_template(JOB_CARD_TEMPLATES[layout])
+    rendered = {}
+    for job, key in zip(jobs, keys):
+        html = cached.get(key)
+        if html is None:
+            html = rendered[key] = template.render({'job': job})
+        job.card_html = mark_safe(html)
+    _count(hits=len(jobs) - len(rendered), misses=len(rendered))
+    return rendered
+
+def attach_job_cards(jobs, layout):
+    """Set job.card_html on every job, rendering only the uncached fragments.
+
+    The whole page is read with one get_many and the new fragments written
+    with one set_many. The jobs need their recruiter loaded (select_related).
+    """
+    jobs = list(jobs)
+    if not jobs:
+        return jobs
+    cache = get_fragment_cache()
+    keys = [job_card_key(layout, job) for job in jobs]
+    rendered = _attach(layout, jobs, keys, cache.get_many(keys))
+    if rendered:
+        cache.set_many(rendered, getattr(settings, 'FRAGMENT_CACHE_TIMEOUT', 86400))
+    return jobs
+
+async def aattach_job_cards(jobs, layout):
+    """attach_job_cards for async views."""
+    jobs = list(jobs)
+    if not jobs:
+        return jobs
+    cache = get_fragment_cache()
+    keys = [job_card_key(layout, job) for job in jobs]
+    rendered = _attach(layout, jobs, keys, await cache.aget_many(keys))
+    if rendered:
+        await cache.aset_many(rendered, getattr(settings, 'FRAGMENT_CACHE_TIMEOUT', 86400))
+    return jobs
+
+def cache_stats():
+    with _counters_lock:
+        snapshot = dict(counters)
+    total = snapshot['hits'] + snapshot['misses']
+    return {**snapshot, 'hit_rate': round(snapshot['hits'] / total, 3) if total else None}
@@ -0,0 +1,119 @@
+import threading
+import time
+from collections import deque
+from contextvars import ContextVar
+from django.conf import settings
+from django.template.backends.django import DjangoTemplates, Template
+from .benchmarks import percentile
+
+# Histogram bucket upper bounds in milliseconds; the last bucket is open-ended
+HISTOGRAM_BUCKETS_MS = [10, 25, 50, 100, 250, 500, 1000, 2500]
+
+_request_timer = ContextVar('request_timer', default=None)
+
+
+class RequestTimer:
+    """Per-request totals filled in by the query wrapper and template backend."""
+
+    def __init__(self, track_queries=True):
+        self.track_queries = track_queries
+        self.queries = []
+        self.template_seconds = 0.0
+        self.template_depth = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        # connection.execute_wrapper hook
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append((time.perf_counter() - start, sql))
+
+    @property
+    def sql_seconds(self):
+        return sum(duration for duration, _ in self.queries)
+
+    def slowest_queries(self, limit=5):
+        return sorted(self.queries, key=lambda query: -query[0])[:limit]
+
+    def activate(self):
+        return _request_timer.set(self)
+
+    @staticmethod
+    def deactivate(token):
+        _request_timer.reset(token)
+
+
+class TimedTemplate(Template):
+    def render(self, context=None, request=None):
+        timer = _request_timer.get()
+        if timer is None:
+            return super().render(context, request)
+        timer.template_depth += 1
+        start = time.perf_counter()
+        try:
+            return super().render(context, request)
+        finally:
+            timer.template_depth -= 1
+            # Only the outermost render counts, includes are part of it
+            if not timer.template_depth:
+                timer.template_seconds += time.perf_counter() - start
+
+
+class TimedDjangoTemplates(DjangoTemplates):
+    """The Django template backend, reporting render time to RequestTimer."""
+
+    def from_string(self, template_code):
+        return TimedTemplate(self.engine.from_string(template_code), self)
+
+    def get_template(self, template_name):
+        template = super().get_template(template_name)
+        return TimedTemplate(template.template, self)
+
+
+class RequestStats:
+    """Rolling window of request durations per URL name, per process."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.samples = {}
+        self.totals = {}
+
+    def record(self, url_name, milliseconds):
+        window = getattr(settings, 'REQUEST_STATS_WINDOW', 1000)
+        with self.lock:
+            if url_name not in self.samples:
+                self.samples[url_name] = deque(maxlen=window)
+                self.totals[url_name] = 0
+            self.samples[url_name].append(milliseconds)
+            self.totals[url_name] += 1
+
+    def snapshot(self):
+        with self.lock:
+            samples = {name: list(values) for name, values in self.samples.items()}
+            totals = dict(self.totals)
+        report = {}
+        for name, values in sorted(samples.items()):
+            buckets = {f'le_{bound}ms': 0 for bound in HISTOGRAM_BUCKETS_MS}
+            buckets['inf'] = 0
+            for value in values:
+                bound = next((b for b in HISTOGRAM_BUCKETS_MS if value <= b), None)
+                buckets[f'le_{bound}ms' if bound else 'inf'] += 1
+            report[name] = {
+                'requests': totals[name],
+                'window': len(values),
+                'mean_ms': round(sum(values) / len(values), 3),
+                'p50_ms': round(percentile(values, 50), 3),
+                'p95_ms': round(percentile(values, 95), 3),
+                'p99_ms': round(percentile(values, 99), 3),
+                'histogram': buckets,
+            }
+        return report
+
+    def clear(self):
+        with self.lock:
+            self.samples.clear()
+            self.totals.clear()
+
+
+request_stats = RequestStats()
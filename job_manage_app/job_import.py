@@ -0,0 +1,121 @@
+import csv
+import io
+import json
+from django.db import transaction
+from .analytics import record_jobs
+from .forms import JobPostForm
+from .match_engine import load_seeker_skills, load_job_skills, build_job_matches
+from .models import Job, JobMatch
+from .result_cache import bump_jobs_version
+from .search import fts_enabled, rebuild_index
+from .skills import bulk_link_job_skills
+
+IMPORT_FORMATS = ['csv', 'jsonl']
+# Only the first errors are kept, so a bad file cannot grow memory without bound
+MAX_REPORTED_ERRORS = 100
+
+
+class ImportResult:
+    def __init__(self):
+        self.created = 0
+        self.failed = 0
+        self.errors = []
+
+    def add_error(self, line, message):
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append((line, message))
+
+
+def guess_format(filename):
+    return 'jsonl' if filename.lower().endswith(('.jsonl', '.ndjson', '.json')) else 'csv'
+
+def iter_rows(stream, fmt):
+    """Yield (line_number, row_dict or None, error) from a binary stream, one row at a time."""
+    text = io.TextIOWrapper(stream, encoding='utf-8-sig', newline='')
+    try:
+        if fmt == 'csv':
+            reader = csv.DictReader(text)
+            for row in reader:
+                if None in row:
+                    yield reader.line_num, None, 'Too many columns'
+                else:
+                    yield reader.line_num, row, ''
+        else:
+            for line_number, line in enumerate(text, 1):
+                if not line.strip():
+                    continue
+                try:
+                    row = json.loads(line)
+                except ValueError as e:
+                    yield line_number, None, f'Invalid JSON: {e}'
+                    continue
+                if isinstance(row, dict):
+                    yield line_number, row, ''
+                else:
+                    yield line_number, None, 'Each line must be a JSON object'
+    except UnicodeDecodeError:
+        yield None, None, 'File is not UTF-8 text'
+    finally:
+        # Leave the caller's file open
+        text.detach()
+
+def _field_value(value):
+    # JSONL rows may carry numbers, nulls or a list of skills
+    if value is None:
+        return ''
+    if isinstance(value, list):
+        return ', '.join(str(item) for item in value)
+    return str(value)
+
+def form_errors(form):
+    return '; '.join(f'{field}: {" ".join(messages)}' for field, messages in form.errors.items())
+
+def import_jobs(recruiter, stream, fmt='csv', batch_size=1000):
+    """Validate and insert jobs from a CSV/JSONL stream for one recruiter.
+
+    Each row goes through JobPostForm. Valid rows are inserted with
+    bulk_create, one transaction per batch. Job.save() and its signals are
+    skipped, so skill links, search index, matches and analytics rollups are
+    updated in bulk per batch instead. Memory use depends on batch_size, not
+    file size.
+    """
+    result = ImportResult()
+    batch = []
+
+    def flush():
+        if not batch:
+            return
+        with transaction.atomic():
+            jobs = Job.objects.bulk_create(batch)
+            bulk_link_job_skills(jobs)
+            record_jobs(jobs)
+            job_ids = [job.pk for job in jobs]
+            job_skills = load_job_skills([job.pk for job in jobs if job.skill_count])
+            # Only the seekers sharing a skill with this batch, so memory
+            # follows the batch and not the number of seekers
+            seeker_skills = load_seeker_skills({skill_id for skill_ids in job_skills.values() for skill_id in skill_ids})
+            JobMatch.objects.bulk_create(build_job_matches(job_skills, seeker_skills), batch_size=1000)
+            if fts_enabled():
+                rebuild_index(job_ids)
+        result.created += len(jobs)
+        batch.clear()
+
+    for line, row, error in iter_rows(stream, fmt):
+        if error:
+            result.add_error(line, error)
+            continue
+        form = JobPostForm(data={key: _field_value(value) for key, value in row.items()})
+        if not form.is_valid():
+            result.add_error(line, form_errors(form))
+            continue
+        job = form.save(commit=False)
+        job.recruiter = recruiter
+        job.skill_count = len(job.get_required_skills_list())
+        batch.append(job)
+        if len(batch) >= batch_size:
+            flush()
+    flush()
+    if result.created:
+        bump_jobs_version()
+    return result
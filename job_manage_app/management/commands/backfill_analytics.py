@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+from job_manage_app.analytics import rebuild_rollups
+
+
+class Command(BaseCommand):
+    help = (
+        'Rebuild the analytics rollups (applications per job per day, category trends, skill demand) '
+        'from the current jobs and applications with batched GROUP BY queries'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help='Jobs per GROUP BY batch')
+
+    def handle(self, *args, **options):
+        rows = rebuild_rollups(options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(
+            f"Rebuilt analytics: {rows['job_days']} job-days, {rows['category_days']} category-days, {rows['skills']} skills"
+        ))
@@ -0,0 +1,133 @@
+import asyncio
+import json
+import logging
+import time
+from django.conf import settings
+from django.core.asgi import get_asgi_application
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client, override_settings
+from django.urls import reverse
+from job_manage_app.benchmarks import summarize_latencies, run_metadata
+from job_manage_app.models import UserProfile
+
+URLCONFS = {
+    'sync': 'job_portal_project.urls',
+    'async': 'job_portal_project.asgi_urls',
+}
+
+
+async def asgi_get(app, path, query='', cookie=''):
+    # One GET through the ASGI application, as an ASGI server would send it
+    scope = {
+        'type': 'http',
+        'asgi': {'version': '3.0'},
+        'http_version': '1.1',
+        'method': 'GET',
+        'scheme': 'http',
+        'path': path,
+        'raw_path': path.encode(),
+        'query_string': query.encode(),
+        'root_path': '',
+        'headers': [(b'host', b'testserver'), (b'cookie', cookie.encode())],
+        'client': ('127.0.0.1', 50000),
+        'server': ('testserver', 80),
+    }
+    body_sent = False
+    disconnected = asyncio.Event()
+
+    async def receive():
+        nonlocal body_sent
+        if not body_sent:
+            body_sent = True
+            return {'type': 'http.request', 'body': b'', 'more_body': False}
+        await disconnected.wait()
+        return {'type': 'http.disconnect'}
+
+    status = None
+
+    async def send(message):
+        nonlocal status
+        if message['type'] == 'http.response.start':
+            status = message['status']
+
+    try:
+        await app(scope, receive, send)
+    finally:
+        disconnected.set()
+    return status
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare throughput of the sync and async read views under the ASGI handler '
+        'with many concurrent requests, in process'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--concurrency', type=int, default=100)
+        parser.add_argument('--requests', type=int, default=2000, help='Requests per view per mode')
+        parser.add_argument('--seeker', help='Username of the job seeker to log in as')
+        parser.add_argument('--output', help='Write the JSON report to this file instead of stdout')
+
+    def handle(self, *args, **options):
+        seekers = UserProfile.objects.select_related('user').filter(user_type='jobseeker')
+        if options['seeker']:
+            seekers = seekers.filter(user__username=options['seeker'])
+        seeker = seekers.order_by('id').first()
+        if seeker is None:
+            raise CommandError('No job seeker to log in as; run manage.py seed_portal first.')
+        client = Client()
+        client.force_login(seeker.user)
+        cookie = f'{settings.SESSION_COOKIE_NAME}={client.cookies[settings.SESSION_COOKIE_NAME].value}'
+
+        cases = [
+            ('home', reverse('home'), '', ''),
+            ('job_list', reverse('job_list'), '', ''),
+            ('dashboard', reverse('dashboard'), '', cookie),
+            ('my_applications', reverse('my_applications'), '', cookie),
+        ]
+        # Under this load nearly every request crosses the slow-request threshold
+        logging.getLogger('job_manage_app.slow_requests').setLevel(logging.ERROR)
+        app = get_asgi_application()
+        report = {}
+        for mode, urlconf in URLCONFS.items():
+            with override_settings(ROOT_URLCONF=urlconf):
+                report[mode] = {
+                    name: asyncio.run(self.load(app, path, query, cookie, options['concurrency'], options['requests']))
+                    for name, path, query, cookie in cases
+                }
+            for name, result in report[mode].items():
+                self.stderr.write(f"{mode} {name}: {result['throughput_rps']} req/s, p95 {result['p95_ms']} ms")
+
+        output = json.dumps({
+            'meta': run_metadata(concurrency=options['concurrency'], requests=options['requests']),
+            'modes': report,
+        }, indent=2)
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                f.write(output + '\n')
+        else:
+            self.stdout.write(output)
+
+    async def load(self, app, path, query, cookie, concurrency, total):
+        timings, errors = [], 0
+        remaining = total
+
+        async def worker():
+            nonlocal remaining, errors
+            while remaining > 0:
+                remaining -= 1
+                start = time.perf_counter()
+                status = await asgi_get(app, path, query, cookie)
+                timings.append(time.perf_counter() - start)
+                if status != 200:
+                    errors += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+        return {
+            'throughput_rps': round(len(timings) / elapsed, 1),
+            'errors': errors,
+            **summarize_latencies(timings),
+        }
@@ -0,0 +1,84 @@
+import json
+import re
+import time
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+from job_manage_app.benchmarks import summarize_latencies, run_metadata, pick_profile, view_cases
+from job_manage_app.fragments import get_fragment_cache
+from job_manage_app.models import Job
+from job_manage_app.result_cache import get_result_cache
+
+# The views that render job cards
+CARD_VIEWS = ['job_list', 'job_list_search', 'dashboard_seeker', 'dashboard_recruiter', 'skill_match_seeker']
+TEMPLATE_TIMING_RE = re.compile(r'tpl;dur=([\d.]+)')
+
+
+class Command(BaseCommand):
+    help = (
+        'Time the views that show job cards with an empty and with a warm fragment cache '
+        'and report the rendering time the cached cards save, as JSON'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=20)
+        parser.add_argument('--search', default='python', help='Query used for the job_list search case')
+        parser.add_argument('--seeker', help='Username of the job seeker to log in as (default: the one with most skills links)')
+        parser.add_argument('--recruiter', help='Username of the recruiter to log in as (default: the one with most jobs)')
+        parser.add_argument('--output', help='Write the JSON report to this file instead of stdout')
+
+    def handle(self, *args, **options):
+        seeker = pick_profile(options['seeker'], 'jobseeker', 'seeker_skills')
+        recruiter = pick_profile(options['recruiter'], 'recruiter', 'job')
+        job = Job.objects.filter(recruiter=recruiter).order_by('-id').first()
+        if seeker is None or job is None:
+            raise CommandError('Nothing to benchmark; run manage.py seed_portal first.')
+
+        clients = {'anonymous': Client(), 'seeker': Client(), 'recruiter': Client()}
+        clients['seeker'].force_login(seeker.user)
+        clients['recruiter'].force_login(recruiter.user)
+
+        results = {}
+        for name, who, url, params in view_cases(job, options['search']):
+            if name not in CARD_VIEWS:
+                continue
+            cold = self.bench(clients[who], url, params, options['iterations'], warm=False)
+            warm = self.bench(clients[who], url, params, options['iterations'], warm=True)
+            results[name] = {
+                'cold': cold,
+                'warm': warm,
+                'saved_p50_ms': round(cold['p50_ms'] - warm['p50_ms'], 3),
+                'saved_template_ms': round(cold['template_ms'] - warm['template_ms'], 3),
+            }
+            self.stderr.write(
+                f"{name}: p50 {cold['p50_ms']} -> {warm['p50_ms']} ms, "
+                f"templates {cold['template_ms']} -> {warm['template_ms']} ms"
+            )
+
+        output = json.dumps({'meta': run_metadata(iterations=options['iterations']), 'views': results}, indent=2)
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                f.write(output + '\n')
+        else:
+            self.stdout.write(output)
+
+    def bench(self, client, url, params, iterations, warm):
+        # The result cache is emptied before every request so job_list
+        # renders its page instead of serving the cached one
+        if warm:
+            client.get(url, params)
+        timings = []
+        template_ms = []
+        for _ in range(iterations):
+            get_result_cache().clear()
+            if not warm:
+                get_fragment_cache().clear()
+            start = time.perf_counter()
+            response = client.get(url, params)
+            timings.append(time.perf_counter() - start)
+            template_ms.append(float(TEMPLATE_TIMING_RE.search(response['Server-Timing']).group(1)))
+        template_ms.sort()
+        return {
+            **summarize_latencies(timings),
+            # Median of the template time from the Server-Timing header
+            'template_ms': template_ms[len(template_ms) // 2],
+        }
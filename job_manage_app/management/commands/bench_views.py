@@ -0,0 +1,91 @@
+import json
+import time
+import tracemalloc
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from job_manage_app.benchmarks import summarize_latencies, run_metadata, pick_profile, view_cases
+from job_manage_app.models import UserProfile, Job, JobApplication
+
+
+class Command(BaseCommand):
+    help = 'Time the main views through the test client and report latency, queries and memory as JSON'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=20)
+        parser.add_argument('--warmup', type=int, default=2)
+        parser.add_argument('--search', default='python', help='Query used for the job_list search case')
+        parser.add_argument('--seeker', help='Username of the job seeker to log in as (default: the one with most skills links)')
+        parser.add_argument('--recruiter', help='Username of the recruiter to log in as (default: the one with most jobs)')
+        parser.add_argument('--output', help='Write the JSON report to this file instead of stdout')
+
+    def handle(self, *args, **options):
+        seeker = self.pick_profile(options['seeker'], 'jobseeker', 'seeker_skills')
+        recruiter = self.pick_profile(options['recruiter'], 'recruiter', 'job')
+        job = Job.objects.filter(recruiter=recruiter).order_by('-id').first() or Job.objects.order_by('-id').first()
+        if job is None:
+            raise CommandError('No jobs to benchmark; run manage.py seed_portal first.')
+
+        clients = {'anonymous': Client(), 'seeker': Client(), 'recruiter': Client()}
+        clients['seeker'].force_login(seeker.user)
+        clients['recruiter'].force_login(recruiter.user)
+        cases = [(name, clients[who], url, params) for name, who, url, params in view_cases(job, options['search'])]
+
+        results = {}
+        for name, client, url, params in cases:
+            results[name] = self.bench(client, url, params, options['iterations'], options['warmup'])
+            self.stderr.write(f"{name}: p50 {results[name]['p50_ms']} ms, {results[name]['queries']} queries")
+
+        report = {
+            'meta': run_metadata(
+                iterations=options['iterations'],
+                database=connection.vendor,
+                rows={
+                    'jobs': Job.objects.count(),
+                    'seekers': UserProfile.objects.filter(user_type='jobseeker').count(),
+                    'recruiters': UserProfile.objects.filter(user_type='recruiter').count(),
+                    'applications': JobApplication.objects.count(),
+                },
+            ),
+            'views': results,
+        }
+        output = json.dumps(report, indent=2)
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                f.write(output + '\n')
+        else:
+            self.stdout.write(output)
+
+    def pick_profile(self, username, user_type, busiest_by):
+        profile = pick_profile(username, user_type, busiest_by)
+        if profile is None:
+            raise CommandError(f'No {user_type} profile found; run manage.py seed_portal first.')
+        return profile
+
+    def bench(self, client, url, params, iterations, warmup):
+        for _ in range(warmup):
+            client.get(url, params)
+
+        timings = []
+        for _ in range(iterations):
+            start = time.perf_counter()
+            response = client.get(url, params)
+            timings.append(time.perf_counter() - start)
+
+        # Queries and memory are measured on one extra request so that
+        # tracing does not inflate the timings above
+        tracemalloc.start()
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(url, params)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        return {
+            'status': response.status_code,
+            **summarize_latencies(timings),
+            'queries': len(queries),
+            'sql_ms': round(sum(float(q['time']) for q in queries.captured_queries) * 1000, 3),
+            'peak_memory_kb': round(peak / 1024, 1),
+            'response_kb': round(len(response.content) / 1024, 1),
+        }
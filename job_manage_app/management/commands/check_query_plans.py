@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+from django.urls import reverse
+from job_manage_app.benchmarks import pick_profile, view_cases
+from job_manage_app.models import Job
+from job_manage_app.query_plans import check_view_plans
+
+
+class Command(BaseCommand):
+    help = (
+        'Request the main views, run EXPLAIN QUERY PLAN on every query they issue and fail '
+        'if a plan scans a whole table or sorts through a temp B-tree (run after seed_portal)'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--search', default='python', help='Query used for the search cases')
+        parser.add_argument('--seeker', help='Username of the job seeker to log in as (default: the one with most skills links)')
+        parser.add_argument('--recruiter', help='Username of the recruiter to log in as (default: the one with most jobs)')
+
+    def handle(self, *args, **options):
+        seeker = pick_profile(options['seeker'], 'jobseeker', 'seeker_skills')
+        recruiter = pick_profile(options['recruiter'], 'recruiter', 'job')
+        job = Job.objects.filter(recruiter=recruiter).order_by('-id').first()
+        if seeker is None or job is None:
+            raise CommandError('Nothing to check; run manage.py seed_portal first.')
+
+        clients = {'anonymous': Client(), 'seeker': Client(), 'recruiter': Client()}
+        clients['seeker'].force_login(seeker.user)
+        clients['recruiter'].force_login(recruiter.user)
+        cases = view_cases(job, options['search']) + [
+            ('export_applications', 'recruiter', reverse('export_applications'), {}),
+        ]
+        failures = check_view_plans([(name, clients[who], url, params) for name, who, url, params in cases])
+
+        for name, queries in failures.items():
+            for sql, problems in queries:
+                self.stdout.write(f"{name}: {', '.join(problems)}\n    {sql}")
+        if failures:
+            raise CommandError(f'{len(failures)} of {len(cases)} views have queries that scan or sort; see above.')
+        self.stdout.write(self.style.SUCCESS(f'All {len(cases)} views use indexed plans'))
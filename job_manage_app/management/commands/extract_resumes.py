@@ -0,0 +1,31 @@
+import time
+from django.core.management.base import BaseCommand
+from job_manage_app.models import StoredFile
+from job_manage_app.resume_index import extract_stored_files
+from job_manage_app.search import candidate_fts_enabled, rebuild_candidate_index
+
+
+class Command(BaseCommand):
+    help = 'Extract plain text from stored resumes in a process pool and rebuild the candidate index'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=None, help='Worker processes (default: one per CPU, 0: in process)')
+        parser.add_argument('--batch-size', type=int, default=100, help='Files extracted per transaction')
+        parser.add_argument('--all', action='store_true', help='Re-extract files that already have text')
+
+    def handle(self, *args, **options):
+        files = StoredFile.objects.order_by('id')
+        if not options['all']:
+            files = files.filter(text_extracted_at__isnull=True)
+        names = list(files.values_list('name', flat=True))
+
+        started = time.perf_counter()
+        done = extract_stored_files(names, workers=options['workers'], batch_size=options['batch_size'])
+        elapsed = time.perf_counter() - started
+        if candidate_fts_enabled():
+            rebuild_candidate_index()
+        failed = StoredFile.objects.filter(name__in=names).exclude(text_error='').count()
+        self.stdout.write(self.style.SUCCESS(
+            f'Extracted {done} resumes in {elapsed:.2f}s ({failed} failed); '
+            'resumes uploaded before content-addressed storage need gc_resumes --adopt-legacy first'
+        ))
@@ -0,0 +1,72 @@
+from datetime import timedelta
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from job_manage_app.auth import forget_cached_users
+from job_manage_app.models import UserProfile, StoredFile
+from job_manage_app.storage import resume_storage, recount_references, collect_garbage
+
+
+class Command(BaseCommand):
+    help = 'Recount resume references and delete stored resume files no profile uses'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--grace-hours', type=float, default=24, help='Keep unreferenced files younger than this')
+        parser.add_argument('--adopt-legacy', action='store_true',
+                            help='Move resumes uploaded before content-addressed storage into it, deleting duplicates')
+        parser.add_argument('--delete-orphans', action='store_true',
+                            help='Also delete old-style files in resumes/ that no profile points to')
+        parser.add_argument('--dry-run', action='store_true')
+
+    def handle(self, *args, **options):
+        dry_run = options['dry_run']
+        if options['adopt_legacy']:
+            self.adopt_legacy(dry_run)
+        grace = timedelta(hours=options['grace_hours'])
+        changed = recount_references() if not dry_run else 0
+        deleted = collect_garbage(grace, dry_run=dry_run)
+        if options['delete_orphans']:
+            deleted += self.delete_orphans(grace, dry_run)
+        for name in deleted:
+            self.stdout.write(f'{"Would delete" if dry_run else "Deleted"} {name}')
+        self.stdout.write(self.style.SUCCESS(
+            f'Fixed {changed} reference counts, {"found" if dry_run else "deleted"} {len(deleted)} unused files'
+        ))
+
+    def adopt_legacy(self, dry_run):
+        stored = set(StoredFile.objects.values_list('name', flat=True))
+        legacy = {}
+        for profile_id, name in UserProfile.objects.exclude(resume='').exclude(resume__isnull=True).values_list('id', 'resume'):
+            if name not in stored:
+                legacy.setdefault(name, []).append(profile_id)
+
+        for old_name, profile_ids in legacy.items():
+            if not resume_storage.exists(old_name):
+                self.stderr.write(f'Missing file {old_name}, left as is')
+                continue
+            if dry_run:
+                self.stdout.write(f'Would adopt {old_name} ({len(profile_ids)} profiles)')
+                continue
+            with resume_storage.open(old_name, 'rb') as f:
+                new_name = resume_storage.save(old_name, f)
+            # Plain UPDATE: nothing but the file name changes, so skip the profile signals
+            UserProfile.objects.filter(id__in=profile_ids).update(resume=new_name)
+            forget_cached_users(UserProfile.objects.filter(id__in=profile_ids).values_list('user_id', flat=True))
+            resume_storage.delete(old_name)
+            self.stdout.write(f'Adopted {old_name} as {new_name}')
+
+    def delete_orphans(self, grace, dry_run):
+        # Content-addressed files live in subdirectories and are tracked by StoredFile
+        directory = UserProfile._meta.get_field('resume').upload_to.rstrip('/')
+        if not resume_storage.exists(directory):
+            return []
+        referenced = set(UserProfile.objects.exclude(resume='').exclude(resume__isnull=True).values_list('resume', flat=True))
+        cutoff = timezone.now() - grace
+        orphans = []
+        for filename in resume_storage.listdir(directory)[1]:
+            name = f'{directory}/{filename}'
+            if filename.startswith('.') or name in referenced or resume_storage.get_modified_time(name) > cutoff:
+                continue
+            if not dry_run:
+                resume_storage.delete(name)
+            orphans.append(name)
+        return orphans
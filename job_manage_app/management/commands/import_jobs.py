@@ -0,0 +1,41 @@
+import sys
+import time
+from django.core.management.base import BaseCommand, CommandError
+from job_manage_app.job_import import IMPORT_FORMATS, guess_format, import_jobs
+from job_manage_app.models import UserProfile
+
+
+class Command(BaseCommand):
+    help = 'Import jobs for one recruiter from a CSV or JSONL file, validated like the post job form'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='CSV with a header row, or JSON Lines; "-" reads stdin')
+        parser.add_argument('--recruiter', required=True, help='Username of the recruiter who owns the jobs')
+        parser.add_argument('--format', choices=IMPORT_FORMATS, help='Default: guessed from the file extension')
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        try:
+            recruiter = UserProfile.objects.get(user__username=options['recruiter'], user_type='recruiter')
+        except UserProfile.DoesNotExist:
+            raise CommandError(f'No recruiter named "{options["recruiter"]}".')
+        fmt = options['format'] or guess_format(options['path'])
+
+        started = time.perf_counter()
+        if options['path'] == '-':
+            result = import_jobs(recruiter, sys.stdin.buffer, fmt, options['batch_size'])
+        else:
+            try:
+                with open(options['path'], 'rb') as f:
+                    result = import_jobs(recruiter, f, fmt, options['batch_size'])
+            except OSError as e:
+                raise CommandError(str(e))
+        elapsed = time.perf_counter() - started
+
+        for line, message in result.errors:
+            self.stderr.write(f'line {line}: {message}' if line else message)
+        if result.failed > len(result.errors):
+            self.stderr.write(f'... and {result.failed - len(result.errors)} more errors')
+        self.stdout.write(self.style.SUCCESS(
+            f'Imported {result.created} jobs in {elapsed:.1f}s, {result.failed} rows rejected'
+        ))
@@ -0,0 +1,252 @@
+import json
+import random
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import OperationalError, connection, connections
+from django.test import Client
+from django.urls import resolve, reverse
+from job_manage_app.benchmarks import summarize_latencies, run_metadata
+from job_manage_app.management.commands.seed_portal import SKILLS, TITLES
+from job_manage_app.models import UserProfile, Job
+
+LOADTEST_USER_PREFIX = 'loadtest-'
+LOADTEST_PASSWORD = 'loadpass123'
+SEARCH_TERMS = ['python', 'developer', 'sql', 'nurse', 'sales', 'excel', 'react', 'teacher']
+# Write statements; under SQLite their time is mostly spent waiting for the write lock
+WRITE_PREFIXES = ('BEGIN', 'INSERT', 'UPDATE', 'DELETE', 'REPLACE')
+
+
+class WriteProbe:
+    """connection.execute_wrapper hook that times write statements and counts lock errors."""
+
+    def __init__(self):
+        self.timings = []
+        self.locked = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        if not sql.lstrip().upper().startswith(WRITE_PREFIXES):
+            return execute(sql, params, many, context)
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        except OperationalError as e:
+            if 'locked' in str(e):
+                self.locked += 1
+            raise
+        finally:
+            self.timings.append(time.perf_counter() - start)
+
+
+class VirtualUser:
+    """One simulated visitor with its own client (cookies, session, IP).
+
+    Seekers search the job list, open a job, apply and check their
+    applications; recruiters post a job and browse its applications.
+    Every request is timed under "<METHOD> <url name>".
+    """
+
+    def __init__(self, profile, number, job_ids, rng):
+        self.profile = profile
+        self.job_ids = job_ids
+        self.rng = rng
+        # A distinct address per user, so the per-IP login throttle sees separate clients
+        self.client = Client(REMOTE_ADDR=f'10.{number // 65536 % 256}.{number // 256 % 256}.{number % 256}')
+        self.timings = defaultdict(list)
+        self.statuses = defaultdict(lambda: defaultdict(int))
+        self.errors = []
+        self.probe = WriteProbe()
+        self.journeys = 0
+
+    def request(self, method, url, data=None, expect=(200, 302)):
+        name = f'{method} {resolve(url.split("?")[0]).url_name}'
+        start = time.perf_counter()
+        try:
+            with connection.execute_wrapper(self.probe):
+                response = getattr(self.client, method.lower())(url, data or {})
+        except Exception as e:
+            self.statuses[name]['exception'] += 1
+            self.errors.append(f'{name}: {type(e).__name__}: {e}')
+            return None
+        self.timings[name].append(time.perf_counter() - start)
+        self.statuses[name][str(response.status_code)] += 1
+        if response.status_code not in expect:
+            self.errors.append(f'{name}: HTTP {response.status_code}')
+        return response
+
+    def login(self):
+        response = self.request('POST', reverse('login'), {
+            'username': self.profile.user.username, 'password': LOADTEST_PASSWORD,
+        }, expect=(302,))
+        return response is not None and response.status_code == 302
+
+    def journey(self):
+        if self.profile.user_type == 'jobseeker':
+            self.seeker_journey()
+        else:
+            self.recruiter_journey()
+        self.journeys += 1
+
+    def seeker_journey(self):
+        self.request('GET', reverse('job_list'), {'search': self.rng.choice(SEARCH_TERMS)})
+        job_id = self.rng.choice(self.job_ids)
+        self.request('GET', reverse('apply_job', args=[job_id]))
+        self.request('POST', reverse('apply_job', args=[job_id]))
+        self.request('GET', reverse('my_applications'))
+
+    def recruiter_journey(self):
+        category = self.rng.choice(list(TITLES))
+        self.request('GET', reverse('post_job'))
+        self.request('POST', reverse('post_job'), {
+            'title': f'{self.rng.choice(TITLES[category])} (load test)',
+            'number_of_openings': self.rng.randint(1, 5),
+            'category': category,
+            'description': 'Created by manage.py loadtest.',
+            'required_skills': ', '.join(self.rng.sample(SKILLS[category], 3)),
+        })
+        self.request('GET', reverse('all_applications'))
+        own_job = Job.objects.filter(recruiter=self.profile).order_by('-id').values_list('id', flat=True).first()
+        if own_job:
+            self.request('GET', reverse('job_applications', args=[own_job]))
+
+    def run(self, deadline, think_time):
+        try:
+            if not self.login():
+                return
+            while time.perf_counter() < deadline:
+                self.journey()
+                if think_time:
+                    time.sleep(self.rng.uniform(0, 2 * think_time))
+        finally:
+            connections.close_all()
+
+
+class Command(BaseCommand):
+    help = (
+        'Simulate concurrent seekers and recruiters going through the site (log in, search, apply, '
+        'post jobs, browse applications) against the in-process WSGI handler, and report '
+        'throughput, latency percentiles and error rates per URL name plus write-lock waits, as JSON. '
+        'Writes real rows (removed at the end); run it against a copy of the database.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=20, help='Concurrent virtual users, one thread each')
+        parser.add_argument('--recruiter-share', type=float, default=0.2, help='Share of the users that are recruiters')
+        parser.add_argument('--seconds', type=float, default=30)
+        parser.add_argument('--think-time', type=float, default=0, help='Mean pause between journeys, in seconds')
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--output', help='Write the JSON report to this file instead of stdout')
+
+    def handle(self, *args, **options):
+        job_ids = list(Job.objects.order_by('-id').values_list('id', flat=True)[:500])
+        if not job_ids:
+            raise CommandError('No jobs to apply to; run manage.py seed_portal first.')
+        if options['users'] < 1:
+            raise CommandError('--users must be at least 1.')
+
+        rng = random.Random(options['seed'])
+        recruiters = max(1, round(options['users'] * options['recruiter_share'])) if options['recruiter_share'] else 0
+        self.remove_users()
+        password = make_password(LOADTEST_PASSWORD)
+        users = [
+            VirtualUser(self.loadtest_profile(i, 'recruiter' if i < recruiters else 'jobseeker', password, rng),
+                        i, job_ids, random.Random(rng.random()))
+            for i in range(options['users'])
+        ]
+
+        started = time.perf_counter()
+        deadline = started + options['seconds']
+        try:
+            with ThreadPoolExecutor(max_workers=len(users)) as pool:
+                for future in [pool.submit(user.run, deadline, options['think_time']) for user in users]:
+                    future.result()
+            elapsed = time.perf_counter() - started
+        finally:
+            self.remove_users()
+
+        report = self.report(users, elapsed, options, recruiters)
+        for name, stats in report['views'].items():
+            self.stderr.write(
+                f"{name}: {stats['requests_per_second']} req/s, p95 {stats['p95_ms']} ms, "
+                f"{stats['errors']} errors"
+            )
+        self.stderr.write(
+            f"{report['requests']} requests, {report['requests_per_second']} req/s, "
+            f"{report['errors']} errors, {report['write_lock']['locked_errors']} lock errors"
+        )
+
+        output = json.dumps(report, indent=2)
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                f.write(output + '\n')
+        else:
+            self.stdout.write(output)
+
+    def loadtest_profile(self, number, user_type, password, rng):
+        user = User.objects.create(
+            username=f'{LOADTEST_USER_PREFIX}{user_type}-{number}', email=f'loadtest{number}@example.com', password=password,
+        )
+        category = rng.choice(list(SKILLS))
+        return UserProfile.objects.create(
+            user=user, user_type=user_type, display_name=user.username,
+            company_name='Load Test Inc' if user_type == 'recruiter' else '',
+            skills=', '.join(rng.sample(SKILLS[category], 4)) if user_type == 'jobseeker' else '',
+        )
+
+    def remove_users(self):
+        # Cascades to the profiles, their jobs and applications; signals settle the counters
+        User.objects.filter(username__startswith=LOADTEST_USER_PREFIX).delete()
+
+    def report(self, users, elapsed, options, recruiters):
+        timings = defaultdict(list)
+        statuses = defaultdict(lambda: defaultdict(int))
+        errors = []
+        writes = []
+        for user in users:
+            for name, values in user.timings.items():
+                timings[name].extend(values)
+            for name, counts in user.statuses.items():
+                for status, count in counts.items():
+                    statuses[name][status] += count
+            errors.extend(user.errors)
+            writes.extend(user.probe.timings)
+
+        views = {}
+        for name in sorted(statuses):
+            requests = sum(statuses[name].values())
+            failed = sum(1 for error in errors if error.startswith(f'{name}:'))
+            views[name] = {
+                'requests': requests,
+                'requests_per_second': round(requests / elapsed, 1),
+                'errors': failed,
+                'error_rate': round(failed / requests, 4),
+                'statuses': dict(statuses[name]),
+                **summarize_latencies(timings[name]),
+            }
+        total = sum(view['requests'] for view in views.values())
+        return {
+            'meta': run_metadata(
+                database=connection.vendor,
+                db_profile=getattr(settings, 'DB_PROFILE', None),
+                users=len(users),
+                recruiters=recruiters,
+                seconds=round(elapsed, 2),
+                think_time=options['think_time'],
+            ),
+            'requests': total,
+            'requests_per_second': round(total / elapsed, 1),
+            'journeys': sum(user.journeys for user in users),
+            'errors': len(errors),
+            'error_rate': round(len(errors) / total, 4) if total else None,
+            'error_samples': sorted(set(errors))[:5],
+            'write_lock': {
+                'locked_errors': sum(user.probe.locked for user in users),
+                'total_wait_ms': round(sum(writes) * 1000, 1),
+                **summarize_latencies(writes),
+            },
+            'views': views,
+        }
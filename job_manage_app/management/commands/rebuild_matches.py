@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from job_manage_app.match_engine import load_seeker_skills, load_job_skills, build_job_matches
+from job_manage_app.models import Job, JobMatch
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the JobMatch table from the job and seeker skill links'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500, help='Jobs scored per batch')
+        parser.add_argument('--no-numpy', action='store_true', help='Use the pure-Python bitset backend')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        use_numpy = False if options['no_numpy'] else None
+        seeker_skills = load_seeker_skills()
+        job_ids = list(Job.objects.filter(skill_count__gt=0).order_by('id').values_list('id', flat=True))
+
+        total = 0
+        with transaction.atomic():
+            JobMatch.objects.all().delete()
+            for start in range(0, len(job_ids), batch_size):
+                job_skills = load_job_skills(job_ids[start:start + batch_size])
+                created = JobMatch.objects.bulk_create(
+                    build_job_matches(job_skills, seeker_skills, use_numpy=use_numpy), batch_size=1000,
+                )
+                total += len(created)
+
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt {total} job matches for {len(job_ids)} jobs'))
@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand, CommandError
+from job_manage_app.search import fts_enabled, rebuild_index
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the FTS5 full-text index used by the job search'
+
+    def handle(self, *args, **options):
+        if not fts_enabled():
+            raise CommandError('Full-text search is not available on this database; job_list uses icontains search.')
+        rebuild_index()
+        self.stdout.write(self.style.SUCCESS('Rebuilt the job search index'))
@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+from job_manage_app.counters import reconcile_application_counts
+
+
+class Command(BaseCommand):
+    help = 'Recount applications per job and per recruiter and repair counters that drifted'
+
+    def handle(self, *args, **options):
+        jobs, recruiters = reconcile_application_counts()
+        self.stdout.write(self.style.SUCCESS(f'Repaired application counts on {jobs} jobs and {recruiters} profiles'))
@@ -0,0 +1,38 @@
+import time
+from django.conf import settings
+from django.core.mail import get_connection
+from django.core.management.base import BaseCommand
+from job_manage_app.outbox import claim_batch, deliver_batch
+
+
+class Command(BaseCommand):
+    help = 'Send queued outbox emails in batches over one persistent mail connection'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=getattr(settings, 'MAIL_OUTBOX_BATCH_SIZE', 50))
+        parser.add_argument('--poll-interval', type=float, default=2.0, help='Seconds to sleep when the outbox is empty')
+        parser.add_argument('--once', action='store_true', help='Exit once no email is due instead of polling')
+
+    def handle(self, *args, **options):
+        connection = get_connection(fail_silently=False)
+        total_sent = total_failed = 0
+        try:
+            while True:
+                emails = claim_batch(options['batch_size'])
+                if not emails:
+                    if options['once']:
+                        break
+                    # Do not hold an idle SMTP session open between bursts
+                    connection.close()
+                    time.sleep(options['poll_interval'])
+                    continue
+                sent, failed = deliver_batch(emails, connection)
+                total_sent += sent
+                total_failed += failed
+                if options['verbosity'] > 1:
+                    self.stdout.write(f'Batch of {len(emails)}: {sent} sent, {failed} failed')
+        except KeyboardInterrupt:
+            pass
+        finally:
+            connection.close()
+        self.stdout.write(self.style.SUCCESS(f'Sent {total_sent} emails, {total_failed} failed attempts'))
@@ -0,0 +1,201 @@
+import random
+from contextlib import contextmanager
+from datetime import timedelta
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+from job_manage_app.models import UserProfile, Job, JobApplication
+from job_manage_app.result_cache import bump_jobs_version
+from job_manage_app.search import candidate_fts_enabled, fts_enabled, rebuild_candidate_index, rebuild_index
+from job_manage_app.skills import bulk_link_job_skills, bulk_link_seeker_skills
+
+SKILLS = {
+    'technology': [
+        'python', 'django', 'javascript', 'react', 'sql', 'git', 'docker', 'aws', 'java',
+        'node.js', 'typescript', 'postgresql', 'linux', 'kubernetes', 'go', 'rest api',
+        'html', 'css', 'flask', 'machine learning', 'c++', 'rust', 'redis', 'graphql',
+    ],
+    'finance': [
+        'excel', 'financial modeling', 'accounting', 'sql', 'risk analysis', 'python',
+        'budgeting', 'forecasting', 'tax', 'audit', 'power bi', 'valuation',
+    ],
+    'healthcare': [
+        'patient care', 'emr', 'nursing', 'pharmacology', 'medical coding', 'first aid',
+        'clinical research', 'hipaa', 'phlebotomy', 'triage',
+    ],
+    'education': [
+        'curriculum design', 'classroom management', 'tutoring', 'assessment',
+        'lesson planning', 'e-learning', 'public speaking', 'mentoring',
+    ],
+    'marketing': [
+        'seo', 'content writing', 'google analytics', 'social media', 'copywriting',
+        'email marketing', 'branding', 'adobe photoshop', 'market research', 'ppc',
+    ],
+    'sales': [
+        'negotiation', 'crm', 'salesforce', 'lead generation', 'cold calling',
+        'account management', 'communication', 'presentation', 'b2b sales',
+    ],
+    'other': [
+        'communication', 'teamwork', 'project management', 'excel', 'customer service',
+        'leadership', 'problem solving', 'time management',
+    ],
+}
+CATEGORY_WEIGHTS = {
+    'technology': 40, 'finance': 12, 'healthcare': 10, 'education': 8,
+    'marketing': 12, 'sales': 12, 'other': 6,
+}
+TITLES = {
+    'technology': ['Backend Developer', 'Frontend Engineer', 'Data Engineer', 'DevOps Engineer', 'Full Stack Developer'],
+    'finance': ['Financial Analyst', 'Accountant', 'Risk Manager', 'Auditor'],
+    'healthcare': ['Staff Nurse', 'Medical Coder', 'Clinical Research Associate', 'Pharmacist'],
+    'education': ['Teacher', 'Tutor', 'Instructional Designer', 'Curriculum Lead'],
+    'marketing': ['SEO Specialist', 'Content Writer', 'Marketing Manager', 'Growth Analyst'],
+    'sales': ['Sales Executive', 'Account Manager', 'Business Development Rep'],
+    'other': ['Office Administrator', 'Project Coordinator', 'Customer Support Agent'],
+}
+
+
+@contextmanager
+def explicit_timestamps(*fields):
+    # Let bulk_create keep the created_at/applied_at values we generate
+    for field in fields:
+        field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field in fields:
+            field.auto_now_add = True
+
+
+class Command(BaseCommand):
+    help = 'Bulk-create synthetic recruiters, seekers, jobs and applications for benchmarking'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--recruiters', type=int, default=100)
+        parser.add_argument('--seekers', type=int, default=5000)
+        parser.add_argument('--jobs', type=int, default=2000)
+        parser.add_argument('--applications', type=int, default=20000)
+        parser.add_argument('--days', type=int, default=180, help='Spread timestamps over this many past days')
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument('--prefix', default='seed', help='Username prefix for generated users')
+        parser.add_argument('--password', default='seedpass123', help='Password set on every generated user')
+        parser.add_argument('--random-seed', type=int, default=0)
+
+    def handle(self, *args, **options):
+        self.rng = random.Random(options['random_seed'])
+        self.batch_size = options['batch_size']
+        self.now = timezone.now()
+        self.days = options['days']
+        prefix = options['prefix']
+        if User.objects.filter(username__startswith=f'{prefix}_').exists():
+            raise CommandError(f'Users with prefix "{prefix}_" already exist; pass another --prefix.')
+        password = make_password(options['password'])
+
+        recruiter_ids = self.create_profiles(f'{prefix}_recruiter', 'recruiter', options['recruiters'], password)
+        seeker_ids = self.create_profiles(f'{prefix}_seeker', 'jobseeker', options['seekers'], password)
+        job_ids = self.create_jobs(recruiter_ids, options['jobs'])
+        applications = self.create_applications(job_ids, seeker_ids, options['applications'])
+
+        if fts_enabled():
+            rebuild_index()
+        # bulk_create skipped the signals that index each seeker
+        if candidate_fts_enabled():
+            rebuild_candidate_index()
+        call_command('rebuild_matches', stdout=self.stdout)
+        # bulk_create skipped the application counter and analytics signals
+        call_command('reconcile_counts', stdout=self.stdout)
+        call_command('backfill_analytics', stdout=self.stdout)
+        bump_jobs_version()
+        self.stdout.write(self.style.SUCCESS(
+            f'Seeded {len(recruiter_ids)} recruiters, {len(seeker_ids)} seekers, '
+            f'{len(job_ids)} jobs and {applications} applications'
+        ))
+
+    def random_time(self):
+        return self.now - timedelta(seconds=self.rng.randrange(max(self.days, 1) * 86400))
+
+    def pick_skills(self, category, low, high):
+        # Earlier skills in each list are more popular (Zipf-like weights)
+        pool = SKILLS[category]
+        weights = [1 / (rank + 1) for rank in range(len(pool))]
+        chosen = []
+        for _ in range(self.rng.randint(low, high)):
+            skill = self.rng.choices(pool, weights)[0]
+            if skill not in chosen:
+                chosen.append(skill)
+        return ', '.join(chosen)
+
+    def pick_category(self):
+        return self.rng.choices(list(CATEGORY_WEIGHTS), list(CATEGORY_WEIGHTS.values()))[0]
+
+    def create_profiles(self, username_prefix, user_type, count, password):
+        ids = []
+        for start in range(0, count, self.batch_size):
+            stop = min(start + self.batch_size, count)
+            with transaction.atomic():
+                users = User.objects.bulk_create([
+                    User(username=f'{username_prefix}_{i}', email=f'{username_prefix}_{i}@example.com', password=password)
+                    for i in range(start, stop)
+                ])
+                profiles = []
+                for user in users:
+                    profile = UserProfile(user=user, display_name=user.username.replace('_', ' ').title(), user_type=user_type)
+                    if user_type == 'recruiter':
+                        profile.company_name = f'{user.username.split("_")[-1]} Corp'
+                    else:
+                        profile.skills = self.pick_skills(self.pick_category(), 3, 12)
+                    profiles.append(profile)
+                profiles = UserProfile.objects.bulk_create(profiles)
+                bulk_link_seeker_skills(profiles)
+            ids.extend(profile.pk for profile in profiles)
+        return ids
+
+    def create_jobs(self, recruiter_ids, count):
+        if count and not recruiter_ids:
+            raise CommandError('Jobs need at least one recruiter.')
+        ids = []
+        created_at = Job._meta.get_field('created_at')
+        for start in range(0, count, self.batch_size):
+            jobs = []
+            for _ in range(start, min(start + self.batch_size, count)):
+                category = self.pick_category()
+                title = self.rng.choice(TITLES[category])
+                required_skills = self.pick_skills(category, 3, 8)
+                job = Job(
+                    recruiter_id=self.rng.choice(recruiter_ids),
+                    title=title,
+                    number_of_openings=self.rng.randint(1, 10),
+                    category=category,
+                    description=f'We are hiring a {title.lower()} with experience in {required_skills}.',
+                    required_skills=required_skills,
+                    created_at=self.random_time(),
+                )
+                job.skill_count = len(job.get_required_skills_list())
+                jobs.append(job)
+            with transaction.atomic(), explicit_timestamps(created_at):
+                jobs = Job.objects.bulk_create(jobs)
+                bulk_link_job_skills(jobs)
+            ids.extend(job.pk for job in jobs)
+        return ids
+
+    def create_applications(self, job_ids, seeker_ids, count):
+        if not (job_ids and seeker_ids):
+            return 0
+        applied_at = JobApplication._meta.get_field('applied_at')
+        before = JobApplication.objects.count()
+        for start in range(0, count, self.batch_size):
+            applications = [
+                JobApplication(
+                    job_id=self.rng.choice(job_ids),
+                    applicant_id=self.rng.choice(seeker_ids),
+                    applied_at=self.random_time(),
+                )
+                for _ in range(start, min(start + self.batch_size, count))
+            ]
+            # Duplicate (job, applicant) pairs are dropped by the unique constraint
+            with transaction.atomic(), explicit_timestamps(applied_at):
+                JobApplication.objects.bulk_create(applications, ignore_conflicts=True)
+        return JobApplication.objects.count() - before
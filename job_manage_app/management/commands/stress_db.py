@@ -0,0 +1,127 @@
+import json
+import random
+import threading
+import time
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import OperationalError, connection, connections
+from job_manage_app.benchmarks import summarize_latencies, run_metadata
+from job_manage_app.db_router import read_only
+from job_manage_app.models import UserProfile, Job, JobApplication, JobMatch
+
+STRESS_USER_PREFIX = 'stress-'
+STRESS_SKILLS = ['python, django, sql', 'java, sql', 'excel, accounting', 'seo, copywriting, branding']
+
+
+class Command(BaseCommand):
+    help = (
+        'Hammer the database from several threads with a mix of reads, applications and profile '
+        'saves, and report throughput, latency and "database is locked" errors as JSON. '
+        'Writes real rows (removed at the end); run it against a copy of the database.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threads', type=int, default=8)
+        parser.add_argument('--seconds', type=float, default=10)
+        parser.add_argument('--write-ratio', type=float, default=0.3, help='Share of operations that write')
+        parser.add_argument('--output', help='Write the JSON report to this file instead of stdout')
+
+    def handle(self, *args, **options):
+        job_ids = list(Job.objects.values_list('id', flat=True)[:500])
+        if not job_ids:
+            raise CommandError('No jobs to apply to; run manage.py seed_portal first.')
+        seekers = [self.stress_seeker(i) for i in range(options['threads'])]
+
+        results = {'read': [], 'write': []}
+        errors = []
+        lock = threading.Lock()
+        deadline = time.perf_counter() + options['seconds']
+
+        def worker(seeker):
+            rng = random.Random(seeker.id)
+            timings = {'read': [], 'write': []}
+            failed = []
+            try:
+                while time.perf_counter() < deadline:
+                    kind = 'write' if rng.random() < options['write_ratio'] else 'read'
+                    start = time.perf_counter()
+                    try:
+                        if kind == 'write':
+                            self.write(seeker, rng.choice(job_ids), rng)
+                        else:
+                            self.read(seeker)
+                    except OperationalError as e:
+                        failed.append(f'{kind}: {e}')
+                        continue
+                    timings[kind].append(time.perf_counter() - start)
+            finally:
+                connections.close_all()
+            with lock:
+                for kind, values in timings.items():
+                    results[kind].extend(values)
+                errors.extend(failed)
+
+        threads = [threading.Thread(target=worker, args=(seeker,)) for seeker in seekers]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA journal_mode')
+            journal_mode = cursor.fetchone()[0]
+        User.objects.filter(username__startswith=STRESS_USER_PREFIX).delete()
+
+        report = {
+            'meta': run_metadata(
+                database=connection.vendor,
+                db_profile=getattr(settings, 'DB_PROFILE', None),
+                journal_mode=journal_mode,
+                read_database='read' in settings.DATABASES,
+                threads=options['threads'],
+                seconds=round(elapsed, 2),
+                write_ratio=options['write_ratio'],
+            ),
+            'errors': len(errors),
+            'error_samples': sorted(set(errors))[:5],
+        }
+        for kind, timings in results.items():
+            report[kind] = {'ops_per_second': round(len(timings) / elapsed, 1), **summarize_latencies(timings)}
+            self.stderr.write(
+                f"{kind}: {report[kind]['ops_per_second']} ops/s, p95 {report[kind]['p95_ms']} ms"
+            )
+        self.stderr.write(f'{len(errors)} operations failed')
+
+        output = json.dumps(report, indent=2)
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                f.write(output + '\n')
+        else:
+            self.stdout.write(output)
+
+    def stress_seeker(self, number):
+        user, _ = User.objects.get_or_create(username=f'{STRESS_USER_PREFIX}{number}')
+        profile, _ = UserProfile.objects.get_or_create(
+            user=user, defaults={'display_name': user.username, 'user_type': 'jobseeker', 'skills': STRESS_SKILLS[0]},
+        )
+        return profile
+
+    def write(self, seeker, job_id, rng):
+        # An application toggled on or off, or a skills change that rebuilds the seeker's matches
+        if rng.random() < 0.5:
+            deleted, _ = JobApplication.objects.filter(job_id=job_id, applicant=seeker).delete()
+            if not deleted:
+                JobApplication.objects.create(job_id=job_id, applicant=seeker)
+        else:
+            seeker.skills = rng.choice(STRESS_SKILLS)
+            seeker.save()
+
+    def read(self, seeker):
+        # Roughly what job_list and the seeker dashboard read
+        with read_only():
+            list(Job.objects.select_related('recruiter').order_by('-created_at', '-id')[:20])
+            list(JobMatch.objects.filter(seeker=seeker).order_by('-match_percentage')[:10])
+            JobApplication.objects.filter(applicant=seeker).count()
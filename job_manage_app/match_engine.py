@@ -0,0 +1,138 @@
+import heapq
+from .models import JobSkill, SeekerSkill, JobMatch
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Seekers scored per NumPy block, bounds the jobs x seekers count matrix
+SEEKER_BLOCK_SIZE = 65536
+
+
+class MatchEngine:
+    """Score every job against every seeker in one batch.
+
+    Skills are encoded as dense column numbers. With NumPy the jobs and
+    seekers become boolean matrices and the overlap counts are a single
+    matrix product; without it each seeker is a packed int bitset and the
+    overlap is a popcount of an AND.
+    """
+
+    def __init__(self, job_skills, seeker_skills, use_numpy=None):
+        self.job_ids = list(job_skills)
+        self.columns = {}
+        for skill_ids in job_skills.values():
+            for skill_id in skill_ids:
+                self.columns.setdefault(skill_id, len(self.columns))
+        self.job_skills = job_skills
+        # Seeker skills no job asks for can never match, so they are dropped
+        self.seeker_skills = {
+            seeker_id: [skill_id for skill_id in skill_ids if skill_id in self.columns]
+            for seeker_id, skill_ids in seeker_skills.items()
+        }
+        self.seeker_ids = sorted(s for s, skill_ids in self.seeker_skills.items() if skill_ids)
+        self.use_numpy = np is not None if use_numpy is None else use_numpy
+
+    def top_matches(self, top_k=None):
+        # {job_id: [(seeker_id, matched_count), ...]} best first, ties by seeker id
+        if not self.job_ids or not self.seeker_ids:
+            return {job_id: [] for job_id in self.job_ids}
+        if self.use_numpy:
+            return self._top_matches_numpy(top_k)
+        return self._top_matches_bitset(top_k)
+
+    def _top_matches_bitset(self, top_k):
+        seeker_masks = []
+        for seeker_id in self.seeker_ids:
+            mask = 0
+            for skill_id in self.seeker_skills[seeker_id]:
+                mask |= 1 << self.columns[skill_id]
+            seeker_masks.append((seeker_id, mask))
+
+        results = {}
+        for job_id in self.job_ids:
+            job_mask = 0
+            for skill_id in self.job_skills[job_id]:
+                job_mask |= 1 << self.columns[skill_id]
+            scored = []
+            for seeker_id, mask in seeker_masks:
+                count = (job_mask & mask).bit_count()
+                if count:
+                    scored.append((seeker_id, count))
+            if top_k is None:
+                scored.sort(key=lambda item: -item[1])
+            else:
+                scored = heapq.nsmallest(top_k, scored, key=lambda item: -item[1])
+            results[job_id] = scored
+        return results
+
+    def _top_matches_numpy(self, top_k):
+        jobs = np.zeros((len(self.job_ids), len(self.columns)), dtype=np.float32)
+        for row, job_id in enumerate(self.job_ids):
+            jobs[row, [self.columns[s] for s in self.job_skills[job_id]]] = 1
+
+        seeker_rows, skill_cols = [], []
+        for row, seeker_id in enumerate(self.seeker_ids):
+            for skill_id in self.seeker_skills[seeker_id]:
+                seeker_rows.append(row)
+                skill_cols.append(self.columns[skill_id])
+        seeker_rows = np.array(seeker_rows)
+        skill_cols = np.array(skill_cols)
+
+        seeker_ids = np.array(self.seeker_ids)
+        best = [([], []) for _ in self.job_ids]
+        for start in range(0, len(self.seeker_ids), SEEKER_BLOCK_SIZE):
+            stop = min(start + SEEKER_BLOCK_SIZE, len(self.seeker_ids))
+            in_block = (seeker_rows >= start) & (seeker_rows < stop)
+            seekers = np.zeros((stop - start, len(self.columns)), dtype=np.float32)
+            seekers[seeker_rows[in_block] - start, skill_cols[in_block]] = 1
+            counts = (jobs @ seekers.T).astype(np.int32)
+
+            for row in range(len(self.job_ids)):
+                hits = np.nonzero(counts[row])[0]
+                if top_k is not None and len(hits) > top_k:
+                    # Highest count first, lowest seeker id among ties
+                    hits = hits[np.lexsort((hits, -counts[row, hits]))[:top_k]]
+                ids, scores = best[row]
+                ids.extend(seeker_ids[start + hits].tolist())
+                scores.extend(counts[row, hits].tolist())
+
+        results = {}
+        for row, job_id in enumerate(self.job_ids):
+            scored = sorted(zip(*best[row]), key=lambda item: (-item[1], item[0]))
+            results[job_id] = scored if top_k is None else scored[:top_k]
+        return results
+
+
+def load_seeker_skills(skill_ids=None):
+    """{profile_id: [skill_id, ...]} for every job seeker, in one query.
+
+    Given skill_ids, only those links are loaded: the seekers who have one of
+    them, with just those skills, which is all MatchEngine needs to score jobs
+    asking for them.
+    """
+    seeker_skills = {}
+    links = SeekerSkill.objects.filter(profile__user_type='jobseeker')
+    if skill_ids is not None:
+        links = links.filter(skill_id__in=list(skill_ids))
+    for profile_id, skill_id in links.values_list('profile_id', 'skill_id').iterator():
+        seeker_skills.setdefault(profile_id, []).append(skill_id)
+    return seeker_skills
+
+def load_job_skills(job_ids):
+    job_skills = {job_id: [] for job_id in job_ids}
+    for job_id, skill_id in JobSkill.objects.filter(job_id__in=job_ids).values_list('job_id', 'skill_id'):
+        job_skills[job_id].append(skill_id)
+    return job_skills
+
+def build_job_matches(job_skills, seeker_skills, use_numpy=None):
+    """Yield unsaved JobMatch rows for every job/seeker pair sharing a skill."""
+    engine = MatchEngine(job_skills, seeker_skills, use_numpy=use_numpy)
+    for job_id, scored in engine.top_matches().items():
+        skill_count = len(job_skills[job_id])
+        for seeker_id, count in scored:
+            yield JobMatch(
+                job_id=job_id, seeker_id=seeker_id, matched_count=count,
+                match_percentage=count * 100 / skill_count,
+            )
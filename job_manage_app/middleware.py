@@ -0,0 +1,154 @@
+import logging
+import time
+from contextlib import ExitStack
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.contrib.auth import BACKEND_SESSION_KEY
+from django.db import connections
+from .auth import aload_profile, profile_of
+from .db_router import read_only
+from .instrumentation import RequestTimer, request_stats
+
+slow_request_logger = logging.getLogger('job_manage_app.slow_requests')
+
+
+class RequestTimingMiddleware:
+    """Time SQL, template rendering and the rest of the view for each request.
+
+    The split is sent back as a Server-Timing header, requests slower than
+    SLOW_REQUEST_THRESHOLD_MS are logged with their slowest queries, and
+    the total is added to the per-URL-name stats behind request_stats.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        timer = RequestTimer()
+        token = timer.activate()
+        start = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                # Reads may go to the "read" database, so every alias is timed
+                for alias in connections:
+                    stack.enter_context(connections[alias].execute_wrapper(timer))
+                response = self.get_response(request)
+        finally:
+            RequestTimer.deactivate(token)
+        return self.finish(request, response, timer, start)
+
+    async def __acall__(self, request):
+        # Async ORM queries run on a worker thread with its own connection,
+        # out of reach of execute_wrapper, so only templates are timed here
+        timer = RequestTimer(track_queries=False)
+        token = timer.activate()
+        start = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            RequestTimer.deactivate(token)
+        return self.finish(request, response, timer, start)
+
+    def finish(self, request, response, timer, start):
+        total_ms = (time.perf_counter() - start) * 1000
+        sql_ms = timer.sql_seconds * 1000
+        template_ms = timer.template_seconds * 1000
+        view_ms = max(total_ms - sql_ms - template_ms, 0)
+        timings = [
+            f'tpl;dur={template_ms:.2f}',
+            f'view;dur={view_ms:.2f}',
+            f'total;dur={total_ms:.2f}',
+        ]
+        if timer.track_queries:
+            timings.insert(0, f'db;dur={sql_ms:.2f};desc="{len(timer.queries)} queries"')
+        response['Server-Timing'] = ', '.join(timings)
+
+        match = request.resolver_match
+        url_name = match.view_name if match else 'unresolved'
+        request_stats.record(url_name, total_ms)
+
+        if total_ms >= getattr(settings, 'SLOW_REQUEST_THRESHOLD_MS', 500):
+            slowest = '\n'.join(
+                f'  {duration * 1000:.2f} ms  {sql}' for duration, sql in timer.slowest_queries()
+            )
+            slow_request_logger.warning(
+                'Slow request %s %s (%s): %.1f ms total, %.1f ms SQL in %d queries, '
+                '%.1f ms templates, %.1f ms view\n%s',
+                request.method, request.get_full_path(), url_name, total_ms, sql_ms,
+                len(timer.queries), template_ms, view_ms, slowest,
+            )
+        return response
+
+
+class ReadOnlyRequestMiddleware:
+    """Route the ORM reads of GET and HEAD requests to the "read" database.
+
+    See ReadReplicaRouter; writes made during these requests still go to
+    the primary.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if request.method not in ('GET', 'HEAD'):
+            return self.get_response(request)
+        with read_only():
+            return self.get_response(request)
+
+    async def __acall__(self, request):
+        if request.method not in ('GET', 'HEAD'):
+            return await self.get_response(request)
+        # sync_to_async copies the context, so ORM calls on worker threads see the flag
+        with read_only():
+            return await self.get_response(request)
+
+
+# Sessions created before ProfileBackend was configured name the stock backend
+LEGACY_AUTH_BACKEND = 'django.contrib.auth.backends.ModelBackend'
+PROFILE_AUTH_BACKEND = 'job_manage_app.auth.ProfileBackend'
+
+class ProfileMiddleware:
+    """Set request.profile to the signed-in user's UserProfile, or None.
+
+    Goes last, after AuthenticationMiddleware and inside the request timing.
+    ProfileBackend loads the profile together with the user, so this costs
+    no query of its own. Under ASGI the user is resolved here as well, so
+    async views and templates find both already loaded.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if request.session.get(BACKEND_SESSION_KEY) == LEGACY_AUTH_BACKEND:
+            request.session[BACKEND_SESSION_KEY] = PROFILE_AUTH_BACKEND
+        request.profile = profile_of(request.user)
+        return self.get_response(request)
+
+    async def __acall__(self, request):
+        if await request.session.aget(BACKEND_SESSION_KEY) == LEGACY_AUTH_BACKEND:
+            await request.session.aset(BACKEND_SESSION_KEY, PROFILE_AUTH_BACKEND)
+        request.profile = await aload_profile(request)
+        return await self.get_response(request)
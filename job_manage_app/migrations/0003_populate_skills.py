@@ -0,0 +1,56 @@
+from django.db import migrations
+
+
+def parse_skills(text):
+    skills = []
+    if text:
+        for skill in text.split(','):
+            skill = skill.strip().lower()[:200]
+            if skill and skill not in skills:
+                skills.append(skill)
+    return skills
+
+
+def populate_skills(apps, schema_editor):
+    Skill = apps.get_model('job_manage_app', 'Skill')
+    Job = apps.get_model('job_manage_app', 'Job')
+    JobSkill = apps.get_model('job_manage_app', 'JobSkill')
+    UserProfile = apps.get_model('job_manage_app', 'UserProfile')
+    SeekerSkill = apps.get_model('job_manage_app', 'SeekerSkill')
+
+    job_skills = {
+        job_id: parse_skills(text)
+        for job_id, text in Job.objects.values_list('id', 'required_skills').iterator()
+    }
+    seeker_skills = {
+        profile_id: parse_skills(text)
+        for profile_id, text in UserProfile.objects.filter(user_type='jobseeker').values_list('id', 'skills').iterator()
+    }
+
+    names = set()
+    for skills in list(job_skills.values()) + list(seeker_skills.values()):
+        names.update(skills)
+    Skill.objects.bulk_create([Skill(name=name) for name in names], ignore_conflicts=True)
+    skill_ids = dict(Skill.objects.values_list('name', 'id'))
+
+    for job_id, skills in job_skills.items():
+        Job.objects.filter(id=job_id).update(skill_count=len(skills))
+    JobSkill.objects.bulk_create(
+        [JobSkill(job_id=job_id, skill_id=skill_ids[name]) for job_id, skills in job_skills.items() for name in skills],
+        batch_size=1000, ignore_conflicts=True,
+    )
+    SeekerSkill.objects.bulk_create(
+        [SeekerSkill(profile_id=profile_id, skill_id=skill_ids[name]) for profile_id, skills in seeker_skills.items() for name in skills],
+        batch_size=1000, ignore_conflicts=True,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('job_manage_app', '0002_skill_tables'),
+    ]
+
+    operations = [
+        migrations.RunPython(populate_skills, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 5.2.6 on 2026-10-18 16:39
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def populate_matches(apps, schema_editor):
+    JobSkill = apps.get_model('job_manage_app', 'JobSkill')
+    JobMatch = apps.get_model('job_manage_app', 'JobMatch')
+    rows = (
+        JobSkill.objects
+        .filter(skill__seeker_links__profile__user_type='jobseeker', job__skill_count__gt=0)
+        .values('job_id', 'job__skill_count', 'skill__seeker_links__profile_id')
+        .annotate(matched=Count('id'))
+        .order_by()
+    )
+    JobMatch.objects.bulk_create([
+        JobMatch(
+            job_id=row['job_id'],
+            seeker_id=row['skill__seeker_links__profile_id'],
+            matched_count=row['matched'],
+            match_percentage=row['matched'] * 100 / row['job__skill_count'],
+        )
+        for row in rows.iterator()
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('job_manage_app', '0003_populate_skills'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobMatch',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('matched_count', models.PositiveIntegerField()),
+                ('match_percentage', models.FloatField()),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='matches', to='job_manage_app.job')),
+                ('seeker', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='job_matches', to='job_manage_app.userprofile')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['seeker', '-match_percentage'], name='job_manage__seeker__41ad87_idx'), models.Index(fields=['job', '-match_percentage'], name='job_manage__job_id_4ee6ad_idx')],
+                'unique_together': {('job', 'seeker')},
+            },
+        ),
+        migrations.RunPython(populate_matches, migrations.RunPython.noop),
+    ]
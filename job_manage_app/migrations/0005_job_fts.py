@@ -0,0 +1,36 @@
+from django.db import migrations
+
+
+def create_job_fts(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT sqlite_compileoption_used('ENABLE_FTS5')")
+        if not cursor.fetchone()[0]:
+            return
+        cursor.execute(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS job_manage_app_job_fts USING fts5("
+            "title, description, required_skills, category, "
+            "tokenize='unicode61 remove_diacritics 2', prefix='2 3')"
+        )
+        cursor.execute(
+            "INSERT INTO job_manage_app_job_fts (rowid, title, description, required_skills, category) "
+            "SELECT id, title, description, required_skills, category FROM job_manage_app_job"
+        )
+
+
+def drop_job_fts(apps, schema_editor):
+    if schema_editor.connection.vendor == 'sqlite':
+        schema_editor.execute("DROP TABLE IF EXISTS job_manage_app_job_fts")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('job_manage_app', '0004_job_match'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_job_fts, drop_job_fts),
+    ]
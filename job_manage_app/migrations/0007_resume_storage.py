@@ -0,0 +1,50 @@
+# Generated by Django 5.2.6 on 2026-10-18 16:59
+
+import django.core.validators
+import job_manage_app.storage
+import os
+from django.db import migrations, models
+
+
+def fill_resume_filenames(apps, schema_editor):
+    # Existing uploads keep the names they were stored under
+    UserProfile = apps.get_model('job_manage_app', 'UserProfile')
+    profiles = list(UserProfile.objects.exclude(resume='').exclude(resume__isnull=True).only('id', 'resume'))
+    for profile in profiles:
+        profile.resume_filename = os.path.basename(profile.resume.name)[:255]
+    UserProfile.objects.bulk_update(profiles, ['resume_filename'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('job_manage_app', '0006_outbox_email'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='userprofile',
+            name='resume_filename',
+            field=models.CharField(blank=True, help_text='Original name of the uploaded resume', max_length=255),
+        ),
+        migrations.AlterField(
+            model_name='userprofile',
+            name='resume',
+            field=models.FileField(blank=True, null=True, storage=job_manage_app.storage.ContentAddressedStorage(), upload_to='resumes/', validators=[django.core.validators.FileExtensionValidator(allowed_extensions=['pdf', 'doc', 'docx'])]),
+        ),
+        migrations.CreateModel(
+            name='StoredFile',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255, unique=True)),
+                ('sha256', models.CharField(max_length=64)),
+                ('size', models.PositiveBigIntegerField()),
+                ('ref_count', models.PositiveIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['ref_count', 'created_at'], name='job_manage__ref_cou_f938b5_idx')],
+            },
+        ),
+        migrations.RunPython(fill_resume_filenames, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,54 @@
+# Generated by Django 5.2.6 on 2026-10-18 17:02
+
+from django.db import migrations, models
+
+
+def create_candidate_fts(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT sqlite_compileoption_used('ENABLE_FTS5')")
+        if not cursor.fetchone()[0]:
+            return
+        cursor.execute(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS job_manage_app_candidate_fts USING fts5("
+            "skills, resume, "
+            "tokenize='unicode61 remove_diacritics 2', prefix='2 3')"
+        )
+        # Resume text is filled in later by extract_resumes
+        cursor.execute(
+            "INSERT INTO job_manage_app_candidate_fts (rowid, skills, resume) "
+            "SELECT id, COALESCE(skills, ''), '' FROM job_manage_app_userprofile WHERE user_type = 'jobseeker'"
+        )
+
+
+def drop_candidate_fts(apps, schema_editor):
+    if schema_editor.connection.vendor == 'sqlite':
+        schema_editor.execute("DROP TABLE IF EXISTS job_manage_app_candidate_fts")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('job_manage_app', '0007_resume_storage'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='storedfile',
+            name='text',
+            field=models.TextField(blank=True),
+        ),
+        migrations.AddField(
+            model_name='storedfile',
+            name='text_error',
+            field=models.CharField(blank=True, max_length=255),
+        ),
+        migrations.AddField(
+            model_name='storedfile',
+            name='text_extracted_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.RunPython(create_candidate_fts, drop_candidate_fts),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.6 on 2026-10-18 17:22
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def count_applications(apps, schema_editor):
+    Job = apps.get_model('job_manage_app', 'Job')
+    UserProfile = apps.get_model('job_manage_app', 'UserProfile')
+    JobApplication = apps.get_model('job_manage_app', 'JobApplication')
+    for model, field, lookup in [(Job, 'application_count', 'job'), (UserProfile, 'applications_received', 'job__recruiter')]:
+        counts = (
+            JobApplication.objects.filter(**{lookup: OuterRef('pk')})
+            .order_by().values(lookup).annotate(total=Count('id')).values('total')
+        )
+        model.objects.update(**{field: Coalesce(Subquery(counts), Value(0))})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('job_manage_app', '0009_query_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='application_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='userprofile',
+            name='applications_received',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text="Applications across a recruiter's jobs"),
+        ),
+        migrations.RunPython(count_applications, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,93 @@
+# Generated by Django 5.2.6 on 2026-10-18 17:44
+
+from collections import Counter
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, F
+from django.db.models.functions import TruncDate
+
+
+def build_rollups(apps, schema_editor):
+    # Same GROUP BYs as analytics.rebuild_rollups, so edits to existing jobs
+    # find their rows in place
+    Job = apps.get_model('job_manage_app', 'Job')
+    JobApplication = apps.get_model('job_manage_app', 'JobApplication')
+    JobSkill = apps.get_model('job_manage_app', 'JobSkill')
+    JobDailyStats = apps.get_model('job_manage_app', 'JobDailyStats')
+    CategoryDailyStats = apps.get_model('job_manage_app', 'CategoryDailyStats')
+    SkillDemand = apps.get_model('job_manage_app', 'SkillDemand')
+
+    category_jobs, category_applications = Counter(), Counter()
+    skill_jobs, skill_applications = Counter(), Counter()
+    for row in Job.objects.values('category', day=TruncDate('created_at')).annotate(n=Count('id')).order_by():
+        category_jobs[row['category'], row['day']] += row['n']
+    rows = JobApplication.objects.values('job_id', 'job__category', day=TruncDate('applied_at')).annotate(n=Count('id')).order_by()
+    job_days = []
+    for row in rows.iterator():
+        job_days.append(JobDailyStats(job_id=row['job_id'], day=row['day'], applications=row['n']))
+        category_applications[row['job__category'], row['day']] += row['n']
+    JobDailyStats.objects.bulk_create(job_days, batch_size=1000)
+    for row in JobSkill.objects.values('skill_id').annotate(n=Count('id')).order_by():
+        skill_jobs[row['skill_id']] += row['n']
+    for row in JobApplication.objects.values(skill=F('job__job_skills__skill_id')).annotate(n=Count('id')).order_by():
+        if row['skill'] is not None:
+            skill_applications[row['skill']] += row['n']
+
+    CategoryDailyStats.objects.bulk_create([
+        CategoryDailyStats(category=category, day=day, jobs_posted=category_jobs[category, day],
+                           applications=category_applications[category, day])
+        for category, day in category_jobs.keys() | category_applications.keys()
+    ], batch_size=1000)
+    SkillDemand.objects.bulk_create([
+        SkillDemand(skill_id=skill_id, jobs_posted=skill_jobs[skill_id], applications=skill_applications[skill_id])
+        for skill_id in skill_jobs.keys() | skill_applications.keys()
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('job_manage_app', '0010_application_counts'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CategoryDailyStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('category', models.CharField(choices=[('technology', 'Technology'), ('finance', 'Finance'), ('healthcare', 'Healthcare'), ('education', 'Education'), ('marketing', 'Marketing'), ('sales', 'Sales'), ('other', 'Other')], max_length=50)),
+                ('day', models.DateField()),
+                ('jobs_posted', models.PositiveIntegerField(default=0)),
+                ('applications', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['day'], name='job_manage__day_c9e3b8_idx')],
+                'unique_together': {('category', 'day')},
+            },
+        ),
+        migrations.CreateModel(
+            name='SkillDemand',
+            fields=[
+                ('skill', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='demand', serialize=False, to='job_manage_app.skill')),
+                ('jobs_posted', models.PositiveIntegerField(default=0)),
+                ('applications', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['-jobs_posted', 'skill'], name='job_manage__jobs_po_224123_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='JobDailyStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('applications', models.PositiveIntegerField(default=0)),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_stats', to='job_manage_app.job')),
+            ],
+            options={
+                'unique_together': {('job', 'day')},
+            },
+        ),
+        migrations.RunPython(build_rollups, migrations.RunPython.noop),
+    ]
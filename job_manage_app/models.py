@@ -1,6 +1,36 @@
 from django.db import models
 from django.contrib.auth.models import User
 from django.core.validators import FileExtensionValidator
+from .storage import resume_storage
+
+
+SKILL_NAME_MAX_LENGTH = 200
+
+
+def parse_skills(text):
+    # Split a comma-separated skills field into unique, lowercased names
+    skills = []
+    if text:
+        for skill in text.split(','):
+            skill = skill.strip().lower()[:SKILL_NAME_MAX_LENGTH]
+            if skill and skill not in skills:
+                skills.append(skill)
+    return skills
+
+def skip_counters(instance, counters, kwargs):
+    """Leave counter columns out of a full save of an existing row.
+
+    The counters only change through F() updates; writing back the value a
+    form or the admin loaded would undo increments made since. Inserts and
+    saves with explicit update_fields are left alone.
+    """
+    if instance._state.adding or kwargs.get('force_insert') or kwargs.get('update_fields') is not None:
+        return
+    kwargs['update_fields'] = [
+        field.name for field in instance._meta.concrete_fields
+        if not field.primary_key and field.name not in counters
+    ]
+
 
 class UserProfile(models.Model):
     USER_TYPES = [
@@ -21,21 +51,32 @@ class UserProfile(models.Model):
     skills = models.TextField(blank=True, null=True, help_text="Enter skills separated by commas")
     resume = models.FileField(
         upload_to='resumes/', 
+        storage=resume_storage,
         blank=True, 
         null=True,
         validators=[FileExtensionValidator(allowed_extensions=['pdf', 'doc', 'docx'])]
     )
+    resume_filename = models.CharField(max_length=255, blank=True, help_text="Original name of the uploaded resume")
+    applications_received = models.PositiveIntegerField(default=0, editable=False, help_text="Applications across a recruiter's jobs")
     
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    class Meta:
+        # candidate_search lists seekers by -updated_at, -id; SQLite keeps the
+        # rowid in every index, so (user_type, updated_at) also serves
+        # WHERE user_type = ... ORDER BY updated_at DESC, id DESC
+        indexes = [models.Index(fields=['user_type', 'updated_at'])]
+    
     def __str__(self):
         return f"{self.display_name} ({self.user_type})"
     
+    def save(self, *args, **kwargs):
+        skip_counters(self, ['applications_received'], kwargs)
+        super().save(*args, **kwargs)
+    
     def get_skills_list(self):
-        if self.skills:
-            return [skill.strip().lower() for skill in self.skills.split(',')]
-        return []
+        return parse_skills(self.skills)
 
 class Job(models.Model):
     CATEGORY_CHOICES = [
@@ -54,17 +95,29 @@ class Job(models.Model):
     category = models.CharField(max_length=50, choices=CATEGORY_CHOICES)
     description = models.TextField()
     required_skills = models.TextField(help_text="Enter required skills separated by commas")
+    skill_count = models.PositiveIntegerField(default=0, editable=False)
+    application_count = models.PositiveIntegerField(default=0, editable=False)
     
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    class Meta:
+        indexes = [
+            models.Index(fields=['created_at']),
+            models.Index(fields=['category', 'created_at']),
+            models.Index(fields=['recruiter', 'created_at']),
+        ]
+    
     def __str__(self):
         return self.title
     
+    def save(self, *args, **kwargs):
+        self.skill_count = len(self.get_required_skills_list())
+        skip_counters(self, ['application_count'], kwargs)
+        super().save(*args, **kwargs)
+    
     def get_required_skills_list(self):
-        if self.required_skills:
-            return [skill.strip().lower() for skill in self.required_skills.split(',')]
-        return []
+        return parse_skills(self.required_skills)
 
 class JobApplication(models.Model):
     job = models.ForeignKey(Job, on_delete=models.CASCADE)
@@ -73,6 +126,137 @@ class JobApplication(models.Model):
     
     class Meta:
         unique_together = ['job', 'applicant']
+        indexes = [
+            models.Index(fields=['applied_at']),
+            models.Index(fields=['applicant', 'applied_at']),
+            models.Index(fields=['job', 'applied_at']),
+        ]
     
     def __str__(self):
         return f"{self.applicant.display_name} applied for {self.job.title}"
+
+
+class Skill(models.Model):
+    name = models.CharField(max_length=SKILL_NAME_MAX_LENGTH, unique=True)
+    
+    def __str__(self):
+        return self.name
+
+class JobSkill(models.Model):
+    job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name='job_skills')
+    skill = models.ForeignKey(Skill, on_delete=models.CASCADE, related_name='job_links')
+    
+    class Meta:
+        unique_together = ['job', 'skill']
+        indexes = [models.Index(fields=['skill', 'job'])]
+    
+    def __str__(self):
+        return f"{self.job_id} requires {self.skill_id}"
+
+class SeekerSkill(models.Model):
+    profile = models.ForeignKey(UserProfile, on_delete=models.CASCADE, related_name='seeker_skills')
+    skill = models.ForeignKey(Skill, on_delete=models.CASCADE, related_name='seeker_links')
+    
+    class Meta:
+        unique_together = ['profile', 'skill']
+        indexes = [models.Index(fields=['skill', 'profile'])]
+    
+    def __str__(self):
+        return f"{self.profile_id} has {self.skill_id}"
+
+class JobMatch(models.Model):
+    job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name='matches')
+    seeker = models.ForeignKey(UserProfile, on_delete=models.CASCADE, related_name='job_matches')
+    matched_count = models.PositiveIntegerField()
+    match_percentage = models.FloatField()
+    
+    class Meta:
+        unique_together = ['job', 'seeker']
+        indexes = [
+            models.Index(fields=['seeker', '-match_percentage']),
+            models.Index(fields=['job', '-match_percentage']),
+        ]
+    
+    def __str__(self):
+        return f"{self.seeker_id} matches {self.job_id} ({self.match_percentage:.0f}%)"
+
+# Rollups for the recruiter analytics page, kept by analytics.py as jobs and
+# applications are created and rebuilt by manage.py backfill_analytics
+class JobDailyStats(models.Model):
+    job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name='daily_stats')
+    day = models.DateField()
+    applications = models.PositiveIntegerField(default=0)
+    
+    class Meta:
+        unique_together = ['job', 'day']
+    
+    def __str__(self):
+        return f"{self.job_id} on {self.day}: {self.applications} applications"
+
+class CategoryDailyStats(models.Model):
+    category = models.CharField(max_length=50, choices=Job.CATEGORY_CHOICES)
+    day = models.DateField()
+    jobs_posted = models.PositiveIntegerField(default=0)
+    applications = models.PositiveIntegerField(default=0)
+    
+    class Meta:
+        unique_together = ['category', 'day']
+        indexes = [models.Index(fields=['day'])]
+    
+    def __str__(self):
+        return f"{self.category} on {self.day}: {self.jobs_posted} jobs, {self.applications} applications"
+
+class SkillDemand(models.Model):
+    skill = models.OneToOneField(Skill, on_delete=models.CASCADE, primary_key=True, related_name='demand')
+    jobs_posted = models.PositiveIntegerField(default=0)
+    applications = models.PositiveIntegerField(default=0)
+    
+    class Meta:
+        indexes = [models.Index(fields=['-jobs_posted', 'skill'])]
+    
+    def __str__(self):
+        return f"{self.skill_id}: {self.jobs_posted} jobs, {self.applications} applications"
+
+class OutboxEmail(models.Model):
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('sending', 'Sending'),
+        ('sent', 'Sent'),
+        ('failed', 'Failed'),
+    ]
+    
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    from_email = models.CharField(max_length=254, blank=True)
+    recipients = models.JSONField()
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending')
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField()
+    claim_token = models.CharField(max_length=32, blank=True)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        indexes = [models.Index(fields=['status', 'next_attempt_at'])]
+    
+    def __str__(self):
+        return f"{self.subject} to {', '.join(self.recipients)} ({self.status})"
+
+class StoredFile(models.Model):
+    name = models.CharField(max_length=255, unique=True)
+    sha256 = models.CharField(max_length=64)
+    size = models.PositiveBigIntegerField()
+    ref_count = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    # Plain text pulled out of the file by extract_resumes, shared by every profile using it
+    text = models.TextField(blank=True)
+    text_extracted_at = models.DateTimeField(null=True, blank=True)
+    text_error = models.CharField(max_length=255, blank=True)
+    
+    class Meta:
+        indexes = [models.Index(fields=['ref_count', 'created_at'])]
+    
+    def __str__(self):
+        return f"{self.name} ({self.ref_count} refs)"
@@ -0,0 +1,79 @@
+import uuid
+from datetime import timedelta
+from django.conf import settings
+from django.core.mail import EmailMessage
+from django.db.models import Q
+from django.utils import timezone
+from .models import OutboxEmail
+
+
+def enqueue_email(subject, body, recipients, from_email=None):
+    """Queue an email for run_mail_worker instead of sending it in the request."""
+    return OutboxEmail.objects.create(
+        subject=subject,
+        body=body,
+        from_email=from_email or settings.DEFAULT_FROM_EMAIL or '',
+        recipients=list(recipients),
+        next_attempt_at=timezone.now(),
+    )
+
+def retry_delay(attempts):
+    # Exponential backoff: base, 2x base, 4x base ... capped
+    base = getattr(settings, 'MAIL_OUTBOX_RETRY_BASE_SECONDS', 30)
+    cap = getattr(settings, 'MAIL_OUTBOX_RETRY_MAX_SECONDS', 3600)
+    return timedelta(seconds=min(base * 2 ** (attempts - 1), cap))
+
+def claim_batch(batch_size):
+    """Mark up to batch_size due emails as ours and return them.
+
+    A claimed row stays in "sending" with next_attempt_at pushed out by
+    MAIL_OUTBOX_LEASE_SECONDS. If the worker dies mid-batch the lease runs
+    out and another worker picks the row up again, so several workers can
+    drain the same table.
+    """
+    now = timezone.now()
+    due = Q(status__in=['pending', 'sending'], next_attempt_at__lte=now)
+    ids = list(OutboxEmail.objects.filter(due).order_by('next_attempt_at', 'id').values_list('id', flat=True)[:batch_size])
+    if not ids:
+        return []
+    token = uuid.uuid4().hex
+    lease = timedelta(seconds=getattr(settings, 'MAIL_OUTBOX_LEASE_SECONDS', 300))
+    # Rows another worker claimed between the two queries no longer match "due"
+    OutboxEmail.objects.filter(due, id__in=ids).update(
+        status='sending', claim_token=token, next_attempt_at=now + lease,
+    )
+    return list(OutboxEmail.objects.filter(claim_token=token, status='sending').order_by('id'))
+
+def deliver_batch(emails, connection):
+    """Send claimed emails over one open connection; return (sent, failed).
+
+    Each email is sent on its own so one bad address does not fail the
+    batch. Failures are retried with backoff until MAIL_OUTBOX_MAX_ATTEMPTS,
+    then left as "failed".
+    """
+    max_attempts = getattr(settings, 'MAIL_OUTBOX_MAX_ATTEMPTS', 5)
+    sent = failed = 0
+    for email in emails:
+        message = EmailMessage(email.subject, email.body, email.from_email or None, email.recipients, connection=connection)
+        email.attempts += 1
+        try:
+            # No-op while the session is up, reconnects after a failure
+            connection.open()
+            message.send(fail_silently=False)
+        except Exception as e:
+            email.last_error = f'{type(e).__name__}: {e}'
+            if email.attempts >= max_attempts:
+                email.status = 'failed'
+            else:
+                email.status = 'pending'
+                email.next_attempt_at = timezone.now() + retry_delay(email.attempts)
+            failed += 1
+            connection.close()
+        else:
+            email.status = 'sent'
+            email.sent_at = timezone.now()
+            email.last_error = ''
+            sent += 1
+        email.claim_token = ''
+        email.save(update_fields=['status', 'attempts', 'next_attempt_at', 'claim_token', 'last_error', 'sent_at'])
+    return sent, failed
@@ -0,0 +1,130 @@
+from django.conf import settings
+from django.core import signing
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Q
+
+CURSOR_SALT = 'job_manage_app.pagination'
+
+
+class CursorPage:
+    def __init__(self, object_list, next_cursor, previous_cursor, count=None, count_cap=None):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+        self.count = count
+        self.count_cap = count_cap
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+    @property
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    @property
+    def count_display(self):
+        if self.count is None:
+            return ''
+        if self.count_cap is not None and self.count > self.count_cap:
+            return f'{self.count_cap}+'
+        return str(self.count)
+
+
+def _encode_cursor(direction, obj, keys):
+    values = []
+    for key in keys:
+        # Rows from .values() querysets are dicts
+        value = obj[key] if isinstance(obj, dict) else getattr(obj, key)
+        values.append(value.isoformat() if hasattr(value, 'isoformat') else value)
+    return signing.dumps([direction, values], salt=CURSOR_SALT, compress=True)
+
+def _decode_cursor(cursor, model, keys):
+    try:
+        direction, values = signing.loads(cursor, salt=CURSOR_SALT)
+    except (signing.BadSignature, TypeError, ValueError):
+        return None, None
+    if direction not in ('next', 'prev') or len(values) != len(keys):
+        return None, None
+    decoded = []
+    for key, value in zip(keys, values):
+        try:
+            field = model._meta.get_field(key)
+        except FieldDoesNotExist:
+            # Annotations such as search_rank are plain numbers
+            decoded.append(value)
+        else:
+            decoded.append(field.to_python(value))
+    return direction, decoded
+
+def _seek(ordering, values, forward):
+    # (a, b) after (x, y) == a > x OR (a = x AND b > y), per key direction
+    condition = Q()
+    equal = Q()
+    for key, value in zip(ordering, values):
+        name = key.lstrip('-')
+        descending = key.startswith('-')
+        lookup = 'lt' if descending == forward else 'gt'
+        condition |= equal & Q(**{f'{name}__{lookup}': value})
+        equal &= Q(**{name: value})
+    return condition
+
+class _KeysetQuery:
+    # The querysets for one page, shared by the sync and async paginators
+
+    def __init__(self, queryset, ordering, cursor, per_page, with_count):
+        self.per_page = per_page or getattr(settings, 'PAGINATION_PAGE_SIZE', 20)
+        self.keys = [key.lstrip('-') for key in ordering]
+        self.direction, values = _decode_cursor(cursor, queryset.model, self.keys) if cursor else (None, None)
+
+        self.count_cap = self.count_query = None
+        if with_count:
+            self.count_cap = getattr(settings, 'PAGINATION_COUNT_CAP', 1000)
+            self.count_query = queryset.order_by()[:self.count_cap + 1]
+
+        if self.direction == 'prev':
+            reverse = [key[1:] if key.startswith('-') else f'-{key}' for key in ordering]
+            queryset = queryset.filter(_seek(ordering, values, forward=False)).order_by(*reverse)
+        elif self.direction == 'next':
+            queryset = queryset.filter(_seek(ordering, values, forward=True)).order_by(*ordering)
+        else:
+            queryset = queryset.order_by(*ordering)
+        self.rows_query = queryset[:self.per_page + 1]
+
+    def page(self, rows, count):
+        if self.direction == 'prev':
+            has_previous = len(rows) > self.per_page
+            rows = rows[:self.per_page][::-1]
+            has_next = True
+        else:
+            has_next = len(rows) > self.per_page
+            rows = rows[:self.per_page]
+            has_previous = self.direction == 'next'
+        next_cursor = _encode_cursor('next', rows[-1], self.keys) if has_next and rows else None
+        previous_cursor = _encode_cursor('prev', rows[0], self.keys) if has_previous and rows else None
+        return CursorPage(rows, next_cursor, previous_cursor, count, self.count_cap)
+
+
+def keyset_paginate(queryset, ordering, cursor=None, per_page=None, with_count=False):
+    """Return one CursorPage of queryset ordered by ordering.
+
+    The last ordering key must be unique (normally the primary key) so
+    every row has a distinct position. Pages are fetched with a WHERE on
+    the boundary row instead of OFFSET, so deep pages cost the same as the
+    first one. Counting is opt-in and capped at PAGINATION_COUNT_CAP rows.
+    """
+    query = _KeysetQuery(queryset, ordering, cursor, per_page, with_count)
+    count = query.count_query.count() if query.count_query is not None else None
+    return query.page(list(query.rows_query), count)
+
+async def akeyset_paginate(queryset, ordering, cursor=None, per_page=None, with_count=False):
+    """keyset_paginate for async views, using the async ORM API."""
+    query = _KeysetQuery(queryset, ordering, cursor, per_page, with_count)
+    count = await query.count_query.acount() if query.count_query is not None else None
+    return query.page([row async for row in query.rows_query], count)
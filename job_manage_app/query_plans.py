@@ -0,0 +1,86 @@
+import re
+from django.db import connection
+
+# Plan details that mean a query reads a whole table or sorts its result.
+# "USE TEMP B-TREE FOR RIGHT PART OF ORDER BY" is not matched: the rows
+# already come in index order and only ties on the leading columns are sorted.
+FULL_SCAN_RE = re.compile(r'^SCAN (\w+)$')
+TEMP_SORT_RE = re.compile(r'USE TEMP B-TREE FOR (ORDER BY|GROUP BY|DISTINCT)')
+
+# Django's names for derived tables (count wrappers, window filters); scanning
+# one reads rows the inner query already limited, not a stored table
+DERIVED_TABLES = {'subquery', 'qualify'}
+
+# Sorts no index can serve, with the reason they are accepted. A query is
+# exempt when its SQL matches the pattern. .values() querysets order by
+# column number instead of column name.
+ALLOWED_SORTS = {
+    r'bm25\(': 'full-text matches are ordered by relevance, computed per query',
+    r'ROW_NUMBER\(\) OVER': "top-k matches per job are ranked and merged across the recruiter's jobs",
+    r'"job_manage_app_job"\."recruiter_id" = %s.* ORDER BY ("job_manage_app_jobapplication"\."applied_at"|\d+) DESC':
+        "applications are merged by date across the recruiter's jobs; the sort covers only that recruiter",
+    r'\) AS "match_percentage", .* ORDER BY ("job_manage_app_jobapplication"\."applied_at"|\d+) DESC':
+        "the export lists a recruiter's applications newest first, as all_applications does; the sort covers "
+        "only that recruiter and runs once per download",
+}
+
+
+class PlanCapture:
+    """connection.execute_wrapper hook that keeps every SELECT with its params."""
+
+    def __init__(self):
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        # Schema lookups (run once per process) are not part of a view's plan
+        if not many and sql.lstrip().upper().startswith(('SELECT', 'WITH')) and 'sqlite_master' not in sql:
+            self.queries.append((sql, params))
+        return execute(sql, params, many, context)
+
+
+def explain(sql, params=()):
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+        return [row[3] for row in cursor.fetchall()]
+
+def plan_problems(sql, plan):
+    """Return the plan lines that are a full table scan or an unexpected temp B-tree sort."""
+    sort_allowed = any(re.search(pattern, sql) for pattern in ALLOWED_SORTS)
+    problems = []
+    for detail in plan:
+        scan = FULL_SCAN_RE.match(detail)
+        if scan and scan.group(1) not in DERIVED_TABLES:
+            problems.append(detail)
+        elif TEMP_SORT_RE.search(detail) and not sort_allowed:
+            problems.append(detail)
+    return problems
+
+def check_queries(queries):
+    # [(sql, problems)] for the captured queries whose plan has problems
+    failures = []
+    seen = set()
+    for sql, params in queries:
+        if sql in seen:
+            continue
+        seen.add(sql)
+        problems = plan_problems(sql, explain(sql, params))
+        if problems:
+            failures.append((sql, problems))
+    return failures
+
+def check_view_plans(cases):
+    """Request each (name, client, url, params) case and explain every query it ran.
+
+    Returns {name: [(sql, problems)]} for the cases with problem plans.
+    """
+    failures = {}
+    for name, client, url, params in cases:
+        capture = PlanCapture()
+        with connection.execute_wrapper(capture):
+            response = client.get(url, params)
+            if response.streaming:
+                b''.join(response.streaming_content)
+        problems = check_queries(capture.queries)
+        if problems:
+            failures[name] = problems
+    return failures
@@ -0,0 +1,97 @@
+import hashlib
+import threading
+import time
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+
+JOBS_VERSION_KEY = 'jobs:version'
+
+# Per-process counters, reported by the request_stats endpoint; the lock
+# keeps increments from threads serving requests at once from being lost
+counters = {'hits': 0, 'misses': 0}
+_counters_lock = threading.Lock()
+
+
+def _count(hits=0, misses=0):
+    with _counters_lock:
+        counters['hits'] += hits
+        counters['misses'] += misses
+
+def get_result_cache():
+    return caches[getattr(settings, 'RESULT_CACHE_ALIAS', 'results')]
+
+def _fresh_version():
+    # A lost version key must not come back as an old value, or entries
+    # cached under that old version would be served again
+    return int(time.time() * 1000)
+
+def jobs_version():
+    cache = get_result_cache()
+    version = cache.get(JOBS_VERSION_KEY)
+    if version is None:
+        cache.add(JOBS_VERSION_KEY, _fresh_version(), timeout=None)
+        version = cache.get(JOBS_VERSION_KEY)
+    return version
+
+def bump_jobs_version():
+    # Invalidates every cached job listing at once, no key scanning
+    cache = get_result_cache()
+    try:
+        cache.incr(JOBS_VERSION_KEY)
+    except ValueError:
+        cache.set(JOBS_VERSION_KEY, _fresh_version(), timeout=None)
+
+def normalize_search(query):
+    return ' '.join(query.lower().split()) if query else ''
+
+def _result_key(namespace, version, params):
+    raw = '|'.join(f'{key}={params[key]}' for key in sorted(params) if params[key])
+    return f'{namespace}:{version}:{hashlib.md5(raw.encode()).hexdigest()}'
+
+def cached_job_result(namespace, params, compute):
+    """Return compute() cached under the normalized params and jobs version."""
+    cache = get_result_cache()
+    key = _result_key(namespace, jobs_version(), params)
+    result = cache.get(key)
+    if result is not None:
+        _count(hits=1)
+        return result
+    _count(misses=1)
+    result = compute()
+    cache.set(key, result, getattr(settings, 'RESULT_CACHE_TIMEOUT', 300))
+    return result
+
+async def acached_job_result(namespace, params, compute):
+    """cached_job_result for async views; compute is a coroutine function."""
+    cache = get_result_cache()
+    # LocMem is an in-process dict, cheaper to call directly than through
+    # the thread hop of the async cache API
+    local = isinstance(cache, LocMemCache)
+    if local:
+        key = _result_key(namespace, jobs_version(), params)
+        result = cache.get(key)
+    else:
+        version = await cache.aget(JOBS_VERSION_KEY)
+        if version is None:
+            version = await sync_to_async(jobs_version)()
+        key = _result_key(namespace, version, params)
+        result = await cache.aget(key)
+    if result is not None:
+        _count(hits=1)
+        return result
+    _count(misses=1)
+    result = await compute()
+    timeout = getattr(settings, 'RESULT_CACHE_TIMEOUT', 300)
+    if local:
+        cache.set(key, result, timeout)
+    else:
+        await cache.aset(key, result, timeout)
+    return result
+
+def cache_stats():
+    with _counters_lock:
+        snapshot = dict(counters)
+    total = snapshot['hits'] + snapshot['misses']
+    return {**snapshot, 'hit_rate': round(snapshot['hits'] / total, 3) if total else None}
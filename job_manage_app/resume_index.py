@@ -0,0 +1,73 @@
+import logging
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from django.conf import settings
+from django.db import connections, transaction
+from django.utils import timezone
+from .models import StoredFile, UserProfile
+from .resume_text import extract_file, extract_many
+from .search import index_candidates
+from .storage import resume_storage
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def save_extracted(name, text, error):
+    """Store one file's text and re-index every seeker who uses it."""
+    StoredFile.objects.filter(name=name).update(
+        text=text, text_error=error[:255], text_extracted_at=timezone.now(),
+    )
+    index_candidates(UserProfile.objects.filter(resume=name).values_list('id', flat=True))
+
+def extract_stored_files(names, workers=None, batch_size=100):
+    """Extract text for many stored files in a process pool; return the count."""
+    done = 0
+    names = list(names)
+    for start in range(0, len(names), batch_size):
+        batch = {resume_storage.path(name): name for name in names[start:start + batch_size]}
+        # Parse the whole batch before opening the transaction, so the write
+        # lock is held only while the results are saved, not while files parse
+        results = list(extract_many(batch, workers=workers))
+        with transaction.atomic():
+            for path, text, error in results:
+                save_extracted(batch[path], text, error)
+        done += len(results)
+    return done
+
+def _get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(max_workers=settings.RESUME_EXTRACTION_WORKERS)
+        return _executor
+
+def _finish(name, future):
+    # Runs on the executor's result thread, which has its own DB connection
+    try:
+        text, error = future.result()
+        save_extracted(name, text, error)
+    except Exception:
+        logger.exception('Resume text extraction failed for %s', name)
+    finally:
+        connections.close_all()
+
+def extract_in_background(name):
+    """Parse a newly uploaded file in the process pool after the upload commits.
+
+    With RESUME_EXTRACTION_WORKERS = 0 the file is parsed in this process
+    instead. Files whose text is already known are skipped, which is the
+    common case for a re-uploaded resume.
+    """
+    def submit():
+        if StoredFile.objects.filter(name=name, text_extracted_at__isnull=False).exists():
+            return
+        path = resume_storage.path(name)
+        if not getattr(settings, 'RESUME_EXTRACTION_WORKERS', 0):
+            save_extracted(name, *extract_file(path))
+            return
+        _get_executor().submit(extract_file, path).add_done_callback(lambda future: _finish(name, future))
+
+    transaction.on_commit(submit)
@@ -0,0 +1,452 @@
+"""Plain-text extraction from PDF, DOCX and DOC resumes.
+
+Everything here is pure Python with no Django imports, so extract_file
+can run in worker processes. PDFs are read with pypdf when it is
+installed and with a small built-in parser otherwise. The built-in parser
+handles the common case: Flate-compressed content streams, object
+streams, and fonts with ToUnicode maps. It skips anything it does not
+understand instead of failing.
+"""
+import os
+import re
+import zipfile
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from xml.etree import ElementTree
+
+try:
+    import pypdf
+except ImportError:
+    pypdf = None
+
+MAX_TEXT_CHARS = 200_000
+WHITESPACE = b' \t\r\n\x0c\x00'
+DELIMITERS = b'()<>[]{}/%'
+OBJECT_RE = re.compile(rb'(\d+)\s+(\d+)\s+obj\b')
+WORD_NS = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+
+
+class Ref:
+    __slots__ = ['number']
+
+    def __init__(self, number):
+        self.number = number
+
+
+class Name(str):
+    pass
+
+
+class Operator(str):
+    pass
+
+
+class _Lexer:
+    # Just enough PDF syntax for object bodies and content streams
+
+    def __init__(self, data, pos=0):
+        self.data = data
+        self.pos = pos
+
+    def skip_whitespace(self):
+        data = self.data
+        while self.pos < len(data):
+            c = data[self.pos]
+            if c in WHITESPACE:
+                self.pos += 1
+            elif c == 0x25:  # % comment
+                end = data.find(b'\n', self.pos)
+                self.pos = len(data) if end < 0 else end + 1
+            else:
+                break
+
+    def read_token(self):
+        start = self.pos
+        data = self.data
+        while self.pos < len(data) and data[self.pos] not in WHITESPACE and data[self.pos] not in DELIMITERS:
+            self.pos += 1
+        return data[start:self.pos]
+
+    def parse(self):
+        """Return the next object, an Operator, or None at the end."""
+        self.skip_whitespace()
+        data = self.data
+        if self.pos >= len(data):
+            return None
+        c = data[self.pos:self.pos + 1]
+        if data.startswith(b'<<', self.pos):
+            self.pos += 2
+            result = {}
+            while True:
+                self.skip_whitespace()
+                if self.pos >= len(data) or data.startswith(b'>>', self.pos):
+                    self.pos += 2
+                    return result
+                key = self.parse()
+                if not isinstance(key, Name):
+                    continue
+                result[key] = self.parse()
+        if c == b'<':
+            end = data.find(b'>', self.pos)
+            end = len(data) if end < 0 else end
+            digits = re.sub(rb'[^0-9A-Fa-f]', b'', data[self.pos + 1:end])
+            self.pos = end + 1
+            if len(digits) % 2:
+                digits += b'0'
+            return bytes.fromhex(digits.decode())
+        if c == b'(':
+            return self.parse_literal()
+        if c == b'[':
+            self.pos += 1
+            items = []
+            while True:
+                self.skip_whitespace()
+                if self.pos >= len(data) or data[self.pos] == 0x5D:
+                    self.pos += 1
+                    return items
+                item = self.parse()
+                if item is None:
+                    return items
+                items.append(item)
+        if c == b'/':
+            self.pos += 1
+            return Name(self.read_token().decode('latin-1'))
+        if c in (b']', b'>', b')', b'{', b'}'):
+            self.pos += 1
+            return Operator(c.decode())
+        token = self.read_token()
+        try:
+            number = int(token)
+        except ValueError:
+            try:
+                return float(token)
+            except ValueError:
+                return Operator(token.decode('latin-1'))
+        # "12 0 R" is a reference
+        mark = self.pos
+        self.skip_whitespace()
+        generation = self.read_token()
+        self.skip_whitespace()
+        if generation.isdigit() and data.startswith(b'R', self.pos) and (
+            self.pos + 1 >= len(data) or data[self.pos + 1] in WHITESPACE or data[self.pos + 1] in DELIMITERS
+        ):
+            self.pos += 1
+            return Ref(number)
+        self.pos = mark
+        return number
+
+    def parse_literal(self):
+        data = self.data
+        self.pos += 1
+        depth = 1
+        out = bytearray()
+        escapes = {0x6E: b'\n', 0x72: b'\r', 0x74: b'\t', 0x62: b'\b', 0x66: b'\f'}
+        while self.pos < len(data):
+            c = data[self.pos]
+            self.pos += 1
+            if c == 0x5C and self.pos < len(data):  # backslash
+                e = data[self.pos]
+                self.pos += 1
+                if e in escapes:
+                    out += escapes[e]
+                elif 0x30 <= e <= 0x37:
+                    digits = bytes([e])
+                    while len(digits) < 3 and self.pos < len(data) and 0x30 <= data[self.pos] <= 0x37:
+                        digits += data[self.pos:self.pos + 1]
+                        self.pos += 1
+                    out.append(int(digits, 8) & 0xFF)
+                elif e in (0x0A, 0x0D):
+                    if e == 0x0D and data.startswith(b'\n', self.pos):
+                        self.pos += 1
+                else:
+                    out.append(e)
+            elif c == 0x28:
+                depth += 1
+                out.append(c)
+            elif c == 0x29:
+                depth -= 1
+                if not depth:
+                    break
+                out.append(c)
+            else:
+                out.append(c)
+        return bytes(out)
+
+
+def _decode_stream(info, raw):
+    filters = info.get('Filter') if isinstance(info, dict) else None
+    if isinstance(filters, Name):
+        filters = [filters]
+    for name in filters or []:
+        if name != 'FlateDecode':
+            return None
+        try:
+            raw = zlib.decompress(raw)
+        except zlib.error:
+            # Salvage what inflates before a corrupt tail
+            raw = zlib.decompressobj().decompress(raw)
+    return raw
+
+
+class _PdfDocument:
+    def __init__(self, data):
+        self.objects = {}
+        self.streams = {}
+        for match in OBJECT_RE.finditer(data):
+            lexer = _Lexer(data, match.end())
+            try:
+                value = lexer.parse()
+            except (ValueError, IndexError):
+                continue
+            number = int(match.group(1))
+            self.objects[number] = value
+            lexer.skip_whitespace()
+            if data.startswith(b'stream', lexer.pos):
+                start = lexer.pos + 6
+                if data.startswith(b'\r\n', start):
+                    start += 2
+                elif data.startswith(b'\n', start) or data.startswith(b'\r', start):
+                    start += 1
+                end = data.find(b'endstream', start)
+                if end >= 0:
+                    self.streams[number] = data[start:end].rstrip(b'\r\n')
+        self.unpack_object_streams()
+        self.fonts = {}
+
+    def unpack_object_streams(self):
+        for number, info in list(self.objects.items()):
+            if not (isinstance(info, dict) and info.get('Type') == 'ObjStm'):
+                continue
+            content = self.stream(number)
+            if content is None:
+                continue
+            header = _Lexer(content)
+            first = info.get('First', 0)
+            offsets = []
+            for _ in range(info.get('N', 0)):
+                obj_number, offset = header.parse(), header.parse()
+                if isinstance(obj_number, int) and isinstance(offset, int):
+                    offsets.append((obj_number, offset))
+            for obj_number, offset in offsets:
+                # Objects written directly in the file win over packed copies
+                if obj_number not in self.objects:
+                    self.objects[obj_number] = _Lexer(content, first + offset).parse()
+
+    def resolve(self, value):
+        seen = 0
+        while isinstance(value, Ref) and seen < 32:
+            value = self.objects.get(value.number)
+            seen += 1
+        return value
+
+    def stream(self, ref_or_number):
+        number = ref_or_number.number if isinstance(ref_or_number, Ref) else ref_or_number
+        if number not in self.streams:
+            return None
+        return _decode_stream(self.objects.get(number), self.streams[number])
+
+    def pages(self):
+        for number in sorted(self.objects):
+            info = self.objects[number]
+            if isinstance(info, dict) and info.get('Type') == 'Page':
+                yield info
+
+    def page_fonts(self, page):
+        resources = self.resolve(page.get('Resources'))
+        parent = page
+        while not isinstance(resources, dict) and isinstance(parent, dict):
+            parent = self.resolve(parent.get('Parent'))
+            resources = self.resolve(parent.get('Resources')) if isinstance(parent, dict) else None
+        fonts = self.resolve(resources.get('Font')) if isinstance(resources, dict) else None
+        if not isinstance(fonts, dict):
+            return {}
+        return {name: self.font(ref) for name, ref in fonts.items()}
+
+    def font(self, ref):
+        key = ref.number if isinstance(ref, Ref) else id(ref)
+        if key not in self.fonts:
+            self.fonts[key] = _Font(self, self.resolve(ref))
+        return self.fonts[key]
+
+    def page_text(self, page):
+        contents = self.resolve(page.get('Contents'))
+        refs = contents if isinstance(contents, list) else [page.get('Contents')]
+        data = b'\n'.join(filter(None, (self.stream(ref) for ref in refs if isinstance(ref, Ref))))
+        return _content_text(data, self.page_fonts(page))
+
+
+class _Font:
+    def __init__(self, document, info):
+        self.cmap = {}
+        self.code_width = 1
+        if not isinstance(info, dict):
+            return
+        to_unicode = info.get('ToUnicode')
+        cmap = document.stream(to_unicode) if isinstance(to_unicode, Ref) else None
+        if cmap:
+            self.parse_cmap(cmap)
+        elif info.get('Subtype') == 'Type0':
+            # Two-byte glyph ids with no map back to characters
+            self.code_width = 2
+            self.cmap = None
+
+    def parse_cmap(self, data):
+        lexer = _Lexer(data)
+        operands = []
+        while True:
+            token = lexer.parse()
+            if token is None:
+                break
+            if not isinstance(token, Operator):
+                operands.append(token)
+                continue
+            if token == 'endcodespacerange' and operands and isinstance(operands[0], bytes):
+                self.code_width = max(len(operands[0]), 1)
+            elif token == 'endbfchar':
+                for source, target in zip(operands[::2], operands[1::2]):
+                    if isinstance(source, bytes) and isinstance(target, bytes):
+                        self.cmap[int.from_bytes(source, 'big')] = _utf16(target)
+            elif token == 'endbfrange':
+                for low, high, target in zip(operands[::3], operands[1::3], operands[2::3]):
+                    if not (isinstance(low, bytes) and isinstance(high, bytes)):
+                        continue
+                    low, high = int.from_bytes(low, 'big'), int.from_bytes(high, 'big')
+                    if isinstance(target, list):
+                        for offset, item in enumerate(target[:high - low + 1]):
+                            if isinstance(item, bytes):
+                                self.cmap[low + offset] = _utf16(item)
+                    elif isinstance(target, bytes) and high - low < 65536:
+                        start = int.from_bytes(target, 'big')
+                        width = len(target)
+                        for offset in range(high - low + 1):
+                            self.cmap[low + offset] = _utf16((start + offset).to_bytes(width, 'big'))
+            if token.startswith('end') or token.startswith('begin'):
+                operands = []
+
+    def decode(self, data):
+        if self.cmap is None:
+            return ''
+        if not self.cmap:
+            return data.decode('cp1252', errors='replace')
+        width = self.code_width
+        return ''.join(
+            self.cmap.get(int.from_bytes(data[i:i + width], 'big'), '')
+            for i in range(0, len(data) - width + 1, width)
+        )
+
+
+def _utf16(data):
+    return data.decode('utf-16-be', errors='ignore')
+
+def _content_text(data, fonts):
+    lexer = _Lexer(data)
+    plain = _Font(None, None)
+    font = plain
+    operands = []
+    out = []
+    y = line_y = 0
+    while True:
+        try:
+            token = lexer.parse()
+        except (ValueError, IndexError):
+            break
+        if token is None:
+            break
+        if not isinstance(token, Operator):
+            operands.append(token)
+            continue
+        if token == 'Tf' and len(operands) >= 2:
+            font = fonts.get(operands[-2]) or plain
+        elif token in ('Tj', "'", '"') and operands and isinstance(operands[-1], bytes):
+            if token != 'Tj':
+                out.append('\n')
+            out.append(font.decode(operands[-1]))
+        elif token == 'TJ' and operands and isinstance(operands[-1], list):
+            for item in operands[-1]:
+                if isinstance(item, bytes):
+                    out.append(font.decode(item))
+                elif isinstance(item, (int, float)) and item < -250:
+                    out.append(' ')
+        elif token in ('Td', 'TD', 'Tm') and len(operands) >= 2 and isinstance(operands[-1], (int, float)):
+            # Runs on the same baseline belong to one line
+            y = operands[-1] if token == 'Tm' else y + operands[-1]
+            out.append(' ' if abs(y - line_y) < 1 else '\n')
+            line_y = y
+        elif token == 'T*':
+            out.append('\n')
+        elif token == 'BI':
+            # Skip inline image data
+            end = data.find(b'EI', lexer.pos)
+            lexer.pos = len(data) if end < 0 else end + 2
+        operands = []
+    return ''.join(out)
+
+def _builtin_pdf_text(path):
+    with open(path, 'rb') as f:
+        document = _PdfDocument(f.read())
+    return '\n'.join(document.page_text(page) for page in document.pages())
+
+def pdf_text(path):
+    if pypdf is not None:
+        return '\n'.join(page.extract_text() or '' for page in pypdf.PdfReader(path).pages)
+    return _builtin_pdf_text(path)
+
+def docx_text(path):
+    # document.xml holds the body; runs of w:t inside each w:p paragraph
+    lines, line = [], []
+    with zipfile.ZipFile(path) as archive, archive.open('word/document.xml') as document:
+        for event, element in ElementTree.iterparse(document, events=('end',)):
+            tag = element.tag
+            if tag == f'{WORD_NS}t':
+                line.append(element.text or '')
+            elif tag == f'{WORD_NS}tab':
+                line.append('\t')
+            elif tag in (f'{WORD_NS}br', f'{WORD_NS}cr'):
+                line.append('\n')
+            elif tag == f'{WORD_NS}p':
+                lines.append(''.join(line))
+                line = []
+                element.clear()
+    return '\n'.join(lines)
+
+def doc_text(path):
+    # Legacy Word binary: pull out runs of readable text, stored either as
+    # UTF-16LE or as 8-bit characters depending on the document
+    with open(path, 'rb') as f:
+        data = f.read()
+    wide = [run.decode('utf-16-le') for run in re.findall(rb'(?:[\x20-\x7e\n\r\t]\x00){4,}', data)]
+    narrow = [run.decode('cp1252') for run in re.findall(rb'[\x20-\x7e\n\r\t]{6,}', data)]
+    runs = wide if sum(map(len, wide)) >= sum(map(len, narrow)) else narrow
+    return '\n'.join(runs)
+
+EXTRACTORS = {'.pdf': pdf_text, '.docx': docx_text, '.doc': doc_text}
+
+
+def normalize_text(text):
+    lines = (' '.join(line.split()) for line in text.splitlines())
+    return '\n'.join(line for line in lines if line)[:MAX_TEXT_CHARS]
+
+def extract_file(path):
+    """Return (text, error) for one resume file; never raises."""
+    extractor = EXTRACTORS.get(os.path.splitext(path)[1].lower())
+    if extractor is None:
+        return '', 'Unsupported file type'
+    try:
+        return normalize_text(extractor(path)), ''
+    except Exception as e:
+        return '', f'{type(e).__name__}: {e}'
+
+def extract_many(paths, workers=None):
+    """Yield (path, text, error) for each path, parsed in a process pool.
+
+    workers=0 parses in this process, which is what tests and tiny
+    batches want; None uses one process per CPU.
+    """
+    paths = list(paths)
+    if workers == 0 or len(paths) <= 1:
+        for path in paths:
+            yield (path, *extract_file(path))
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for path, (text, error) in zip(paths, pool.map(extract_file, paths, chunksize=4)):
+            yield path, text, error
@@ -0,0 +1,226 @@
+import json
+import re
+from django.conf import settings
+from django.db import connection
+from django.db.models import Exists, FloatField, OuterRef, Q, TextField
+from django.db.models.expressions import RawSQL
+from .models import Job, JobSkill, StoredFile, UserProfile
+from .result_cache import bump_jobs_version
+
+FTS_TABLE = 'job_manage_app_job_fts'
+FTS_COLUMNS = ['title', 'description', 'required_skills', 'category']
+# bm25 column weights, in FTS_COLUMNS order: a hit in the title counts most
+FTS_WEIGHTS = [10.0, 1.0, 5.0, 2.0]
+
+CANDIDATE_FTS_TABLE = 'job_manage_app_candidate_fts'
+# Skills typed into the profile count more than a word somewhere in the resume
+CANDIDATE_FTS_WEIGHTS = [5.0, 1.0]
+# SQLite's default limit on SELECTs in one UNION ALL is 500
+SKILLS_PER_QUERY = 200
+
+# (database name, table) pairs known to exist. Only found tables are
+# remembered, so a table created later (by a migration) is picked up.
+_fts_ready = set()
+
+
+def _table_ready(table):
+    key = (connection.settings_dict['NAME'], table)
+    if key not in _fts_ready:
+        if connection.vendor != 'sqlite' or table not in connection.introspection.table_names():
+            return False
+        _fts_ready.add(key)
+    return True
+
+def fts_enabled():
+    return getattr(settings, 'JOB_SEARCH_FTS', True) and _table_ready(FTS_TABLE)
+
+def candidate_fts_enabled():
+    return getattr(settings, 'JOB_SEARCH_FTS', True) and _table_ready(CANDIDATE_FTS_TABLE)
+
+def index_job(job):
+    if not fts_enabled():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [job.pk])
+        cursor.execute(
+            f"INSERT INTO {FTS_TABLE} (rowid, {', '.join(FTS_COLUMNS)}) VALUES (%s, %s, %s, %s, %s)",
+            [job.pk] + [getattr(job, column) for column in FTS_COLUMNS],
+        )
+
+def unindex_job(job_id):
+    if fts_enabled():
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [job_id])
+
+def rebuild_index(job_ids=None):
+    # Re-index the given jobs (or all of them) with one INSERT ... SELECT
+    columns = ', '.join(FTS_COLUMNS)
+    table = Job._meta.db_table
+    with connection.cursor() as cursor:
+        if job_ids is None:
+            cursor.execute(f"DELETE FROM {FTS_TABLE}")
+            cursor.execute(f"INSERT INTO {FTS_TABLE} (rowid, {columns}) SELECT id, {columns} FROM {table}")
+            cursor.execute(f"INSERT INTO {FTS_TABLE} ({FTS_TABLE}) VALUES ('optimize')")
+        else:
+            job_ids = list(job_ids)
+            for start in range(0, len(job_ids), 500):
+                chunk = job_ids[start:start + 500]
+                placeholders = ', '.join(['%s'] * len(chunk))
+                cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid IN ({placeholders})", chunk)
+                cursor.execute(
+                    f"INSERT INTO {FTS_TABLE} (rowid, {columns}) SELECT id, {columns} FROM {table} WHERE id IN ({placeholders})",
+                    chunk,
+                )
+    bump_jobs_version()
+
+def build_match_expression(query):
+    # Every word must match, each as a prefix: "pyth djan" -> "pyth"* "djan"*
+    terms = re.findall(r'\w+', query.lower())
+    return ' '.join(f'"{term}"*' for term in terms)
+
+def _fts_rowids(table, expression):
+    # For pk__in: SQLite runs the MATCH once and looks the rows up by id
+    return RawSQL(f'SELECT rowid FROM {table} WHERE {table} MATCH %s', [expression])
+
+def _fts_value(table, function, owner, expression, output_field):
+    # bm25() and snippet() only work inside a MATCH query. The matches are
+    # materialized once per statement and each row looks up its own value
+    # (through an automatic index on rowid); a MATCH per row would rerun the
+    # whole search for every row
+    return RawSQL(
+        f'WITH hits AS MATERIALIZED (SELECT rowid, {function} AS value FROM {table} WHERE {table} MATCH %s) '
+        f'SELECT value FROM hits WHERE hits.rowid = {owner}.id',
+        [expression], output_field=output_field,
+    )
+
+def search_jobs(jobs, query):
+    """Filter a Job queryset by a free-text query, best matches first.
+
+    Uses the FTS5 index ranked by BM25 when it exists, otherwise falls back
+    to icontains filters across the same columns.
+    """
+    expression = build_match_expression(query)
+    if not (expression and fts_enabled()):
+        return jobs.filter(
+            Q(title__icontains=query) |
+            Q(description__icontains=query) |
+            Q(required_skills__icontains=query) |
+            Q(category__icontains=query)
+        )
+    weights = ', '.join(str(weight) for weight in FTS_WEIGHTS)
+    # search_rank is an annotation so that keyset pagination can filter on it
+    return jobs.filter(pk__in=_fts_rowids(FTS_TABLE, expression)).annotate(
+        search_rank=_fts_value(FTS_TABLE, f'bm25({FTS_TABLE}, {weights})', Job._meta.db_table, expression, FloatField()),
+    ).order_by('search_rank', '-created_at')
+
+def _candidate_select(where=''):
+    profiles = UserProfile._meta.db_table
+    files = StoredFile._meta.db_table
+    return (
+        f"SELECT p.id, COALESCE(p.skills, ''), COALESCE(f.text, '') FROM {profiles} p "
+        f"LEFT JOIN {files} f ON f.name = p.resume WHERE p.user_type = 'jobseeker' {where}"
+    )
+
+def index_candidates(profile_ids):
+    """Re-index seekers' typed skills and resume text for candidate search."""
+    if not candidate_fts_enabled():
+        return
+    profile_ids = list(profile_ids)
+    with connection.cursor() as cursor:
+        for start in range(0, len(profile_ids), 500):
+            chunk = profile_ids[start:start + 500]
+            placeholders = ', '.join(['%s'] * len(chunk))
+            cursor.execute(f"DELETE FROM {CANDIDATE_FTS_TABLE} WHERE rowid IN ({placeholders})", chunk)
+            cursor.execute(
+                f"INSERT INTO {CANDIDATE_FTS_TABLE} (rowid, skills, resume) "
+                + _candidate_select(f'AND p.id IN ({placeholders})'),
+                chunk,
+            )
+
+def rebuild_candidate_index():
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {CANDIDATE_FTS_TABLE}")
+        cursor.execute(f"INSERT INTO {CANDIDATE_FTS_TABLE} (rowid, skills, resume) " + _candidate_select())
+        cursor.execute(f"INSERT INTO {CANDIDATE_FTS_TABLE} ({CANDIDATE_FTS_TABLE}) VALUES ('optimize')")
+
+def search_candidates(profiles, query):
+    """Filter a seeker queryset by skills and resume text, best matches first.
+
+    Adds resume_snippet, the best matching stretch of the resume with
+    hits wrapped in \x02 and \x03, when the FTS5 index exists.
+    """
+    expression = build_match_expression(query)
+    if not (expression and candidate_fts_enabled()):
+        files = StoredFile.objects.filter(name=OuterRef('resume'), text__icontains=query)
+        return profiles.filter(Q(skills__icontains=query) | Q(Exists(files))).order_by('-updated_at')
+    weights = ', '.join(str(weight) for weight in CANDIDATE_FTS_WEIGHTS)
+    profiles_table = UserProfile._meta.db_table
+    return profiles.filter(pk__in=_fts_rowids(CANDIDATE_FTS_TABLE, expression)).annotate(
+        search_rank=_fts_value(
+            CANDIDATE_FTS_TABLE, f'bm25({CANDIDATE_FTS_TABLE}, {weights})', profiles_table, expression, FloatField(),
+        ),
+        resume_snippet=_fts_value(
+            CANDIDATE_FTS_TABLE, f"snippet({CANDIDATE_FTS_TABLE}, 1, char(2), char(3), '…', 24)",
+            profiles_table, expression, TextField(),
+        ),
+    ).order_by('search_rank', 'id')
+
+def split_snippet(snippet):
+    # "a \x02hit\x03 b" -> [('a ', False), ('hit', True), (' b', False)]
+    parts = []
+    for piece in (snippet or '').split('\x03'):
+        text, _, hit = piece.partition('\x02')
+        if text:
+            parts.append((text, False))
+        if hit:
+            parts.append((hit, True))
+    return parts
+
+def resume_skill_hits(profile_ids, skills):
+    """Return {skill: {profile_id, ...}} for skills found in these resumes.
+
+    One UNION ALL query per SKILLS_PER_QUERY skills, each arm a phrase
+    match on the resume column limited to the given profiles.
+    """
+    hits = {}
+    phrases = {}
+    for skill in skills:
+        terms = re.findall(r'\w+', skill.lower())
+        if terms:
+            phrases[skill] = 'resume : "' + ' '.join(terms) + '"'
+    if not (phrases and profile_ids and candidate_fts_enabled()):
+        return hits
+    ids = json.dumps(sorted(profile_ids))
+    items = list(phrases.items())
+    with connection.cursor() as cursor:
+        for start in range(0, len(items), SKILLS_PER_QUERY):
+            chunk = items[start:start + SKILLS_PER_QUERY]
+            arm = (
+                f"SELECT %s, rowid FROM {CANDIDATE_FTS_TABLE} WHERE {CANDIDATE_FTS_TABLE} MATCH %s "
+                f"AND rowid IN (SELECT value FROM json_each(%s))"
+            )
+            params = []
+            for skill, phrase in chunk:
+                params += [skill, phrase, ids]
+            cursor.execute(' UNION ALL '.join([arm] * len(chunk)), params)
+            for skill, profile_id in cursor.fetchall():
+                hits.setdefault(skill, set()).add(profile_id)
+    return hits
+
+def attach_resume_skills(matches):
+    """Set match.resume_skills on JobMatch rows.
+
+    These are the job's required skills that the seeker did not list but
+    that appear in their resume.
+    """
+    job_skills = {}
+    for job_id, name in JobSkill.objects.filter(job__in={m.job_id for m in matches}).values_list('job_id', 'skill__name'):
+        job_skills.setdefault(job_id, []).append(name)
+    missing = {}
+    for match in matches:
+        listed = set(match.matched_skills)
+        missing[match] = [name for name in job_skills.get(match.job_id, []) if name not in listed]
+    hits = resume_skill_hits({m.seeker_id for m in matches}, {name for names in missing.values() for name in names})
+    for match in matches:
+        match.resume_skills = sorted(name for name in missing[match] if match.seeker_id in hits.get(name, ()))
+    return matches
@@ -0,0 +1,119 @@
+import os
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models import F, QuerySet, Subquery
+from django.db.models.signals import pre_save, post_save, pre_delete, post_delete
+from django.dispatch import receiver
+from .analytics import move_job, record_application, record_jobs
+from .auth import forget_cached_users
+from .counters import adjust_application_counts
+from .models import UserProfile, Job, JobApplication, JobSkill
+from .result_cache import bump_jobs_version
+from .resume_index import extract_in_background
+from .search import index_job, unindex_job, index_candidates
+from .storage import adjust_references
+from .skills import sync_job_skills, sync_profile_skills, refresh_job_matches, refresh_seeker_matches
+
+
+@receiver(pre_save, sender=Job)
+def job_saving(sender, instance, raw=False, **kwargs):
+    # The analytics rollups count a job under its category and skills, so an
+    # edit to either moves the counts; remember what they were
+    instance._previous_rollup = None
+    if raw or not instance.pk:
+        return
+    previous = Job.objects.filter(pk=instance.pk).values_list('category', 'required_skills').first()
+    if previous is None:
+        return
+    category, required_skills = previous
+    skills = None
+    if required_skills != instance.required_skills:
+        skills = set(JobSkill.objects.filter(job=instance).values_list('skill_id', flat=True))
+    if category != instance.category or skills is not None:
+        instance._previous_rollup = (category, skills)
+
+# Deleting a job or profile cascades to its skill links and JobMatch rows,
+# so only saves need to touch the match table.
+@receiver(post_save, sender=Job)
+def job_saved(sender, instance, created, raw=False, **kwargs):
+    if not raw:
+        sync_job_skills(instance)
+        if created:
+            record_jobs([instance])
+        elif getattr(instance, '_previous_rollup', None):
+            move_job(instance, *instance._previous_rollup)
+        refresh_job_matches(instance)
+        index_job(instance)
+        # After the commit, or a concurrent request could cache the old
+        # listing again under the new version
+        transaction.on_commit(bump_jobs_version)
+
+@receiver(pre_delete, sender=Job)
+def job_deleting(sender, instance, **kwargs):
+    # Settle the recruiter's total from the stored count while the row still
+    # exists; the instance being deleted may hold a stale application_count
+    recruiter = UserProfile.objects.filter(pk=instance.recruiter_id)
+    stored_count = Job.objects.filter(pk=instance.pk).values('application_count')
+    recruiter.update(applications_received=F('applications_received') - Subquery(stored_count))
+    forget_cached_users(recruiter.values_list('user_id', flat=True))
+
+@receiver(post_delete, sender=Job)
+def job_deleted(sender, instance, **kwargs):
+    unindex_job(instance.pk)
+    transaction.on_commit(bump_jobs_version)
+
+@receiver(pre_save, sender=UserProfile)
+def profile_saving(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    # Runs before FileField.pre_save stores a new upload under its hash name
+    if instance.resume and not instance.resume._committed:
+        instance.resume_filename = os.path.basename(instance.resume.name)[:255]
+    elif not instance.resume:
+        instance.resume_filename = ''
+    instance._previous_resume = None
+    if instance.pk:
+        instance._previous_resume = UserProfile.objects.filter(pk=instance.pk).values_list('resume', flat=True).first()
+
+@receiver(post_save, sender=UserProfile)
+def profile_saved(sender, instance, raw=False, **kwargs):
+    if not raw:
+        adjust_references(instance._previous_resume, instance.resume.name)
+        if instance.resume and instance.resume.name != instance._previous_resume:
+            extract_in_background(instance.resume.name)
+        index_candidates([instance.pk])
+        sync_profile_skills(instance)
+        refresh_seeker_matches(instance)
+        if instance.user_type == 'recruiter':
+            # Job cards show the recruiter's company name
+            transaction.on_commit(bump_jobs_version)
+
+@receiver(post_delete, sender=UserProfile)
+def profile_deleted(sender, instance, **kwargs):
+    adjust_references(instance.resume.name, None)
+    index_candidates([instance.pk])
+
+# ProfileBackend caches each signed-in user together with the profile
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def user_changed(sender, instance, **kwargs):
+    forget_cached_users([instance.pk])
+
+@receiver(post_save, sender=UserProfile)
+@receiver(post_delete, sender=UserProfile)
+def profile_changed(sender, instance, **kwargs):
+    forget_cached_users([instance.user_id])
+
+@receiver(post_save, sender=JobApplication)
+def application_saved(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        adjust_application_counts(instance.job_id, 1)
+        record_application(instance)
+
+@receiver(post_delete, sender=JobApplication)
+def application_deleted(sender, instance, origin=None, **kwargs):
+    # Deleting a job removes its applications with it; job_deleting settles the
+    # recruiter's total in one update instead of one per application
+    origin_model = origin.model if isinstance(origin, QuerySet) else type(origin)
+    if origin_model is not Job:
+        adjust_application_counts(instance.job_id, -1)
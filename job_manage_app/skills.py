@@ -0,0 +1,165 @@
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, F, OuterRef, Subquery, Window
+from django.db.models.functions import RowNumber
+from .models import Skill, JobSkill, SeekerSkill, JobMatch
+
+
+def get_skill_ids(names):
+    # Map skill names to Skill ids, creating any that are missing
+    if not names:
+        return {}
+    names = list(names)
+    Skill.objects.bulk_create([Skill(name=name) for name in names], batch_size=1000, ignore_conflicts=True)
+    skill_ids = {}
+    for start in range(0, len(names), 500):
+        skill_ids.update(Skill.objects.filter(name__in=names[start:start + 500]).values_list('name', 'id'))
+    return skill_ids
+
+def _sync_links(link_model, owner_field, owner, names):
+    skill_ids = set(get_skill_ids(names).values())
+    links = link_model.objects.filter(**{owner_field: owner})
+    links.exclude(skill_id__in=skill_ids).delete()
+    existing = set(links.values_list('skill_id', flat=True))
+    link_model.objects.bulk_create(
+        [link_model(**{owner_field: owner, 'skill_id': skill_id}) for skill_id in skill_ids - existing],
+        ignore_conflicts=True,
+    )
+
+def sync_job_skills(job):
+    _sync_links(JobSkill, 'job', job, job.get_required_skills_list())
+
+def sync_profile_skills(profile):
+    names = profile.get_skills_list() if profile.user_type == 'jobseeker' else []
+    _sync_links(SeekerSkill, 'profile', profile, names)
+
+def bulk_link_job_skills(jobs):
+    # Link freshly bulk-created jobs to their skills; save() signals never ran
+    jobs = [(job.pk, job.get_required_skills_list()) for job in jobs]
+    skill_ids = get_skill_ids({name for _, names in jobs for name in names})
+    JobSkill.objects.bulk_create(
+        [JobSkill(job_id=job_id, skill_id=skill_ids[name]) for job_id, names in jobs for name in names],
+        batch_size=1000, ignore_conflicts=True,
+    )
+
+def bulk_link_seeker_skills(profiles):
+    profiles = [(p.pk, p.get_skills_list()) for p in profiles if p.user_type == 'jobseeker']
+    skill_ids = get_skill_ids({name for _, names in profiles for name in names})
+    SeekerSkill.objects.bulk_create(
+        [SeekerSkill(profile_id=profile_id, skill_id=skill_ids[name]) for profile_id, names in profiles for name in names],
+        batch_size=1000, ignore_conflicts=True,
+    )
+
+def refresh_job_matches(job):
+    # Recompute the JobMatch rows of one job after its skills changed
+    rows = (
+        SeekerSkill.objects
+        .filter(skill__job_links__job=job, profile__user_type='jobseeker')
+        .values('profile_id')
+        .annotate(matched=Count('id'))
+        .order_by()
+    )
+    with transaction.atomic():
+        JobMatch.objects.filter(job=job).delete()
+        if job.skill_count:
+            JobMatch.objects.bulk_create([
+                JobMatch(
+                    job=job, seeker_id=row['profile_id'], matched_count=row['matched'],
+                    match_percentage=row['matched'] * 100 / job.skill_count,
+                )
+                for row in rows
+            ])
+
+def refresh_seeker_matches(profile):
+    # Recompute the JobMatch rows of one seeker after their skills changed
+    rows = (
+        JobSkill.objects
+        .filter(skill__seeker_links__profile=profile, job__skill_count__gt=0)
+        .values('job_id', 'job__skill_count')
+        .annotate(matched=Count('id'))
+        .order_by()
+    )
+    with transaction.atomic():
+        JobMatch.objects.filter(seeker=profile).delete()
+        JobMatch.objects.bulk_create([
+            JobMatch(
+                job_id=row['job_id'], seeker=profile, matched_count=row['matched'],
+                match_percentage=row['matched'] * 100 / row['job__skill_count'],
+            )
+            for row in rows
+        ])
+
+def _seeker_matches(profile, limit):
+    matches = (
+        JobMatch.objects
+        .filter(seeker=profile)
+        .select_related('job__recruiter')
+        .order_by('-match_percentage', 'job_id')
+    )
+    return matches[:limit] if limit is not None else matches
+
+def _seeker_matched_skills(profile, matches):
+    return JobSkill.objects.filter(
+        job__in=[match.job_id for match in matches], skill__seeker_links__profile=profile
+    ).values_list('job_id', 'skill__name')
+
+def _attach_matched_skills(matches, pairs):
+    matched_skills = {match.job_id: [] for match in matches}
+    for job_id, name in pairs:
+        matched_skills[job_id].append(name)
+    for match in matches:
+        match.matched_skills = matched_skills[match.job_id]
+    return matches
+
+def matched_jobs_for_seeker(profile, limit=None):
+    matches = list(_seeker_matches(profile, limit))
+    return _attach_matched_skills(matches, _seeker_matched_skills(profile, matches))
+
+async def amatched_jobs_for_seeker(profile, limit=None):
+    matches = [match async for match in _seeker_matches(profile, limit)]
+    pairs = [pair async for pair in _seeker_matched_skills(profile, matches)]
+    return _attach_matched_skills(matches, pairs)
+
+def matched_seekers_for_recruiter(profile, top_k=None):
+    # Best top_k seekers per job, ranked in SQL with a window over JobMatch
+    if top_k is None:
+        top_k = getattr(settings, 'SKILL_MATCH_TOP_K', None)
+    matches = JobMatch.objects.filter(job__recruiter=profile)
+    if top_k is not None:
+        matches = matches.annotate(rank=Window(
+            RowNumber(), partition_by=F('job_id'),
+            order_by=(F('match_percentage').desc(), F('seeker_id').asc()),
+        )).filter(rank__lte=top_k)
+    matches = list(
+        matches.select_related('job', 'seeker__user')
+        .order_by('-match_percentage', 'job_id', 'seeker_id')
+    )
+
+    matched_skills = {(match.job_id, match.seeker_id): [] for match in matches}
+    triples = SeekerSkill.objects.filter(
+        profile__in={match.seeker_id for match in matches},
+        skill__job_links__job__in={match.job_id for match in matches},
+    ).values_list('skill__job_links__job_id', 'profile_id', 'skill__name')
+    for job_id, seeker_id, name in triples:
+        if (job_id, seeker_id) in matched_skills:
+            matched_skills[job_id, seeker_id].append(name)
+    for match in matches:
+        match.matched_skills = matched_skills[match.job_id, match.seeker_id]
+    return matches
+
+def with_seeker_match(jobs, profile):
+    # Annotate each job with the seeker's precomputed match_percentage (None without a JobMatch row)
+    match = JobMatch.objects.filter(job=OuterRef('pk'), seeker=profile).values('match_percentage')
+    return jobs.annotate(match_percentage=Subquery(match))
+
+def match_for_job(profile, job):
+    """The seeker's skills the job asks for, and the match percentage.
+
+    job comes from with_seeker_match, so nothing is queried: the names are
+    the overlap of the two parsed skill lists, which is what the JobMatch
+    row counted.
+    """
+    if not job.match_percentage:
+        return [], 0
+    skills = set(profile.get_skills_list())
+    return [name for name in job.get_required_skills_list() if name in skills], job.match_percentage
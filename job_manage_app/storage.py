@@ -0,0 +1,118 @@
+import hashlib
+import os
+import re
+import tempfile
+from datetime import timedelta
+from django.core.files.storage import FileSystemStorage
+from django.db import IntegrityError
+from django.db.models import Count, F
+from django.utils import timezone
+from django.utils.deconstruct import deconstructible
+
+# resumes/ab/ab12...ef.pdf
+CONTENT_NAME_RE = re.compile(r'(?:^|/)[0-9a-f]{2}/([0-9a-f]{64})\.\w+$')
+
+
+@deconstructible
+class ContentAddressedStorage(FileSystemStorage):
+    """File storage that keeps one copy of each distinct file.
+
+    Uploads are streamed to a temporary file while being hashed, then
+    moved to <upload_to>/<sha256[:2]>/<sha256>.<ext>. Uploading bytes that
+    are already stored only points the field at the existing file. Each
+    stored file has a StoredFile row whose ref_count says how many
+    profiles use it; gc_resumes deletes the ones nobody uses.
+    """
+
+    def get_available_name(self, name, max_length=None):
+        # _save picks the final name from the content, never a random suffix
+        return name
+
+    def _save(self, name, content):
+        from .models import StoredFile
+
+        directory, filename = os.path.split(name)
+        extension = os.path.splitext(filename)[1].lower()
+        os.makedirs(self.location, exist_ok=True)
+        digest = hashlib.sha256()
+        size = 0
+        with tempfile.NamedTemporaryFile(dir=self.location, prefix='.upload-', delete=False) as temp:
+            for chunk in content.chunks():
+                digest.update(chunk)
+                size += len(chunk)
+                temp.write(chunk)
+        sha256 = digest.hexdigest()
+        stored_name = '/'.join(part for part in (directory, sha256[:2], f'{sha256}{extension}') if part)
+
+        path = self.path(stored_name)
+        if os.path.exists(path):
+            os.remove(temp.name)
+        else:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Atomic, so a concurrent identical upload can only write the same bytes
+            os.replace(temp.name, path)
+            if self.file_permissions_mode is not None:
+                os.chmod(path, self.file_permissions_mode)
+        try:
+            StoredFile.objects.get_or_create(name=stored_name, defaults={'sha256': sha256, 'size': size})
+        except IntegrityError:
+            pass
+        return stored_name
+
+    def etag(self, name):
+        # Content-addressed names carry their own hash; legacy files fall back to size and mtime
+        match = CONTENT_NAME_RE.search(name)
+        if match:
+            return f'"{match.group(1)}"'
+        return f'W/"{self.size(name):x}-{int(self.get_modified_time(name).timestamp()):x}"'
+
+
+resume_storage = ContentAddressedStorage()
+
+
+def adjust_references(old_name, new_name):
+    """Move one reference from old_name to new_name after a profile save."""
+    from .models import StoredFile
+
+    if old_name == new_name:
+        return
+    if new_name:
+        StoredFile.objects.filter(name=new_name).update(ref_count=F('ref_count') + 1)
+    if old_name:
+        StoredFile.objects.filter(name=old_name, ref_count__gt=0).update(ref_count=F('ref_count') - 1)
+
+def recount_references():
+    """Recompute every ref_count from the profiles, repairing any drift."""
+    from .models import StoredFile, UserProfile
+
+    counts = dict(
+        UserProfile.objects.exclude(resume='').exclude(resume__isnull=True)
+        .values('resume').annotate(total=Count('id')).values_list('resume', 'total')
+    )
+    changed = []
+    for stored in StoredFile.objects.all():
+        ref_count = counts.get(stored.name, 0)
+        if stored.ref_count != ref_count:
+            stored.ref_count = ref_count
+            changed.append(stored)
+    StoredFile.objects.bulk_update(changed, ['ref_count'], batch_size=500)
+    return len(changed)
+
+def collect_garbage(grace=timedelta(hours=24), dry_run=False):
+    """Delete stored files no profile references; return their names.
+
+    Files younger than grace are kept, so an upload whose profile save
+    has not committed yet is not deleted under it.
+    """
+    from .models import StoredFile
+
+    unused = StoredFile.objects.filter(ref_count=0, created_at__lt=timezone.now() - grace)
+    if dry_run:
+        return list(unused.values_list('name', flat=True))
+    deleted = []
+    for stored in unused:
+        # Skip files that gained a reference since the query above
+        if StoredFile.objects.filter(pk=stored.pk, ref_count=0).delete()[0]:
+            resume_storage.delete(stored.name)
+            deleted.append(stored.name)
+    return deleted
@@ -1,3 +1,1631 @@
-from django.test import TestCase
+import json
+import os
+import random
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
+import zipfile
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
+from datetime import timedelta
+from importlib import import_module
+from io import StringIO
+from smtplib import SMTPServerDisconnected
+from unittest import skipIf
+from django.apps import apps as django_apps
+from django.conf import settings
+from django.contrib.auth import BACKEND_SESSION_KEY
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core import mail
+from django.core.cache import cache, caches
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.mail.backends.base import BaseEmailBackend
+from django.core.mail.backends.locmem import EmailBackend as LocMemEmailBackend
+from django.core.management import call_command, CommandError
+from django.db import connection, connections
+from django.db.utils import ConnectionHandler
+from django.test import AsyncClient, Client, RequestFactory, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import resolve, reverse
+from django.utils import timezone
+from .models import (
+    UserProfile, Job, JobApplication, Skill, SeekerSkill, JobMatch, OutboxEmail, StoredFile,
+    JobDailyStats, CategoryDailyStats, SkillDemand, parse_skills,
+)
+from .skills import matched_jobs_for_seeker, match_for_job, with_seeker_match
+from . import async_views, fragments, match_engine, result_cache, search, views
+from .db_router import ReadReplicaRouter, read_only
+from .instrumentation import request_stats
+from .management.commands import loadtest
+from .middleware import ReadOnlyRequestMiddleware
+from .match_engine import MatchEngine, load_seeker_skills
+from .file_serving import parse_range
+from .outbox import claim_batch, enqueue_email
+from .query_plans import plan_problems
+from .throttling import parse_rate, take
+from .resume_text import extract_file, extract_many
+from .storage import resume_storage
 
-# Create your tests here.
+
+def make_profile(username, user_type, **fields):
+    user = User.objects.create_user(username=username, email=f'{username}@example.com')
+    return UserProfile.objects.create(user=user, display_name=username, user_type=user_type, **fields)
+
+def make_job(recruiter, title, required_skills, category='technology'):
+    return Job.objects.create(
+        recruiter=recruiter, title=title, number_of_openings=1,
+        category=category, description=f'{title} description', required_skills=required_skills,
+    )
+def make_pdf(*objects):
+    # Numbered 1.. in order; the content stream is always object 4
+    body = b''.join(b'%d 0 obj\n%s\nendobj\n' % (number, obj) for number, obj in enumerate(objects, 1))
+    return b'%PDF-1.4\n' + body + b'trailer << /Root 1 0 R >>\n%%EOF\n'
+
+def pdf_stream(data, compress=True):
+    if compress:
+        return b'<< /Length %d /Filter /FlateDecode >>\nstream\n%s\nendstream' % (len(zlib.compress(data)), zlib.compress(data))
+    return b'<< /Length %d >>\nstream\n%s\nendstream' % (len(data), data)
+
+def make_resume_pdf(text):
+    return make_pdf(
+        b'<< /Type /Catalog /Pages 2 0 R >>',
+        b'<< /Type /Pages /Kids [3 0 R] /Count 1 /Resources << /Font << /F1 5 0 R >> >> >>',
+        b'<< /Type /Page /Parent 2 0 R /Contents 4 0 R >>',
+        pdf_stream(b'BT /F1 12 Tf 72 720 Td (' + text.encode() + b') Tj ET'),
+        b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>',
+    )
+
+def make_docx(*paragraphs):
+    namespace = 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'
+    body = ''.join(f'<w:p><w:r><w:t>{text}</w:t></w:r></w:p>' for text in paragraphs)
+    buffer = tempfile.SpooledTemporaryFile()
+    with zipfile.ZipFile(buffer, 'w') as archive:
+        archive.writestr('word/document.xml', f'<w:document xmlns:w="{namespace}"><w:body>{body}</w:body></w:document>')
+    buffer.seek(0)
+    return buffer.read()
+
+
+class FailingEmailBackend(BaseEmailBackend):
+    def send_messages(self, email_messages):
+        raise SMTPServerDisconnected('Connection unexpectedly closed')
+
+class CountingEmailBackend(LocMemEmailBackend):
+    instances = 0
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        CountingEmailBackend.instances += 1
+
+
+class PortalTestCase(TestCase):
+    def setUp(self):
+        # Cached job listings would otherwise outlive each test's rollback
+        for cache in caches.all():
+            cache.clear()
+
+
+class SkillIndexTests(PortalTestCase):
+    def setUp(self):
+        super().setUp()
+        self.recruiter = make_profile('acme', 'recruiter', company_name='Acme')
+        self.seeker = make_profile('alice', 'jobseeker', skills='Python, Django,  SQL')
+
+    def test_parse_skills_normalizes(self):
+        self.assertEqual(parse_skills(' Python,django,,PYTHON , '), ['python', 'django'])
+        self.assertEqual(parse_skills(None), [])
+
+    def test_links_follow_text_fields(self):
+        job = make_job(self.recruiter, 'Backend', 'Python, Go')
+        self.assertEqual(job.skill_count, 2)
+        self.assertEqual(set(job.job_skills.values_list('skill__name', flat=True)), {'python', 'go'})
+
+        job.required_skills = 'Go, Rust'
+        job.save()
+        self.assertEqual(set(job.job_skills.values_list('skill__name', flat=True)), {'go', 'rust'})
+        self.assertEqual(Skill.objects.filter(name='go').count(), 1)
+
+        self.seeker.skills = 'SQL'
+        self.seeker.save()
+        self.assertEqual(list(self.seeker.seeker_skills.values_list('skill__name', flat=True)), ['sql'])
+
+    def test_recruiters_have_no_seeker_links(self):
+        self.assertFalse(SeekerSkill.objects.filter(profile=self.recruiter).exists())
+
+    def test_matched_jobs_ranked_by_percentage(self):
+        half = make_job(self.recruiter, 'Half', 'Python, Go')
+        full = make_job(self.recruiter, 'Full', 'python, django')
+        make_job(self.recruiter, 'None', 'Rust')
+
+        matches = matched_jobs_for_seeker(self.seeker)
+        self.assertEqual([m.job for m in matches], [full, half])
+        self.assertEqual(matches[0].match_percentage, 100)
+        self.assertEqual(sorted(matches[0].matched_skills), ['django', 'python'])
+        self.assertEqual(matches[1].match_percentage, 50)
+        self.assertEqual(len(matched_jobs_for_seeker(self.seeker, limit=1)), 1)
+
+        half = with_seeker_match(Job.objects, self.seeker).get(pk=half.pk)
+        with self.assertNumQueries(0):
+            self.assertEqual(match_for_job(self.seeker, half), (['python'], 50))
+        rust = with_seeker_match(Job.objects, self.seeker).get(title='None')
+        self.assertEqual(match_for_job(self.seeker, rust), ([], 0))
+
+    def test_dashboard_shows_matches(self):
+        job = make_job(self.recruiter, 'Full', 'python, django')
+        self.client.force_login(self.seeker.user)
+        response = self.client.get(reverse('dashboard'))
+        self.assertEqual([m.job for m in response.context['matched_jobs']], [job])
+
+
+class MatchEngineTests(PortalTestCase):
+    job_skills = {1: [10, 11], 2: [12], 3: [10, 11, 12, 13]}
+    seeker_skills = {100: [10, 11], 101: [11, 99], 102: [99], 103: [12, 13]}
+    expected = {
+        1: [(100, 2), (101, 1)],
+        2: [(103, 1)],
+        3: [(100, 2), (103, 2), (101, 1)],
+    }
+
+    def test_bitset_backend(self):
+        engine = MatchEngine(self.job_skills, self.seeker_skills, use_numpy=False)
+        self.assertEqual(engine.top_matches(), self.expected)
+        self.assertEqual(engine.top_matches(top_k=1)[3], [(100, 2)])
+
+    @skipIf(match_engine.np is None, 'NumPy is not installed')
+    def test_numpy_backend(self):
+        engine = MatchEngine(self.job_skills, self.seeker_skills, use_numpy=True)
+        self.assertEqual(engine.top_matches(), self.expected)
+        self.assertEqual(engine.top_matches(top_k=1)[3], [(100, 2)])
+
+    def test_recruiter_skill_match_page(self):
+        recruiter = make_profile('acme', 'recruiter', company_name='Acme')
+        alice = make_profile('alice', 'jobseeker', skills='python, django')
+        bob = make_profile('bob', 'jobseeker', skills='python')
+        make_profile('carol', 'jobseeker', skills='cobol')
+        job = make_job(recruiter, 'Backend', 'Python, Django')
+
+        self.client.force_login(recruiter.user)
+        matches = self.client.get(reverse('skill_match')).context['matched_jobs']
+        self.assertEqual([(m.job, m.seeker, m.match_percentage) for m in matches],
+                         [(job, alice, 100), (job, bob, 50)])
+        self.assertEqual(sorted(matches[0].matched_skills), ['django', 'python'])
+
+        with self.settings(SKILL_MATCH_TOP_K=1):
+            matches = self.client.get(reverse('skill_match')).context['matched_jobs']
+        self.assertEqual([m.seeker for m in matches], [alice])
+
+
+class JobMatchTableTests(PortalTestCase):
+    def setUp(self):
+        super().setUp()
+        self.recruiter = make_profile('acme', 'recruiter', company_name='Acme')
+        self.seeker = make_profile('alice', 'jobseeker', skills='python, django')
+        self.job = make_job(self.recruiter, 'Backend', 'Python, Go')
+
+    def match_rows(self):
+        return set(JobMatch.objects.values_list('job_id', 'seeker_id', 'matched_count', 'match_percentage'))
+
+    def test_rows_follow_saves_and_deletes(self):
+        self.assertEqual(self.match_rows(), {(self.job.id, self.seeker.id, 1, 50)})
+
+        self.seeker.skills = 'python, go'
+        self.seeker.save()
+        self.assertEqual(self.match_rows(), {(self.job.id, self.seeker.id, 2, 100)})
+
+        self.job.required_skills = 'Rust'
+        self.job.save()
+        self.assertEqual(self.match_rows(), set())
+
+        other = make_job(self.recruiter, 'Scripting', 'python')
+        self.assertEqual(self.match_rows(), {(other.id, self.seeker.id, 1, 100)})
+        other.delete()
+        self.assertEqual(self.match_rows(), set())
+
+    def test_rebuild_command_matches_incremental_rows(self):
+        make_profile('bob', 'jobseeker', skills='go, rust')
+        make_job(self.recruiter, 'Systems', 'rust, go, c')
+        expected = self.match_rows()
+        JobMatch.objects.all().delete()
+
+        call_command('rebuild_matches', stdout=StringIO())
+        self.assertEqual(self.match_rows(), expected)
+        call_command('rebuild_matches', '--no-numpy', '--batch-size', '1', stdout=StringIO())
+        self.assertEqual(self.match_rows(), expected)
+
+
+class JobSearchTests(PortalTestCase):
+    def setUp(self):
+        super().setUp()
+        recruiter = make_profile('acme', 'recruiter', company_name='Acme')
+        self.django_job = make_job(recruiter, 'Django Developer', 'python, django')
+        self.python_job = make_job(recruiter, 'Data Analyst', 'python, pandas')
+        self.sales_job = make_job(recruiter, 'Account Manager', 'negotiation', category='sales')
+
+    def search(self, query, **params):
+        response = self.client.get(reverse('job_list'), {'search': query, **params})
+        return list(response.context['jobs'])
+
+    def test_fts_index_is_used(self):
+        self.assertTrue(search.fts_enabled())
+        self.assertEqual(search.build_match_expression('Pyth, DJAN!'), '"pyth"* "djan"*')
+
+    def test_ranked_multi_term_and_prefix_search(self):
+        self.assertEqual(self.search('python')[0], self.python_job)
+        self.assertEqual(set(self.search('pyth')), {self.django_job, self.python_job})
+        self.assertEqual(self.search('django developer'), [self.django_job])
+        self.assertEqual(self.search('python', category='sales'), [])
+        self.assertEqual(self.search('sales'), [self.sales_job])
+
+    def test_index_follows_saves_and_deletes(self):
+        self.sales_job.title = 'Kotlin Engineer'
+        # Cached listings are invalidated when the write commits
+        with self.captureOnCommitCallbacks(execute=True):
+            self.sales_job.save()
+        self.assertEqual(self.search('kotlin'), [self.sales_job])
+        with self.captureOnCommitCallbacks(execute=True):
+            self.sales_job.delete()
+        self.assertEqual(self.search('kotlin'), [])
+
+    def test_rebuild_command(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {search.FTS_TABLE}')
+        self.assertEqual(self.search('django'), [])
+        call_command('rebuild_search_index', stdout=StringIO())
+        self.assertEqual(self.search('django'), [self.django_job])
+
+    @override_settings(JOB_SEARCH_FTS=False)
+    def test_icontains_fallback(self):
+        self.assertEqual(self.search('Analyst'), [self.python_job])
+        self.assertEqual(self.search('pyth'), [self.python_job, self.django_job])
+
+
+@override_settings(PAGINATION_PAGE_SIZE=2, PAGINATION_COUNT_CAP=3)
+class KeysetPaginationTests(PortalTestCase):
+    def setUp(self):
+        super().setUp()
+        self.recruiter = make_profile('acme', 'recruiter', company_name='Acme')
+        self.jobs = [make_job(self.recruiter, f'Python Job {i}', 'python') for i in range(5)]
+        self.jobs.reverse()  # newest first
+
+    def walk(self, params):
+        pages, cursor = [], None
+        while True:
+            response = self.client.get(reverse('job_list'), {**params, 'cursor': cursor} if cursor else params)
+            page = response.context['jobs']
+            pages.append(list(page))
+            if not page.has_next:
+                return pages, page
+            cursor = page.next_cursor
+
+    def test_next_and_previous_cursors(self):
+        pages, last = self.walk({})
+        self.assertEqual(pages, [self.jobs[0:2], self.jobs[2:4], self.jobs[4:]])
+        self.assertEqual(last.count_display, '3+')
+
+        response = self.client.get(reverse('job_list'), {'cursor': last.previous_cursor})
+        self.assertEqual(list(response.context['jobs']), self.jobs[2:4])
+        self.assertTrue(response.context['jobs'].has_previous)
+
+    def test_cursor_keeps_filters(self):
+        make_job(self.recruiter, 'Account Manager', 'negotiation', category='sales')
+        pages, _ = self.walk({'search': 'python', 'category': 'technology'})
+        self.assertEqual(sorted(job.id for page in pages for job in page), sorted(job.id for job in self.jobs))
+        response = self.client.get(reverse('job_list'), {'search': 'python'})
+        self.assertContains(response, 'search=python&amp;cursor=')
+
+    def test_tampered_cursor_starts_over(self):
+        response = self.client.get(reverse('job_list'), {'cursor': 'bogus'})
+        self.assertEqual(list(response.context['jobs']), self.jobs[0:2])
+
+    def test_my_applications_pages(self):
+        seeker = make_profile('alice', 'jobseeker', skills='python')
+        for job in reversed(self.jobs):
+            JobApplication.objects.create(job=job, applicant=seeker)
+        self.client.force_login(seeker.user)
+        page = self.client.get(reverse('my_applications')).context['applications']
+        self.assertEqual([a.job for a in page], self.jobs[0:2])
+        page = self.client.get(reverse('my_applications'), {'cursor': page.next_cursor}).context['applications']
+        self.assertEqual([a.job for a in page], self.jobs[2:4])
+
+
+# The settings used with a shared (file or redis) cache; in tests LocMem
+# stands in for it, as there is one process
+SHARED_SESSION_CACHE = override_settings(
+    SESSION_ENGINE='django.contrib.sessions.backends.cached_db', USER_CACHE_ALIAS='sessions',
+)
+
+
+@SHARED_SESSION_CACHE
+class QueryBudgetTests(PortalTestCase):
+    """Every list page runs a fixed number of queries however many rows it shows.
+
+    Signed-in requests make no auth queries: with a shared cache the session
+    and the user with its profile are served from it.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.recruiter = make_profile('acme', 'recruiter', company_name='Acme')
+        self.seeker = make_profile('alice', 'jobseeker', skills='python, django, sql')
+        self.seed(5)
+
+    def seed(self, n):
+        start = Job.objects.count()
+        for i in range(start, start + n):
+            job = make_job(self.recruiter, f'Job {i}', 'python, django, go')
+            applicant = make_profile(f'seeker{i}', 'jobseeker', skills='python, go')
+            JobApplication.objects.create(job=job, applicant=applicant)
+            JobApplication.objects.create(job=job, applicant=self.seeker)
+
+    def get(self, name, *args, **params):
+        response = self.client.get(reverse(name, args=args), params)
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def assertQueryBudget(self, budget, name, *args, **params):
+        # Same budget before and after doubling the data set. The session and
+        # signed-in user are warm in the cache; listings are not
+        for _ in range(2):
+            self.get(name, *args, **params)
+            result_cache.get_result_cache().clear()
+            with self.assertNumQueries(budget):
+                self.get(name, *args, **params)
+            self.seed(5)
+
+    def login(self, username):
+        self.client.force_login(User.objects.get(username=username))
+
+    def test_home(self):
+        self.assertQueryBudget(0, 'home')
+
+    # The page, its count and the live application counts
+    def test_job_list_anonymous(self):
+        self.assertQueryBudget(3, 'job_list')
+
+    def test_job_list_search(self):
+        self.assertQueryBudget(3, 'job_list', search='python', category='technology')
+
+    def test_job_list_seeker(self):
+        self.login('alice')
+        self.assertQueryBudget(3, 'job_list')
+
+    def test_seeker_dashboard(self):
+        self.login('alice')
+        self.assertQueryBudget(2, 'dashboard')
+
+    def test_recruiter_dashboard(self):
+        self.login('acme')
+        self.assertQueryBudget(1, 'dashboard')
+
+    def test_seeker_skill_match(self):
+        self.login('alice')
+        self.assertQueryBudget(2, 'skill_match')
+
+    def test_recruiter_skill_match(self):
+        self.login('acme')
+        # +2: the jobs' skills and one resume lookup for the ones seekers did not list
+        self.assertQueryBudget(4, 'skill_match')
+
+    def test_candidate_search(self):
+        self.login('acme')
+        self.assertQueryBudget(2, 'candidate_search', q='python')
+
+    def test_recruiter_analytics(self):
+        self.login('acme')
+        self.assertQueryBudget(3, 'recruiter_analytics', days=90)
+
+    def test_my_applications(self):
+        self.login('alice')
+        self.assertQueryBudget(2, 'my_applications')
+
+    def test_all_applications(self):
+        self.login('acme')
+        # The total is the recruiter's application counter, not a COUNT
+        self.assertQueryBudget(2, 'all_applications')
+
+    def test_job_applications(self):
+        self.login('acme')
+        job = Job.objects.first()
+        self.assertQueryBudget(2, 'job_applications', job.id)
+
+    def test_apply_job(self):
+        self.login('alice')
+        job = Job.objects.first()
+        self.assertQueryBudget(1, 'apply_job', job.id)
+
+    def test_api_jobs(self):
+        # Rows only: cursor pages need no COUNT
+        self.assertQueryBudget(1, 'api_jobs', search='python')
+
+    def test_api_matches(self):
+        self.login('alice')
+        self.assertQueryBudget(1, 'api_matches')
+
+    def test_api_applications(self):
+        self.login('acme')
+        self.assertQueryBudget(1, 'api_applications')
+
+
+class BenchmarkCommandTests(PortalTestCase):
+    def test_seed_then_bench(self):
+        call_command('seed_portal', recruiters=2, seekers=10, jobs=8, applications=20, batch_size=4, stdout=StringIO())
+        self.assertEqual(Job.objects.count(), 8)
+        self.assertEqual(UserProfile.objects.filter(user_type='jobseeker').count(), 10)
+        self.assertTrue(JobApplication.objects.exists())
+        job = Job.objects.first()
+        self.assertEqual(job.skill_count, job.job_skills.count())
+        self.assertTrue(JobMatch.objects.exists())
+        self.assertTrue(User.objects.get(username='seed_seeker_0').check_password('seedpass123'))
+        # Every seeker is in the candidate index
+        seekers = UserProfile.objects.filter(user_type='jobseeker')
+        skill = seekers.first().get_skills_list()[0]
+        self.assertLessEqual(
+            set(seekers.filter(seeker_skills__skill__name=skill).values_list('id', flat=True)),
+            set(search.search_candidates(seekers, skill).values_list('id', flat=True)),
+        )
+
+        with self.assertRaises(CommandError):
+            call_command('seed_portal', recruiters=1, seekers=0, jobs=0, applications=0, stdout=StringIO())
+
+        out = StringIO()
+        call_command('bench_views', iterations=2, warmup=0, stdout=out, stderr=StringIO())
+        report = json.loads(out.getvalue())
+        self.assertEqual(report['meta']['rows']['jobs'], 8)
+        for name in ('home', 'job_list_search', 'skill_match_recruiter', 'apply_job', 'all_applications'):
+            self.assertEqual(report['views'][name]['status'], 200)
+            self.assertIn('p95_ms', report['views'][name])
+            self.assertIn('peak_memory_kb', report['views'][name])
+
+        out = StringIO()
+        call_command('bench_fragments', iterations=2, stdout=out, stderr=StringIO())
+        report = json.loads(out.getvalue())['views']
+        self.assertEqual(set(report), {'job_list', 'job_list_search', 'dashboard_seeker', 'dashboard_recruiter', 'skill_match_seeker'})
+        self.assertIn('saved_template_ms', report['job_list'])
+
+    def test_loadtest_journeys(self):
+        # The command runs users in threads, which cannot see this test's
+        # transaction, so the journeys run here in the test thread
+        recruiter = make_profile('acme', 'recruiter', company_name='Acme')
+        job = make_job(recruiter, 'Backend Dev', 'python')
+        command = loadtest.Command()
+        password = make_password(loadtest.LOADTEST_PASSWORD)
+        users = [
+            loadtest.VirtualUser(command.loadtest_profile(i, user_type, password, random.Random(i)), i, [job.id], random.Random(i))
+            for i, user_type in enumerate(['recruiter', 'jobseeker'])
+        ]
+        for user in users:
+            self.assertTrue(user.login())
+            user.journey()
+        report = command.report(users, 1.0, {'think_time': 0}, 1)
+        self.assertEqual(report['errors'], 0, report['error_samples'])
+        self.assertEqual(report['journeys'], 2)
+        self.assertEqual(report['views']['POST apply_job']['statuses'], {'302': 1})
+        self.assertEqual(report['views']['GET job_applications']['requests'], 1)
+        self.assertGreater(report['write_lock']['samples'], 0)
+        self.assertEqual(JobApplication.objects.get().job, job)
+
+        command.remove_users()
+        self.assertEqual(list(Job.objects.all()), [job])
+        job.refresh_from_db()
+        self.assertEqual(job.application_count, 0)
+
+
+class RequestInstrumentationTests(PortalTestCase):
+    def setUp(self):
+        super().setUp()
+        request_stats.clear()
+        recruiter = make_profile('acme', 'recruiter', company_name='Acme')
+        make_job(recruiter, 'Backend', 'python')
+
+    def test_server_timing_header(self):
+        response = self.client.get(reverse('job_list'))
+        timing = dict(part.split(';', 1) for part in response['Server-Timing'].split(', '))
+        self.assertEqual(set(timing), {'db', 'tpl', 'view', 'total'})
+        self.assertIn('desc="3 queries"', timing['db'])
+        self.assertNotEqual(timing['tpl'], 'dur=0.00')
+
+    @override_settings(SLOW_REQUEST_THRESHOLD_MS=0)
+    def test_slow_requests_are_logged_with_queries(self):
+        with self.assertLogs('job_manage_app.slow_requests', 'WARNING') as logs:
+            self.client.get(reverse('job_list'))
+        self.assertIn('job_list', logs.output[0])
+        self.assertIn('SELECT', logs.output[0])
+
+    def test_stats_endpoint_is_staff_only(self):
+        for _ in range(3):
+            self.client.get(reverse('job_list'))
+        self.assertEqual(self.client.get(reverse('request_stats')).status_code, 302)
+
+        staff = User.objects.create_user(username='ops', is_staff=True)
+        self.client.force_login(staff)
+        stats = self.client.get(reverse('request_stats')).json()['views']
+        self.assertEqual(stats['job_list']['requests'], 3)
+        self.assertEqual(sum(stats['job_list']['histogram'].values()), 3)
+        self.assertIn('p95_ms', stats['job_list'])
+
+
+class ResultCacheTests(PortalTestCase):
+    def setUp(self):
+        super().setUp()
+        self.recruiter = make_profile('acme', 'recruiter', company_name='Acme')
+        self.job = make_job(self.recruiter, 'Python Developer', 'python')
+        result_cache.counters.update(hits=0, misses=0)
+
+    def test_listing_served_from_cache_until_jobs_change(self):
+        self.client.get(reverse('job_list'), {'search': 'Python'})
+        # Only the application counts are read live
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse('job_list'), {'search': '  python '})
+        self.assertEqual(list(response.context['jobs']), [self.job])
+        self.assertEqual(response.context['search_query'], '  python ')
+        self.assertEqual(result_cache.counters, {'hits': 1, 'misses': 1})
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            other = make_job(self.recruiter, 'Python Tester', 'python')
+        # The version moves only once the job is committed
+        response = self.client.get(reverse('job_list'), {'search': 'python'})
+        self.assertEqual(list(response.context['jobs']), [self.job])
+        for callback in callbacks:
+            callback()
+        response = self.client.get(reverse('job_list'), {'search': 'python'})
+        self.assertEqual(set(response.context['jobs']), {self.job, other})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            other.delete()
+        response = self.client.get(reverse('job_list'), {'search': 'python'})
+        self.assertEqual(list(response.context['jobs']), [self.job])
+        self.assertEqual(result_cache.counters['misses'], 3)
+
+    def test_application_counts_are_live_on_cached_pages(self):
+        self.client.get(reverse('job_list'))
+        JobApplication.objects.create(job=self.job, applicant=make_profile('alice', 'jobseeker'))
+        self.assertContains(self.client.get(reverse('job_list')), '1 applicant')
+        self.assertEqual(result_cache.counters['hits'], 1)
+
+    def test_recruiter_profile_change_invalidates(self):
+        self.client.get(reverse('job_list'))
+        self.recruiter.company_name = 'Globex'
+        with self.captureOnCommitCallbacks(execute=True):
+            self.recruiter.save()
+        self.assertContains(self.client.get(reverse('job_list')), 'Globex')
+
+    def test_lost_version_key_does_not_revive_old_entries(self):
+        version = result_cache.jobs_version()
+        result_cache.get_result_cache().delete(result_cache.JOBS_VERSION_KEY)
+        time.sleep(0.002)   # a later millisecond than the first version
+        self.assertGreater(result_cache.jobs_version(), version)
+
+
+@SHARED_SESSION_CACHE
+class AuthCacheTests(PortalTestCase):
+    def setUp(self):
+        super().setUp()
+        self.recruiter = make_profile('acme', 'recruiter', company_name='Acme')
+        self.recruiter.user.set_password('secret-pass-1')
+        self.recruiter.user.save()
+        self.seeker = make_profile('alice', 'jobseeker', skills='python')
+        self.job = make_job(self.recruiter, 'Backend Dev', 'python')
+
+    def login(self):
+        response = self.client.post(reverse('login'), {'username': 'acme', 'password': 'secret-pass-1'})
+        self.assertRedirects(response, reverse('dashboard'))
+
+    def dashboard(self):
+        response = self.client.get(reverse('dashboard'))
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def test_warm_requests_make_no_auth_queries(self):
+        self.login()
+        self.assertEqual(self.client.session[BACKEND_SESSION_KEY], 'job_manage_app.auth.ProfileBackend')
+        caches['sessions'].clear()
+        # Cold: the session row, then the user joined with its profile
+        with CaptureQueriesContext(connection) as queries:
+            self.dashboard()
+        auth_queries = [q['sql'] for q in queries.captured_queries if 'django_session' in q['sql'] or 'auth_user' in q['sql']]
+        self.assertEqual(len(auth_queries), 2)
+        self.assertIn('job_manage_app_userprofile', auth_queries[1])
+        # Warm: only the recruiter's jobs
+        with self.assertNumQueries(1):
+            response = self.dashboard()
+        self.assertEqual(response.wsgi_request.profile, self.recruiter)
+
+    def test_saves_and_counter_updates_refresh_the_cached_profile(self):
+        # Cached users are dropped when the write commits, which TestCase
+        # only simulates through captureOnCommitCallbacks
+        self.login()
+        self.dashboard()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse('profile'), {'display_name': 'Acme Hiring', 'company_name': 'Acme'})
+        self.assertContains(self.dashboard(), 'Welcome, Acme Hiring!')
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            JobApplication.objects.create(job=self.job, applicant=self.seeker)
+        # Not before the commit, or a concurrent request could cache the old row again
+        self.assertEqual(self.dashboard().context['profile'].applications_received, 0)
+        for callback in callbacks:
+            callback()
+        self.assertEqual(self.dashboard().context['profile'].applications_received, 1)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.job.delete()
+        self.assertEqual(self.dashboard().context['profile'].applications_received, 0)
+
+    def test_password_change_and_logout_end_the_session(self):
+        self.login()
+        self.dashboard()
+        user = User.objects.get(username='acme')
+        user.set_password('secret-pass-2')
+        with self.captureOnCommitCallbacks(execute=True):
+            user.save()
+        self.assertRedirects(self.client.get(reverse('dashboard')), f"{reverse('login')}?next={reverse('dashboard')}")
+
+        self.client.force_login(user)
+        self.dashboard()
+        self.client.get(reverse('logout'))
+        self.assertEqual(self.client.get(reverse('dashboard')).status_code, 302)
+
+    @override_settings(SESSION_ENGINE='django.contrib.sessions.backends.db', USER_CACHE_ALIAS=None)
+    def test_without_a_shared_cache_every_request_reads_the_database(self):
+        # The default settings: nothing a worker keeps can outlive a change
+        # made by another one, so no invalidation is needed
+        self.login()
+        with CaptureQueriesContext(connection) as queries:
+            self.dashboard()
+        auth_queries = [q['sql'] for q in queries.captured_queries if 'django_session' in q['sql'] or 'auth_user' in q['sql']]
+        self.assertEqual(len(auth_queries), 2)
+        UserProfile.objects.filter(user__username='acme').update(display_name='Acme Hiring')
+        self.assertContains(self.dashboard(), 'Welcome, Acme Hiring!')
+        User.objects.filter(username='acme').update(password=make_password('secret-pass-2'))
+        self.assertEqual(self.client.get(reverse('dashboard')).status_code, 302)
+
+    def test_legacy_sessions_and_missing_profiles(self):
+        self.client.force_login(self.seeker.user, backend='django.contrib.auth.backends.ModelBackend')
+        self.assertEqual(self.client.get(reverse('my_applications')).status_code, 200)
+        self.assertEqual(self.client.session[BACKEND_SESSION_KEY], 'job_manage_app.auth.ProfileBackend')
+
+        bare = User.objects.create_user(username='bare')
+        self.client.force_login(bare)
+        self.client.get(reverse('job_list'))
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse('home'))
+        self.assertIsNone(response.wsgi_request.profile)
+
+
+class ThrottlingTests(PortalTestCase):
+    def setUp(self):
+        super().setUp()
+        self.seeker = make_profile('alice', 'jobseeker')
+        self.seeker.user.set_password('secret-pass-1')
+        self.seeker.user.save()
+
+    def test_parse_rate(self):
+        self.assertEqual(parse_rate('5/min'), (5, 60))
+        self.assertEqual(parse_rate('3/10min'), (3, 600))
+        self.assertIsNone(parse_rate(None))
+        with self.assertRaises(ValueError):
+            parse_rate('0/min')
+
+    def test_bucket_refills(self):
+        rate = (2, 60)
+        self.assertEqual(take('bucket', rate, now=1000), 0)
+        self.assertEqual(take('bucket', rate, now=1000), 0)
+        self.assertAlmostEqual(take('bucket', rate, now=1000), 30)
+        self.assertAlmostEqual(take('bucket', rate, now=1015), 15)
+        self.assertEqual(take('bucket', rate, now=1030), 0)
+
+    @override_settings(THROTTLE_RATES={'login:ip': '10/min', 'login:username': '2/min'})
+    def test_login_rejected_before_authenticate(self):
+        for _ in range(2):
+            response = self.client.post(reverse('login'), {'username': 'Alice', 'password': 'wrong'})
+            self.assertEqual(response.status_code, 200)
+        with self.assertNumQueries(0):
+            response = self.client.post(reverse('login'), {'username': 'alice', 'password': 'secret-pass-1'})
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response['Retry-After'], '30')
+        # Other usernames and page views are not affected
+        response = self.client.post(reverse('login'), {'username': 'bob', 'password': 'wrong'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.client.get(reverse('login')).status_code, 200)
+
+    @override_settings(THROTTLE_RATES={'login:ip': '2/min'})
+    def test_login_limited_per_ip(self):
+        for username in ('a', 'b'):
+            self.client.post(reverse('login'), {'username': username, 'password': 'wrong'})
+        response = self.client.post(reverse('login'), {'username': 'c', 'password': 'wrong'})
+        self.assertEqual(response.status_code, 429)
+        response = self.client.post(reverse('login'), {'username': 'c', 'password': 'wrong'}, REMOTE_ADDR='10.0.0.2')
+        self.assertEqual(response.status_code, 200)
+
+    @override_settings(THROTTLE_RATES={'password_reset:email': '1/h', 'otp:email': '2/5min'})
+    def test_password_reset_and_otp_guesses(self):
+        self.client.post(reverse('forgot_password'), {'email': 'alice@example.com'})
+        response = self.client.post(reverse('forgot_password'), {'email': 'alice@example.com'})
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(OutboxEmail.objects.count(), 1)
+
+        for _ in range(2):
+            response = self.client.post(reverse('otp_verify'), {'otp': '0'})
+            self.assertContains(response, 'Invalid OTP')
+        response = self.client.post(reverse('otp_verify'), {'otp': str(cache.get('alice@example.com'))})
+        self.assertEqual(response.status_code, 429)
+
+
+class FragmentCacheTests(PortalTestCase):
+    def setUp(self):
+        super().setUp()
+        self.recruiter = make_profile('acme', 'recruiter', company_name='Acme')
+        self.seeker = make_profile('alice', 'jobseeker', skills='python')
+        self.jobs = [make_job(self.recruiter, f'Python Job {i}', 'python, go') for i in range(3)]
+        fragments.counters.update(hits=0, misses=0)
+
+    def get_job_list(self):
+        # Skip the page cache so the cards are looked up again
+        result_cache.get_result_cache().clear()
+        return self.client.get(reverse('job_list'))
+
+    def test_cards_are_rendered_once_and_reused(self):
+        first = self.get_job_list()
+        self.assertEqual(fragments.counters, {'hits': 0, 'misses': 3})
+        second = self.get_job_list()
+        self.assertEqual(fragments.counters, {'hits': 3, 'misses': 3})
+        self.assertEqual(first.content, second.content)
+        self.assertContains(second, 'Python Job 2')
+        self.assertContains(second, '<span class="badge bg-secondary me-1">Go</span>', html=True)
+
+    def test_edits_change_the_key(self):
+        self.get_job_list()
+        job = self.jobs[0]
+        job.title = 'Rust Job'
+        job.save()
+        self.recruiter.company_name = 'Globex'
+        self.recruiter.save()
+        response = self.get_job_list()
+        self.assertContains(response, 'Rust Job')
+        self.assertContains(response, 'Globex', count=3)
+        self.assertNotContains(response, 'Acme')
+
+    def test_per_viewer_parts_render_live(self):
+        self.client.force_login(self.recruiter.user)
+        self.client.get(reverse('dashboard'))
+        JobApplication.objects.create(job=self.jobs[0], applicant=self.seeker)
+        response = self.client.get(reverse('dashboard'))
+        self.assertEqual(fragments.counters, {'hits': 3, 'misses': 3})
+        self.assertContains(response, '</i>1 application\n')
+
+        self.client.force_login(self.seeker.user)
+        response = self.client.get(reverse('skill_match'))
+        self.assertContains(response, '50% Match', count=3)
+        self.assertEqual(fragments.counters['misses'], 6)
+
+
+@override_settings(ROOT_URLCONF='job_portal_project.asgi_urls')
+class AsyncViewTests(PortalTestCase):
+    def setUp(self):
+        super().setUp()
+        self.recruiter = make_profile('acme', 'recruiter', company_name='Acme')
+        self.seeker = make_profile('alice', 'jobseeker', skills='python, django')
+        self.job = make_job(self.recruiter, 'Python Developer', 'python, go')
+        JobApplication.objects.create(job=self.job, applicant=self.seeker)
+        self.async_client = AsyncClient()
+
+    def test_async_views_are_routed(self):
+        for name in ('home', 'job_list', 'dashboard', 'my_applications'):
+            self.assertIs(resolve(reverse(name)).func, getattr(async_views, name))
+        self.assertIs(resolve(reverse('skill_match')).func, views.skill_match)
+
+    async def test_anonymous_pages(self):
+        response = await self.async_client.get(reverse('home'))
+        self.assertEqual(response.status_code, 200)
+        response = await self.async_client.get(reverse('job_list'), {'search': 'python'})
+        self.assertEqual(list(response.context['jobs']), [self.job])
+        self.assertIn('tpl;dur=', response['Server-Timing'])
+
+    async def test_seeker_pages(self):
+        await self.async_client.aforce_login(self.seeker.user)
+        response = await self.async_client.get(reverse('dashboard'))
+        self.assertEqual([m.job for m in response.context['matched_jobs']], [self.job])
+        response = await self.async_client.get(reverse('my_applications'))
+        self.assertEqual([a.job for a in response.context['applications']], [self.job])
+        response = await self.async_client.get(reverse('job_list'))
+        self.assertContains(response, 'Apply Now')
+
+    async def test_recruiter_pages(self):
+        await self.async_client.aforce_login(self.recruiter.user)
+        response = await self.async_client.get(reverse('dashboard'))
+        self.assertEqual(response.context['jobs'], [self.job])
+        response = await self.async_client.get(reverse('my_applications'))
+        self.assertRedirects(response, reverse('dashboard'), fetch_redirect_response=False)
+
+    async def test_user_without_profile(self):
+        user = await User.objects.acreate(username='bare')
+        await self.async_client.aforce_login(user)
+        response = await self.async_client.get(reverse('job_list'))
+        self.assertEqual(response.status_code, 200)
+        response = await self.async_client.get(reverse('dashboard'))
+        self.assertRedirects(response, reverse('profile'), fetch_redirect_response=False)
+
+
+class MailOutboxTests(PortalTestCase):
+    def setUp(self):
+        super().setUp()
+        self.seeker = make_profile('alice', 'jobseeker')
+
+    def run_worker(self):
+        call_command('run_mail_worker', '--once', stdout=StringIO())
+
+    def test_forgot_password_only_enqueues(self):
+        response = self.client.post(reverse('forgot_password'), {'email': 'alice@example.com'})
+        self.assertRedirects(response, reverse('otp_verify'), fetch_redirect_response=False)
+        self.assertEqual(mail.outbox, [])
+        queued = OutboxEmail.objects.get()
+        self.assertEqual((queued.status, queued.recipients), ('pending', ['alice@example.com']))
+
+        self.run_worker()
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertIn(str(cache.get('alice@example.com')), mail.outbox[0].body)
+        self.assertEqual(OutboxEmail.objects.get().status, 'sent')
+
+    @override_settings(EMAIL_BACKEND='job_manage_app.tests.CountingEmailBackend')
+    def test_batch_shares_one_connection(self):
+        for i in range(3):
+            enqueue_email(f'Notice {i}', 'Body', [f'user{i}@example.com'])
+        CountingEmailBackend.instances = 0
+        self.run_worker()
+        self.assertEqual([m.subject for m in mail.outbox], ['Notice 0', 'Notice 1', 'Notice 2'])
+        self.assertEqual(CountingEmailBackend.instances, 1)
+
+    @override_settings(EMAIL_BACKEND='job_manage_app.tests.FailingEmailBackend', MAIL_OUTBOX_MAX_ATTEMPTS=2)
+    def test_failures_back_off_then_give_up(self):
+        queued = enqueue_email('Notice', 'Body', ['alice@example.com'])
+        self.run_worker()
+        queued.refresh_from_db()
+        self.assertEqual((queued.status, queued.attempts), ('pending', 1))
+        self.assertIn('SMTPServerDisconnected', queued.last_error)
+        self.assertGreater(queued.next_attempt_at, timezone.now() + timedelta(seconds=20))
+
+        # Not due yet, so another pass leaves it alone
+        self.run_worker()
+        queued.refresh_from_db()
+        self.assertEqual(queued.attempts, 1)
+
+        OutboxEmail.objects.update(next_attempt_at=timezone.now())
+        self.run_worker()
+        queued.refresh_from_db()
+        self.assertEqual((queued.status, queued.attempts), ('failed', 2))
+
+    def test_expired_claims_are_picked_up_again(self):
+        stale = enqueue_email('Stale', 'Body', ['a@example.com'])
+        live = enqueue_email('Live', 'Body', ['b@example.com'])
+        OutboxEmail.objects.filter(pk=stale.pk).update(status='sending', next_attempt_at=timezone.now() - timedelta(seconds=1))
+        OutboxEmail.objects.filter(pk=live.pk).update(status='sending', next_attempt_at=timezone.now() + timedelta(minutes=5))
+        self.assertEqual([email.pk for email in claim_batch(10)], [stale.pk])
+        self.assertEqual(claim_batch(10), [])
+
+
+class ResumeStorageTests(PortalTestCase):
+    def setUp(self):
+        super().setUp()
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        override = override_settings(MEDIA_ROOT=media_root)
+        override.enable()
+        self.addCleanup(override.disable)
+        self.alice = make_profile('alice', 'jobseeker')
+        self.bob = make_profile('bob', 'jobseeker')
+        self.recruiter = make_profile('acme', 'recruiter', company_name='Acme')
+
+    def upload(self, profile, filename, content):
+        self.client.force_login(profile.user)
+        self.client.post(reverse('profile'), {
+            'display_name': profile.display_name,
+            'skills': 'python',
+            'resume': SimpleUploadedFile(filename, content, content_type='application/pdf'),
+        })
+        profile.refresh_from_db()
+        return profile.resume.name
+
+    def test_identical_uploads_share_one_file(self):
+        first = self.upload(self.alice, 'cv.pdf', b'%PDF same bytes')
+        second = self.upload(self.bob, 'resume_final.PDF', b'%PDF same bytes')
+        self.assertEqual(first, second)
+        self.assertRegex(first, r'^resumes/[0-9a-f]{2}/[0-9a-f]{64}\.pdf$')
+        self.assertEqual(len(os.listdir(os.path.dirname(resume_storage.path(first)))), 1)
+        self.assertEqual(StoredFile.objects.get().ref_count, 2)
+        self.assertEqual((self.alice.resume_filename, self.bob.resume_filename), ('cv.pdf', 'resume_final.PDF'))
+
+    def test_unreferenced_files_are_collected(self):
+        old = self.upload(self.alice, 'cv.pdf', b'%PDF version one')
+        new = self.upload(self.alice, 'cv.pdf', b'%PDF version two')
+        self.assertEqual(StoredFile.objects.get(name=old).ref_count, 0)
+        call_command('gc_resumes', '--grace-hours', '1', stdout=StringIO())
+        self.assertTrue(resume_storage.exists(old))
+
+        call_command('gc_resumes', '--grace-hours', '0', stdout=StringIO())
+        self.assertFalse(resume_storage.exists(old))
+        self.assertTrue(resume_storage.exists(new))
+        self.assertEqual(list(StoredFile.objects.values_list('name', flat=True)), [new])
+
+    def test_legacy_uploads_are_adopted(self):
+        for profile in (self.alice, self.bob):
+            name = FileSystemStorage(location=settings.MEDIA_ROOT).save('resumes/cv.pdf', ContentFile(b'%PDF legacy'))
+            UserProfile.objects.filter(pk=profile.pk).update(resume=name)
+        FileSystemStorage(location=settings.MEDIA_ROOT).save('resumes/old_upload.pdf', ContentFile(b'%PDF orphan'))
+        call_command('gc_resumes', '--adopt-legacy', '--delete-orphans', '--grace-hours', '0', stdout=StringIO())
+        names = set(UserProfile.objects.exclude(resume='').values_list('resume', flat=True))
+        self.assertEqual(len(names), 1)
+        self.assertEqual(StoredFile.objects.get().ref_count, 2)
+        self.assertEqual(os.listdir(os.path.join(settings.MEDIA_ROOT, 'resumes')), [names.pop().split('/')[1]])
+
+    def test_download_supports_ranges_and_etags(self):
+        name = self.upload(self.alice, 'cv.pdf', b'0123456789')
+        url = reverse('resume_download', args=[self.alice.id])
+        self.client.force_login(self.recruiter.user)
+
+        response = self.client.get(url)
+        etag = response['ETag']
+        self.assertEqual(b''.join(response.streaming_content), b'0123456789')
+        self.assertEqual(etag, f'"{StoredFile.objects.get(name=name).sha256}"')
+        self.assertIn('cv.pdf', response['Content-Disposition'])
+
+        response = self.client.get(url, headers={'Range': 'bytes=2-5'})
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(b''.join(response.streaming_content), b'2345')
+        self.assertEqual((response['Content-Range'], response['Content-Length']), ('bytes 2-5/10', '4'))
+
+        response = self.client.get(url, headers={'Range': 'bytes=2-5', 'If-Range': '"stale"'})
+        self.assertEqual(response.status_code, 200)
+        response = self.client.get(url, headers={'Range': 'bytes=20-'})
+        self.assertEqual((response.status_code, response['Content-Range']), (416, 'bytes */10'))
+        response = self.client.get(url, headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 304)
+
+    def test_download_permissions(self):
+        self.upload(self.alice, 'cv.pdf', b'%PDF')
+        url = reverse('resume_download', args=[self.alice.id])
+        self.client.force_login(self.bob.user)
+        self.assertRedirects(self.client.get(url), reverse('dashboard'), fetch_redirect_response=False)
+        self.client.force_login(self.alice.user)
+        self.assertEqual(self.client.get(url).status_code, 200)
+        self.client.force_login(self.recruiter.user)
+        self.assertEqual(self.client.get(reverse('resume_download', args=[self.bob.id])).status_code, 404)
+
+    @override_settings(RESUME_SENDFILE_HEADER='X-Accel-Redirect')
+    def test_download_can_be_handed_to_the_proxy(self):
+        name = self.upload(self.alice, 'cv.pdf', b'%PDF')
+        self.client.force_login(self.recruiter.user)
+        response = self.client.get(reverse('resume_download', args=[self.alice.id]))
+        self.assertEqual(response['X-Accel-Redirect'], f'/protected-media/{name}')
+        self.assertEqual(response.content, b'')
+
+    def test_parse_range(self):
+        self.assertEqual(parse_range('bytes=0-', 10), (0, 9))
+        self.assertEqual(parse_range('bytes=-3', 10), (7, 9))
+        self.assertEqual(parse_range('bytes=5-100', 10), (5, 9))
+        self.assertEqual(parse_range('bytes=10-', 10), (10, 10))
+        self.assertIsNone(parse_range('bytes=0-1,4-5', 10))
+        self.assertIsNone(parse_range('bytes=5-2', 10))
+
+
+class ResumeTextTests(PortalTestCase):
+    def write(self, filename, data):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        path = os.path.join(directory, filename)
+        with open(path, 'wb') as f:
+            f.write(data)
+        return path
+
+    def test_pdf_text_with_inherited_fonts(self):
+        path = self.write('cv.pdf', make_resume_pdf('Senior Django developer \\(remote\\)'))
+        self.assertEqual(extract_file(path), ('Senior Django developer (remote)', ''))
+
+    def test_pdf_text_through_tounicode_map(self):
+        cmap = (
+            b'/CIDInit /ProcSet findresource begin 12 dict begin begincmap\n'
+            b'1 begincodespacerange <0000> <FFFF> endcodespacerange\n'
+            b'1 beginbfchar <0001> <0044> endbfchar\n'
+            b'1 beginbfrange <0002> <0004> <006A> endbfrange\n'
+            b'endcmap end end'
+        )
+        path = self.write('cv.pdf', make_pdf(
+            b'<< /Type /Catalog /Pages 2 0 R >>',
+            b'<< /Type /Pages /Kids [3 0 R] /Count 1 >>',
+            b'<< /Type /Page /Parent 2 0 R /Resources << /Font << /F2 5 0 R >> >> /Contents 4 0 R >>',
+            pdf_stream(b'BT /F2 10 Tf 1 0 0 1 72 700 Tm [<0001> -50 <0002>] TJ 0 -14 Td <00030004> Tj ET'),
+            b'<< /Type /Font /Subtype /Type0 /Encoding /Identity-H /ToUnicode 6 0 R >>',
+            pdf_stream(cmap, compress=False),
+        ))
+        self.assertEqual(extract_file(path), ('Dj\nkl', ''))
+
+    def test_docx_and_unsupported_files(self):
+        path = self.write('cv.docx', make_docx('Data Engineer', 'Spark &amp; Airflow'))
+        self.assertEqual(extract_file(path), ('Data Engineer\nSpark & Airflow', ''))
+        self.assertEqual(extract_file(self.write('cv.txt', b'plain')), ('', 'Unsupported file type'))
+        text, error = extract_file(self.write('broken.docx', b'not a zip'))
+        self.assertEqual(text, '')
+        self.assertIn('BadZipFile', error)
+
+    def test_process_pool(self):
+        paths = [self.write(f'cv{i}.pdf', make_resume_pdf(f'Resume {i}')) for i in range(3)]
+        results = list(extract_many(paths, workers=2))
+        self.assertEqual([(path, text) for path, text, _ in results], [(path, f'Resume {i}') for i, path in enumerate(paths)])
+
+
+@override_settings(RESUME_EXTRACTION_WORKERS=0)
+class CandidateIndexTests(PortalTestCase):
+    def setUp(self):
+        super().setUp()
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        override = override_settings(MEDIA_ROOT=media_root)
+        override.enable()
+        self.addCleanup(override.disable)
+        self.recruiter = make_profile('acme', 'recruiter', company_name='Acme')
+        self.alice = make_profile('alice', 'jobseeker', skills='python')
+        self.bob = make_profile('bob', 'jobseeker', skills='python, kubernetes')
+
+    def upload(self, profile, text):
+        self.client.force_login(profile.user)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse('profile'), {
+                'display_name': profile.display_name,
+                'skills': profile.skills,
+                'resume': SimpleUploadedFile('cv.pdf', make_resume_pdf(text), content_type='application/pdf'),
+            })
+
+    def test_upload_is_extracted_and_searchable(self):
+        self.upload(self.alice, 'Built Kubernetes operators in Go')
+        self.assertEqual(StoredFile.objects.get().text, 'Built Kubernetes operators in Go')
+
+        self.client.force_login(self.recruiter.user)
+        response = self.client.get(reverse('candidate_search'), {'q': 'kubernetes'})
+        candidates = list(response.context['candidates'])
+        # bob lists the skill, alice only mentions it in her resume
+        self.assertEqual(candidates, [self.bob, self.alice])
+        self.assertIn((('Kubernetes', True)), candidates[1].snippet_parts)
+        self.assertContains(response, '<mark>Kubernetes</mark>', html=True)
+
+        response = self.client.get(reverse('candidate_search'), {'q': 'operators'})
+        self.assertEqual(list(response.context['candidates']), [self.alice])
+
+    def test_skill_match_shows_skills_found_in_resume(self):
+        self.upload(self.alice, 'Five years of Kubernetes and Rust')
+        make_job(self.recruiter, 'Platform Engineer', 'python, kubernetes, terraform')
+        self.client.force_login(self.recruiter.user)
+        matches = {m.seeker: m for m in self.client.get(reverse('skill_match')).context['matched_jobs']}
+        self.assertEqual(matches[self.alice].resume_skills, ['kubernetes'])
+        self.assertEqual(matches[self.bob].resume_skills, [])
+
+    def test_backfill_command(self):
+        self.upload(self.alice, 'Terraform modules')
+        StoredFile.objects.update(text='', text_extracted_at=None)
+        search.rebuild_candidate_index()
+        out = StringIO()
+        call_command('extract_resumes', '--workers', '0', stdout=out)
+        self.assertIn('Extracted 1 resumes', out.getvalue())
+        self.client.force_login(self.recruiter.user)
+        response = self.client.get(reverse('candidate_search'), {'q': 'terraform'})
+        self.assertEqual(list(response.context['candidates']), [self.alice])
+
+    def test_only_recruiters_search_candidates(self):
+        self.client.force_login(self.alice.user)
+        response = self.client.get(reverse('candidate_search'), {'q': 'python'})
+        self.assertRedirects(response, reverse('dashboard'), fetch_redirect_response=False)
+
+
+class JobImportTests(PortalTestCase):
+    def setUp(self):
+        super().setUp()
+        self.recruiter = make_profile('acme', 'recruiter', company_name='Acme')
+        self.seeker = make_profile('alice', 'jobseeker', skills='python, django')
+
+    def write(self, content):
+        f = tempfile.NamedTemporaryFile('w', suffix='.csv', delete=False, encoding='utf-8')
+        self.addCleanup(os.remove, f.name)
+        with f:
+            f.write(content)
+        return f.name
+
+    def test_csv_command_imports_in_batches(self):
+        self.client.get(reverse('job_list'))  # warm the listing cache
+        rows = ['title,number_of_openings,category,description,required_skills']
+        rows += [f'Python Dev {i},2,technology,Build APIs,"Python, Go"' for i in range(5)]
+        rows.insert(3, 'Broken,many,space,No category,python')
+        out, err = StringIO(), StringIO()
+        call_command('import_jobs', self.write('\n'.join(rows)), '--recruiter', 'acme', '--batch-size', '2', stdout=out, stderr=err)
+
+        self.assertIn('Imported 5 jobs', out.getvalue())
+        self.assertIn('line 4: number_of_openings', err.getvalue())
+        self.assertIn('category', err.getvalue())
+        jobs = Job.objects.filter(recruiter=self.recruiter)
+        self.assertEqual(jobs.count(), 5)
+        self.assertEqual({job.skill_count for job in jobs}, {2})
+        self.assertEqual(JobMatch.objects.filter(seeker=self.seeker).count(), 5)
+        self.assertEqual(JobMatch.objects.filter(seeker=self.seeker).first().match_percentage, 50)
+        response = self.client.get(reverse('job_list'), {'search': 'python dev'})
+        self.assertEqual(len(response.context['jobs']), 5)
+
+    def test_matches_load_only_seekers_sharing_a_skill(self):
+        bob = make_profile('bob', 'jobseeker', skills='go, rust')
+        make_profile('carol', 'jobseeker', skills='excel')
+        skill_ids = dict(Skill.objects.values_list('name', 'id'))
+        self.assertEqual(load_seeker_skills({skill_ids['go'], skill_ids['python']}), {
+            self.seeker.id: [skill_ids['python']], bob.id: [skill_ids['go']],
+        })
+
+        rows = ['title,number_of_openings,category,description,required_skills']
+        rows += [f'Dev {i},1,technology,Build APIs,"Python, Go, {skill}"' for i, skill in enumerate(['rust', 'sql', 'excel'])]
+        call_command('import_jobs', self.write('\n'.join(rows)), '--recruiter', 'acme', '--batch-size', '2', stdout=StringIO())
+        imported = set(JobMatch.objects.values_list('job_id', 'seeker_id', 'matched_count'))
+        call_command('rebuild_matches', stdout=StringIO())
+        self.assertEqual(set(JobMatch.objects.values_list('job_id', 'seeker_id', 'matched_count')), imported)
+
+    def test_unknown_recruiter(self):
+        with self.assertRaises(CommandError):
+            call_command('import_jobs', self.write(''), '--recruiter', 'alice')
+
+    def test_jsonl_upload_endpoint(self):
+        lines = [
+            json.dumps({'title': 'Data Engineer', 'number_of_openings': 1, 'category': 'technology',
+                        'description': 'Pipelines', 'required_skills': ['Django', 'SQL']}),
+            '',
+            '{not json',
+            '[1, 2]',
+            json.dumps({'title': '', 'number_of_openings': 1, 'category': 'technology', 'description': 'x', 'required_skills': 'x'}),
+        ]
+        self.client.force_login(self.recruiter.user)
+        response = self.client.post(reverse('import_jobs'), {
+            'file': SimpleUploadedFile('jobs.jsonl', '\n'.join(lines).encode()),
+        })
+        result = response.context['result']
+        self.assertEqual((result.created, result.failed), (1, 3))
+        self.assertEqual([line for line, _ in result.errors], [3, 4, 5])
+        self.assertEqual(Job.objects.get().required_skills, 'Django, SQL')
+        self.assertEqual(JobMatch.objects.get().matched_count, 1)
+
+    def test_only_recruiters_import(self):
+        self.client.force_login(self.seeker.user)
+        response = self.client.post(reverse('import_jobs'), {'file': SimpleUploadedFile('jobs.csv', b'title')})
+        self.assertRedirects(response, reverse('dashboard'), fetch_redirect_response=False)
+        self.assertFalse(Job.objects.exists())
+
+
+class ApplicationExportTests(PortalTestCase):
+    def setUp(self):
+        super().setUp()
+        self.recruiter = make_profile('acme', 'recruiter', company_name='Acme')
+        self.rival = make_profile('globex', 'recruiter', company_name='Globex')
+        self.alice = make_profile('alice', 'jobseeker', skills='python, django', resume='resumes/ab/alice.pdf')
+        self.bob = make_profile('bob', 'jobseeker', skills='go')
+        self.job = make_job(self.recruiter, 'Backend Dev', 'Python, Go')
+        self.other = make_job(self.rival, 'Rival Job', 'Python')
+        for seeker in (self.alice, self.bob):
+            JobApplication.objects.create(job=self.job, applicant=seeker)
+        JobApplication.objects.create(job=self.other, applicant=self.alice)
+        self.client.force_login(self.recruiter.user)
+
+    def body(self, response):
+        return b''.join(response.streaming_content).decode()
+
+    def test_csv_export(self):
+        response = self.client.get(reverse('export_applications'))
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Type'], 'text/csv; charset=utf-8')
+        self.assertIn('attachment; filename="applications-all-', response['Content-Disposition'])
+        lines = self.body(response).splitlines()
+        self.assertEqual(lines[0].split(',')[:3], ['application_id', 'job_id', 'job_title'])
+        self.assertEqual(len(lines), 3)
+        # Newest application first
+        self.assertIn('bob@example.com', lines[1])
+        alice_row = lines[2]
+        self.assertIn('alice@example.com', alice_row)
+        self.assertIn('"python, django",50.0,', alice_row)
+        self.assertTrue(alice_row.endswith(f'http://testserver/resumes/{self.alice.id}/'))
+        self.assertNotIn('Rival Job', '\n'.join(lines))
+
+    def test_jsonl_export_for_one_job(self):
+        response = self.client.get(reverse('export_job_applications', args=[self.job.id]), {'format': 'jsonl'})
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        records = [json.loads(line) for line in self.body(response).splitlines()]
+        self.assertEqual({r['applicant_name'] for r in records}, {'alice', 'bob'})
+        bob = next(r for r in records if r['applicant_name'] == 'bob')
+        self.assertEqual((bob['match_percentage'], bob['resume_url'], bob['job_title']), (50.0, '', 'Backend Dev'))
+
+    def test_export_runs_one_query_for_all_rows(self):
+        for i in range(20):
+            JobApplication.objects.create(job=self.job, applicant=make_profile(f'seeker{i}', 'jobseeker', skills='python'))
+        response = self.client.get(reverse('export_applications'))
+        with self.assertNumQueries(1):
+            self.assertEqual(len(self.body(response).splitlines()), 23)
+
+    def test_other_recruiters_job_and_seekers_are_refused(self):
+        response = self.client.get(reverse('export_job_applications', args=[self.other.id]))
+        self.assertEqual(response.status_code, 404)
+        self.client.force_login(self.alice.user)
+        response = self.client.get(reverse('export_applications'))
+        self.assertRedirects(response, reverse('dashboard'), fetch_redirect_response=False)
+
+
+class DatabaseProfileTests(PortalTestCase):
+    def test_production_pragmas_apply_to_new_connections(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        handler = ConnectionHandler({'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': os.path.join(directory, 'db.sqlite3'),
+            'OPTIONS': settings.SQLITE_PRODUCTION_OPTIONS,
+        }})
+        self.addCleanup(handler.close_all)
+        with handler['default'].cursor() as cursor:
+            values = {}
+            for pragma in ('journal_mode', 'synchronous', 'busy_timeout', 'mmap_size'):
+                cursor.execute(f'PRAGMA {pragma}')
+                values[pragma] = cursor.fetchone()[0]
+        self.assertEqual(values, {'journal_mode': 'wal', 'synchronous': 1, 'busy_timeout': 20000, 'mmap_size': 268435456})
+        self.assertEqual(handler['default'].transaction_mode, 'IMMEDIATE')
+
+    def test_router_reads_app_tables_from_read_database_in_read_only_requests(self):
+        router = ReadReplicaRouter()
+        with override_settings(READ_DATABASE='replica'):
+            self.assertIsNone(router.db_for_read(Job))
+            with read_only():
+                self.assertEqual(router.db_for_read(Job), 'replica')
+                self.assertIsNone(router.db_for_read(User))
+                self.assertEqual(router.db_for_write(Job), 'default')
+        with read_only():
+            self.assertIsNone(router.db_for_read(Job))
+        self.assertFalse(router.allow_migrate('replica', 'job_manage_app'))
+
+    def test_middleware_marks_only_safe_methods_read_only(self):
+        seen = []
+        middleware = ReadOnlyRequestMiddleware(lambda request: seen.append(ReadReplicaRouter().db_for_read(Job)))
+        with override_settings(READ_DATABASE='replica'):
+            for method in ('get', 'head', 'post'):
+                middleware(getattr(RequestFactory(), method)('/'))
+        self.assertEqual(seen, ['replica', 'replica', None])
+
+
+class QueryPlanTests(PortalTestCase):
+    def test_seeded_views_use_indexed_plans(self):
+        call_command('seed_portal', recruiters=3, seekers=30, jobs=40, applications=120, stdout=StringIO())
+        out = StringIO()
+        call_command('check_query_plans', stdout=out)
+        self.assertIn('use indexed plans', out.getvalue())
+
+    def test_scans_and_sorts_are_reported(self):
+        sql = 'SELECT * FROM "job_manage_app_job" ORDER BY "job_manage_app_job"."title"'
+        plan = ['SCAN job_manage_app_job', 'USE TEMP B-TREE FOR ORDER BY']
+        self.assertEqual(plan_problems(sql, plan), plan)
+        self.assertEqual(plan_problems(sql, ['SCAN job_manage_app_job USING INDEX x', 'SCAN subquery']), [])
+        self.assertEqual(plan_problems('SELECT bm25(job_manage_app_job_fts) ...', plan[1:]), [])
+
+
+class ApplicationCounterTests(PortalTestCase):
+    def setUp(self):
+        super().setUp()
+        self.recruiter = make_profile('acme', 'recruiter', company_name='Acme')
+        self.alice = make_profile('alice', 'jobseeker', skills='python')
+        self.bob = make_profile('bob', 'jobseeker', skills='go')
+        self.job = make_job(self.recruiter, 'Backend Dev', 'python, go')
+        self.other = make_job(self.recruiter, 'Data Engineer', 'sql')
+
+    def counts(self):
+        self.recruiter.refresh_from_db()
+        return (
+            list(Job.objects.order_by('id').values_list('application_count', flat=True)),
+            self.recruiter.applications_received,
+        )
+
+    def test_apply_and_delete_update_counters(self):
+        self.client.force_login(self.alice.user)
+        self.client.post(reverse('apply_job', args=[self.job.id]))
+        self.client.post(reverse('apply_job', args=[self.job.id]))  # already applied
+        JobApplication.objects.create(job=self.other, applicant=self.alice)
+        JobApplication.objects.create(job=self.job, applicant=self.bob)
+        self.assertEqual(self.counts(), ([2, 1], 3))
+
+        JobApplication.objects.filter(applicant=self.bob).delete()
+        self.assertEqual(self.counts(), ([1, 1], 2))
+        self.bob.delete()
+        self.alice.delete()
+        self.assertEqual(self.counts(), ([0, 0], 0))
+
+    def test_deleting_a_job_settles_the_recruiter_total_once(self):
+        for seeker in (self.alice, self.bob):
+            JobApplication.objects.create(job=self.job, applicant=seeker)
+        JobApplication.objects.create(job=self.other, applicant=self.alice)
+        job = Job.objects.get(pk=self.job.pk)
+        with CaptureQueriesContext(connection) as queries:
+            job.delete()
+        updates = [q['sql'] for q in queries.captured_queries if q['sql'].startswith('UPDATE')]
+        self.assertEqual(len(updates), 1)
+        self.assertEqual(self.counts(), ([1], 1))
+
+    def test_edits_do_not_overwrite_the_counters(self):
+        # Loaded before the applications, saved after them
+        job = Job.objects.get(pk=self.job.pk)
+        recruiter = UserProfile.objects.get(pk=self.recruiter.pk)
+        for seeker in (self.alice, self.bob):
+            JobApplication.objects.create(job=self.job, applicant=seeker)
+        job.title = 'Backend Engineer'
+        job.save()
+        self.client.force_login(self.recruiter.user)
+        self.client.post(reverse('profile'), {'display_name': 'Acme Hiring', 'company_name': 'Acme'})
+        recruiter.company_name = 'Acme Inc'
+        recruiter.save()
+        self.assertEqual(self.counts(), ([2, 0], 2))
+        self.assertEqual(Job.objects.get(pk=self.job.pk).title, 'Backend Engineer')
+
+    def test_reconcile_repairs_drift(self):
+        JobApplication.objects.bulk_create([
+            JobApplication(job=self.job, applicant=self.alice),
+            JobApplication(job=self.other, applicant=self.bob),
+        ])
+        Job.objects.filter(pk=self.other.pk).update(application_count=7)
+        self.assertEqual(self.counts(), ([0, 7], 0))
+        out = StringIO()
+        call_command('reconcile_counts', stdout=out)
+        self.assertIn('on 2 jobs and 1 profiles', out.getvalue())
+        self.assertEqual(self.counts(), ([1, 1], 2))
+        call_command('reconcile_counts', stdout=out)
+        self.assertIn('on 0 jobs and 0 profiles', out.getvalue())
+
+    def test_dashboard_and_job_list_show_counts(self):
+        JobApplication.objects.create(job=self.job, applicant=self.alice)
+        self.client.force_login(self.recruiter.user)
+        response = self.client.get(reverse('dashboard'))
+        self.assertEqual(sorted(job.application_count for job in response.context['jobs']), [0, 1])
+        self.assertEqual(response.context['profile'].applications_received, 1)
+        response = self.client.get(reverse('job_list'))
+        self.assertContains(response, '1 applicant')
+        self.assertContains(response, '0 applicants')
+
+
+class AnalyticsTests(PortalTestCase):
+    def setUp(self):
+        super().setUp()
+        self.recruiter = make_profile('acme', 'recruiter', company_name='Acme')
+        self.other = make_profile('globex', 'recruiter', company_name='Globex')
+        self.alice = make_profile('alice', 'jobseeker', skills='python')
+        self.bob = make_profile('bob', 'jobseeker', skills='excel')
+        self.job = make_job(self.recruiter, 'Backend Dev', 'python, sql')
+        self.analyst = make_job(self.other, 'Analyst', 'excel, sql', category='finance')
+        for job, seeker in [(self.job, self.alice), (self.job, self.bob), (self.analyst, self.bob)]:
+            JobApplication.objects.create(job=job, applicant=seeker)
+
+    def rollups(self):
+        return (
+            set(JobDailyStats.objects.values_list('job_id', 'day', 'applications')),
+            set(CategoryDailyStats.objects.values_list('category', 'day', 'jobs_posted', 'applications')),
+            set(SkillDemand.objects.values_list('skill__name', 'jobs_posted', 'applications')),
+        )
+
+    def test_incremental_rollups_match_backfill(self):
+        today = timezone.localdate()
+        job_days, category_days, skills = self.rollups()
+        self.assertEqual(job_days, {(self.job.id, today, 2), (self.analyst.id, today, 1)})
+        self.assertEqual(category_days, {('technology', today, 1, 2), ('finance', today, 1, 1)})
+        self.assertEqual(skills, {('python', 1, 2), ('sql', 2, 3), ('excel', 1, 1)})
+
+        # Applications dated earlier land on their own day
+        applied_at = JobApplication._meta.get_field('applied_at')
+        applied_at.auto_now_add = False
+        try:
+            carol = make_profile('carol', 'jobseeker')
+            JobApplication.objects.create(job=self.job, applicant=carol, applied_at=timezone.now() - timedelta(days=3))
+        finally:
+            applied_at.auto_now_add = True
+        self.assertIn((self.job.id, today - timedelta(days=3), 1), self.rollups()[0])
+
+        incremental = self.rollups()
+        out = StringIO()
+        call_command('backfill_analytics', batch_size=1, stdout=out)
+        self.assertIn('3 job-days, 3 category-days, 3 skills', out.getvalue())
+        self.assertEqual(self.rollups(), incremental)
+
+    def test_edited_jobs_move_their_counts(self):
+        today = timezone.localdate()
+        self.job.category = 'finance'
+        self.job.required_skills = 'python, go'
+        self.job.save()
+        job_days, category_days, skills = self.rollups()
+        self.assertEqual(category_days, {('technology', today, 0, 0), ('finance', today, 2, 3)})
+        self.assertEqual(skills, {('python', 1, 2), ('go', 1, 2), ('sql', 1, 1), ('excel', 1, 1)})
+
+        # Other edits move nothing
+        incremental = self.rollups()
+        self.job.title = 'Backend Engineer'
+        self.job.save()
+        self.assertEqual(self.rollups(), incremental)
+
+        # The same as a backfill, apart from the emptied category row
+        call_command('backfill_analytics', stdout=StringIO())
+        self.assertEqual(self.rollups(), (job_days, {('finance', today, 2, 3)}, skills))
+
+    def test_migration_builds_rollups_and_edits_stop_at_zero(self):
+        incremental = self.rollups()
+        for model in (JobDailyStats, CategoryDailyStats, SkillDemand):
+            model.objects.all().delete()
+        import_module('job_manage_app.migrations.0011_analytics_rollups').build_rollups(django_apps, None)
+        self.assertEqual(self.rollups(), incremental)
+
+        # A database whose rollups were never built: the edit saves, moving nothing below 0
+        for model in (JobDailyStats, CategoryDailyStats, SkillDemand):
+            model.objects.all().delete()
+        self.job.category = 'finance'
+        self.job.required_skills = 'go'
+        self.job.save()
+        today = timezone.localdate()
+        self.assertEqual(self.rollups()[1], {('technology', today, 0, 0), ('finance', today, 1, 0)})
+        self.assertIn(('python', 0, 0), self.rollups()[2])
+
+    def test_imported_jobs_are_counted(self):
+        self.client.force_login(self.recruiter.user)
+        upload = SimpleUploadedFile('jobs.csv', (
+            b'title,number_of_openings,category,description,required_skills\n'
+            b'Data Engineer,1,technology,Pipelines,"python, spark"\n'
+        ))
+        self.client.post(reverse('import_jobs'), {'file': upload, 'format': 'csv'})
+        today = timezone.localdate()
+        self.assertIn(('technology', today, 2, 2), self.rollups()[1])
+        self.assertIn(('spark', 1, 0), self.rollups()[2])
+
+    def test_report_reads_rollups(self):
+        self.client.force_login(self.recruiter.user)
+        response = self.client.get(reverse('recruiter_analytics'), {'days': 7})
+        report = response.context['report']
+        self.assertEqual(report['total_applications'], 2)
+        self.assertEqual(report['jobs'], [{'id': self.job.id, 'title': 'Backend Dev', 'applications': 2}])
+        self.assertEqual(len(report['daily']), 7)
+        self.assertEqual(report['daily'][0]['applications'], 2)
+        self.assertEqual([row['category'] for row in report['categories']], ['technology', 'finance'])
+        self.assertEqual(report['categories'][0]['per_job'], 2)
+        self.assertEqual(report['skills'][0]['name'], 'sql')
+        self.assertContains(response, 'Backend Dev')
+        self.assertNotContains(response, 'Analyst')
+        self.assertEqual(self.client.get(reverse('recruiter_analytics'), {'days': 'x'}).context['report']['days'], 30)
+
+        self.client.force_login(self.alice.user)
+        self.assertRedirects(self.client.get(reverse('recruiter_analytics')), reverse('dashboard'))
+
+
+class ApplyJobTests(PortalTestCase):
+    def setUp(self):
+        super().setUp()
+        self.recruiter = make_profile('acme', 'recruiter', company_name='Acme')
+        self.seeker = make_profile('alice', 'jobseeker', skills='python, sql')
+        self.job = make_job(self.recruiter, 'Backend Dev', 'python, go, sql, docker')
+        self.client.force_login(self.seeker.user)
+
+    def test_get_uses_precomputed_match(self):
+        response = self.client.get(reverse('apply_job', args=[self.job.id]))
+        self.assertEqual((response.context['matched_skills'], response.context['match_percentage']), (['python', 'sql'], 50))
+        self.assertFalse(response.context['already_applied'])
+        JobApplication.objects.create(job=self.job, applicant=self.seeker)
+        response = self.client.get(reverse('apply_job', args=[self.job.id]))
+        self.assertTrue(response.context['already_applied'])
+        self.assertEqual(self.client.get(reverse('apply_job', args=[self.job.id + 1])).status_code, 404)
+
+    def test_repeated_submit_is_idempotent(self):
+        url = reverse('apply_job', args=[self.job.id])
+        for message in ('Successfully applied for Backend Dev!', 'You have already applied for Backend Dev.'):
+            response = self.client.post(url, follow=True)
+            self.assertRedirects(response, reverse('my_applications'))
+            self.assertContains(response, message)
+        self.assertEqual(JobApplication.objects.count(), 1)
+        self.job.refresh_from_db()
+        self.assertEqual(self.job.application_count, 1)
+        self.assertEqual(self.client.post(reverse('apply_job', args=[self.job.id + 1])).status_code, 404)
+
+
+class ConcurrentApplyTests(TransactionTestCase):
+    # Threads cannot share the in-memory test database's transactions, and its
+    # shared-cache locks fail at once instead of waiting, so the committed data
+    # is copied to a file the threads' connections open instead
+    def setUp(self):
+        for cache in caches.all():
+            cache.clear()
+        recruiter = make_profile('acme', 'recruiter', company_name='Acme')
+        self.seeker = make_profile('alice', 'jobseeker', skills='python')
+        self.job = make_job(recruiter, 'Backend Dev', 'python')
+        # Signed in before the copy, so the sessions are in it
+        self.clients = [Client() for _ in range(8)]
+        for client in self.clients:
+            client.force_login(self.seeker.user)
+
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        self.path = os.path.join(directory, 'db.sqlite3')
+        connection.ensure_connection()
+        with closing(sqlite3.connect(self.path)) as target:
+            connection.connection.backup(target)
+        settings_dict = connection.settings_dict
+        self.addCleanup(settings_dict.__setitem__, 'NAME', settings_dict['NAME'])
+        settings_dict['NAME'] = self.path
+
+    def test_parallel_submits_create_one_application(self):
+        clients = self.clients
+        barrier = threading.Barrier(len(clients))
+        url = reverse('apply_job', args=[self.job.id])
+
+        def submit(client):
+            barrier.wait()
+            try:
+                return client.post(url).status_code
+            finally:
+                connections.close_all()
+
+        with ThreadPoolExecutor(max_workers=len(clients)) as pool:
+            statuses = list(pool.map(submit, clients))
+        self.assertEqual(statuses, [302] * len(clients))
+        with closing(sqlite3.connect(self.path)) as db:
+            self.assertEqual(db.execute('SELECT COUNT(*) FROM job_manage_app_jobapplication').fetchone()[0], 1)
+            self.assertEqual(db.execute('SELECT application_count FROM job_manage_app_job').fetchone()[0], 1)
+
+
+class JsonApiTests(PortalTestCase):
+    def setUp(self):
+        super().setUp()
+        self.recruiter = make_profile('acme', 'recruiter', company_name='Acme')
+        self.seeker = make_profile('alice', 'jobseeker', skills='python, django')
+        self.jobs = [make_job(self.recruiter, f'Python Job {i}', 'python, go') for i in range(5)]
+        for job in self.jobs[:3]:
+            JobApplication.objects.create(job=job, applicant=self.seeker)
+
+    def get_json(self, name, status=200, **params):
+        response = self.client.get(reverse(name), params)
+        self.assertEqual(response.status_code, status)
+        self.assertEqual(response['Content-Type'], 'application/json')
+        return response.json()
+
+    def test_sparse_fields_and_cursor_paging(self):
+        first = self.get_json('api_jobs', fields='id,title', limit=2)
+        self.assertEqual(first['results'], [
+            {'id': self.jobs[4].id, 'title': 'Python Job 4'},
+            {'id': self.jobs[3].id, 'title': 'Python Job 3'},
+        ])
+        self.assertIsNone(first['previous_cursor'])
+        second = self.get_json('api_jobs', fields='id,title', limit=2, cursor=first['next_cursor'])
+        self.assertEqual([row['id'] for row in second['results']], [self.jobs[2].id, self.jobs[1].id])
+        back = self.get_json('api_jobs', fields='id,title', limit=2, cursor=second['previous_cursor'])
+        self.assertEqual(back['results'], first['results'])
+
+        rows = self.get_json('api_jobs', search='python', fields='company,application_count', limit=5)['results']
+        self.assertEqual(len(rows), 5)
+        self.assertEqual(set(rows[0]), {'company', 'application_count'})
+        self.assertEqual(sorted(row['application_count'] for row in rows), [0, 0, 1, 1, 1])
+
+    def test_unknown_fields_and_bad_limit_are_rejected(self):
+        self.assertIn('Unknown fields: salary', self.get_json('api_jobs', 400, fields='id,salary')['error'])
+        self.get_json('api_jobs', 400, limit='ten')
+        with self.settings(API_MAX_PAGE_SIZE=3):
+            self.assertEqual(len(self.get_json('api_jobs', limit=50)['results']), 3)
+
+    def test_matches_and_applications_follow_the_user_type(self):
+        self.assertEqual(self.get_json('api_matches', 401), {'error': 'Authentication required'})
+
+        self.client.force_login(self.seeker.user)
+        matches = self.get_json('api_matches', fields='job_id,match_percentage')['results']
+        self.assertEqual(len(matches), 5)
+        self.assertEqual(matches[0]['match_percentage'], 50)
+        applications = self.get_json('api_applications', fields='title')['results']
+        self.assertEqual(applications, [{'title': f'Python Job {i}'} for i in (2, 1, 0)])
+
+        self.client.force_login(self.recruiter.user)
+        self.get_json('api_matches', 400)
+        candidates = self.get_json('api_matches', job=self.jobs[0].id, fields='name')['results']
+        self.assertEqual(candidates, [{'name': 'alice'}])
+        applications = self.get_json('api_applications', job=self.jobs[0].id, fields='name,email')['results']
+        self.assertEqual(applications, [{'name': 'alice', 'email': self.seeker.user.email}])
+
+    def test_responses_are_gzipped_on_request(self):
+        self.client.force_login(self.seeker.user)
+        response = self.client.get(reverse('api_matches'), {'fields': 'title,company'}, HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(json.loads(zlib.decompress(response.content, 16 + zlib.MAX_WBITS))['results'][0]['company'], 'Acme')
+        self.assertEqual(self.client.post(reverse('api_matches')).status_code, 405)
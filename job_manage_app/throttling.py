@@ -0,0 +1,114 @@
+import hashlib
+import math
+import re
+import threading
+import time
+from functools import wraps
+from django.conf import settings
+from django.core.cache import caches
+from django.http import HttpResponse
+
+RATE_RE = re.compile(r'^(\d+)/(\d*)(s|min|h|d)$')
+PERIOD_SECONDS = {'s': 1, 'min': 60, 'h': 3600, 'd': 86400}
+
+# Per-process counters, reported by the request_stats endpoint; the lock
+# keeps increments from threads serving requests at once from being lost
+counters = {'allowed': 0, 'throttled': 0}
+_counters_lock = threading.Lock()
+
+
+def _count(outcome):
+    with _counters_lock:
+        counters[outcome] += 1
+
+def get_throttle_cache():
+    return caches[getattr(settings, 'THROTTLE_CACHE_ALIAS', 'sessions')]
+
+def parse_rate(rate):
+    """'5/min' -> (5, 60.0): a bucket of 5 tokens that refills fully in 60 seconds.
+
+    The period can carry a multiplier ('3/10min'). None disables the bucket.
+    """
+    if rate is None:
+        return None
+    match = RATE_RE.match(rate.replace(' ', ''))
+    if not match or int(match.group(1)) < 1:
+        raise ValueError(f'Invalid throttle rate {rate!r}; expected e.g. "5/min" or "3/10min"')
+    tokens, multiplier, unit = match.groups()
+    return int(tokens), int(multiplier or 1) * PERIOD_SECONDS[unit]
+
+def client_ip(request):
+    # REMOTE_ADDR only: X-Forwarded-For is set by the client unless a proxy
+    # in front rewrites it, so trusting it would let anyone pick their bucket
+    return request.META.get('REMOTE_ADDR') or 'unknown'
+
+def post_value(name):
+    # Key function for a form field, compared case-insensitively
+    def key(request):
+        value = request.POST.get(name, '').strip().lower()
+        return value or None
+    return key
+
+def session_value(name):
+    def key(request):
+        return request.session.get(name) or None
+    return key
+
+def bucket_key(name, value):
+    # Hashed so usernames and emails never end up as raw cache keys
+    return f"throttle:{name}:{hashlib.sha256(value.encode()).hexdigest()[:32]}"
+
+def take(key, rate, now=None):
+    """Take one token from the bucket at key.
+
+    Returns 0 when the token was taken, else the seconds until one is
+    available. The bucket is stored as (tokens, timestamp) and expires once
+    it would be full again, so idle clients cost nothing. Two workers racing
+    on the same bucket can each let one request through; the limits are
+    meant to stop bursts, not to count exactly.
+    """
+    capacity, period = rate
+    now = time.time() if now is None else now
+    cache = get_throttle_cache()
+    tokens, updated = cache.get(key) or (capacity, now)
+    tokens = min(capacity, tokens + (now - updated) * capacity / period)
+    if tokens < 1:
+        return (1 - tokens) * period / capacity
+    cache.set(key, (tokens - 1, now), math.ceil(period))
+    return 0
+
+def throttle(scope, **keys):
+    """Limit the POSTs to a view with one token bucket per key.
+
+    keys maps a kind to a function of the request that returns the value to
+    count by (or None to skip that bucket), e.g. ip=client_ip. The rate for
+    each bucket is THROTTLE_RATES['<scope>:<kind>']. Rejected requests get a
+    plain 429 before the view runs, so no hashing, queries or mail happen.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if request.method == 'POST':
+                for kind, key_func in keys.items():
+                    rate = parse_rate(settings.THROTTLE_RATES.get(f'{scope}:{kind}'))
+                    value = key_func(request)
+                    if rate is None or value is None:
+                        continue
+                    wait = take(bucket_key(f'{scope}:{kind}', value), rate)
+                    if wait:
+                        _count('throttled')
+                        return too_many_requests(wait)
+                _count('allowed')
+            return view(request, *args, **kwargs)
+        return wrapper
+    return decorator
+
+def too_many_requests(wait):
+    seconds = math.ceil(wait)
+    response = HttpResponse(f'Too many attempts. Try again in {seconds} seconds.\n', status=429, content_type='text/plain')
+    response['Retry-After'] = str(seconds)
+    return response
+
+def throttle_stats():
+    with _counters_lock:
+        return dict(counters)
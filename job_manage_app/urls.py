@@ -10,12 +10,23 @@ urlpatterns = [
     path('dashboard/', views.dashboard, name='dashboard'),
     path('profile/', views.profile, name='profile'),
     path('post-job/', views.post_job, name='post_job'),
+    path('post-job/import/', views.import_jobs_view, name='import_jobs'),
     path('jobs/', views.job_list, name='job_list'),
     path('apply/<int:job_id>/', views.apply_job, name='apply_job'),
     path('my-applications/', views.my_applications, name='my_applications'),
     path('job-applications/', views.job_applications, name='all_applications'),
     path('job-applications/<int:job_id>/', views.job_applications, name='job_applications'),
+    path('job-applications/export/', views.export_applications, name='export_applications'),
+    path('job-applications/<int:job_id>/export/', views.export_applications, name='export_job_applications'),
     path('skill-match/', views.skill_match, name='skill_match'),
+    path('candidates/', views.candidate_search, name='candidate_search'),
+    path('analytics/', views.recruiter_analytics, name='recruiter_analytics'),
+    path('resumes/<int:profile_id>/', views.resume_download, name='resume_download'),
+    path('request-stats/', views.request_stats, name='request_stats'),
+
+    path('api/jobs/', views.api_jobs, name='api_jobs'),
+    path('api/matches/', views.api_matches, name='api_matches'),
+    path('api/applications/', views.api_applications, name='api_applications'),
 
     path('forgot_password/', views.forgot_password, name='forgot_password'),
     path('otp_verify/', views.otp_verify, name='otp_verify'),
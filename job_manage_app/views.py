@@ -1,10 +1,31 @@
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth import authenticate, login, logout
+from django.contrib.admin.views.decorators import staff_member_required
 from django.contrib.auth.decorators import login_required
+from django.conf import settings
 from django.contrib import messages
-from django.db.models import Q
+from django.db import IntegrityError, transaction
+from django.db.models import Exists, OuterRef
+from django.http import Http404, JsonResponse, StreamingHttpResponse
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.http import content_disposition_header
+from django.views.decorators.gzip import gzip_page
+from django.views.decorators.http import require_safe
 from .forms import CustomUserRegistrationForm, RecruiterProfileForm, JobSeekerProfileForm, JobPostForm
-from .models import UserProfile, Job, JobApplication
+from .models import UserProfile, Job, JobApplication, JobMatch
+from . import analytics, api
+from .counters import attach_application_counts
+from .exports import EXPORT_FORMATS, application_rows, export_records, stream_csv, stream_jsonl
+from .file_serving import serve_stored_file
+from .job_import import IMPORT_FORMATS, guess_format, import_jobs
+from . import fragments, instrumentation, result_cache, throttling
+from .fragments import attach_job_cards
+from .pagination import keyset_paginate
+from .result_cache import cached_job_result, normalize_search
+from .search import search_jobs, search_candidates, split_snippet, attach_resume_skills
+from .skills import matched_jobs_for_seeker, matched_seekers_for_recruiter, match_for_job, with_seeker_match
+from .throttling import throttle, client_ip, post_value, session_value
 
 def home(request):
     return render(request, 'jobportal/home.html')
@@ -22,6 +43,7 @@ def register(request):
         form = CustomUserRegistrationForm()
     return render(request, 'jobportal/register.html', {'form': form})
 
+@throttle('login', ip=client_ip, username=post_value('username'))
 def user_login(request):
     if request.method == 'POST':
         username = request.POST['username']
@@ -40,42 +62,27 @@ def user_logout(request):
 
 @login_required
 def dashboard(request):
-    try:
-        profile = request.user.userprofile
-    except UserProfile.DoesNotExist:
+    profile = request.profile
+    if profile is None:
         messages.error(request, 'Please complete your profile.')
         return redirect('profile')
     
     context = {'profile': profile}
     
     if profile.user_type == 'recruiter':
-        jobs = Job.objects.filter(recruiter=profile)
-        context['jobs'] = jobs
+        jobs = Job.objects.filter(recruiter=profile).select_related('recruiter')
+        context['jobs'] = attach_job_cards(jobs, 'recruiter_job')
     else:
         # Job seeker dashboard with skill matching
-        user_skills = profile.get_skills_list()
-        matched_jobs = []
-        if user_skills:
-            for job in Job.objects.all():
-                job_skills = job.get_required_skills_list()
-                matches = set(user_skills) & set(job_skills)
-                if matches:
-                    matched_jobs.append({
-                        'job': job,
-                        'matched_skills': list(matches),
-                        'match_percentage': len(matches) / len(job_skills) * 100 if job_skills else 0
-                    })
-        
-        matched_jobs.sort(key=lambda x: x['match_percentage'], reverse=True)
-        context['matched_jobs'] = matched_jobs[:5]  # Top 5 matches
+        context['matched_jobs'] = matched_jobs_for_seeker(profile, limit=5)  # Top 5 matches
+        attach_job_cards([match.job for match in context['matched_jobs']], 'match')
     
     return render(request, 'jobportal/dashboard.html', context)
 
 @login_required
 def profile(request):
-    try:
-        profile = request.user.userprofile
-    except UserProfile.DoesNotExist:
+    profile = request.profile
+    if profile is None:
         # Create profile if it doesn't exist
         profile = UserProfile.objects.create(
             user=request.user,
@@ -103,14 +110,13 @@ def profile(request):
 
 @login_required
 def post_job(request):
-    try:
-        profile = request.user.userprofile
-        if profile.user_type != 'recruiter':
-            messages.error(request, 'Only recruiters can post jobs.')
-            return redirect('dashboard')
-    except UserProfile.DoesNotExist:
+    profile = request.profile
+    if profile is None:
         messages.error(request, 'Please complete your profile first.')
         return redirect('profile')
+    if profile.user_type != 'recruiter':
+        messages.error(request, 'Only recruiters can post jobs.')
+        return redirect('dashboard')
     
     if request.method == 'POST':
         form = JobPostForm(request.POST)
@@ -125,26 +131,65 @@ def post_job(request):
     
     return render(request, 'jobportal/post_job.html', {'form': form})
 
+@login_required
+def import_jobs_view(request):
+    profile = request.profile
+    if profile is None:
+        messages.error(request, 'Please complete your profile first.')
+        return redirect('profile')
+    if profile.user_type != 'recruiter':
+        messages.error(request, 'Only recruiters can post jobs.')
+        return redirect('dashboard')
+
+    result = None
+    if request.method == 'POST':
+        upload = request.FILES.get('file')
+        if upload is None:
+            messages.error(request, 'Choose a CSV or JSONL file to import.')
+        else:
+            # Uploads over FILE_UPLOAD_MAX_MEMORY_SIZE are already on disk, so this reads in chunks
+            result = import_jobs(profile, upload, request.POST.get('format') or guess_format(upload.name))
+            if result.created:
+                messages.success(request, f'Imported {result.created} jobs.')
+    return render(request, 'jobportal/import_jobs.html', {
+        'result': result,
+        'formats': IMPORT_FORMATS,
+        'columns': JobPostForm._meta.fields,
+    })
+
 def job_list(request):
-    jobs = Job.objects.all().order_by('-created_at')
-    
-    # Search functionality
     search_query = request.GET.get('search')
-    if search_query:
-        jobs = jobs.filter(
-            Q(title__icontains=search_query) |
-            Q(description__icontains=search_query) |
-            Q(required_skills__icontains=search_query) |
-            Q(category__icontains=search_query)
-        )
-    
-    # Category filter
     category = request.GET.get('category')
-    if category:
-        jobs = jobs.filter(category=category)
+    cursor = request.GET.get('cursor')
+    
+    def fetch_page():
+        jobs = Job.objects.select_related('recruiter')
+        ordering = ['-created_at', '-id']
+        
+        # Search functionality
+        if search_query:
+            jobs = search_jobs(jobs, search_query)
+            if 'search_rank' in jobs.query.annotations:
+                ordering.insert(0, 'search_rank')
+        
+        # Category filter
+        if category:
+            jobs = jobs.filter(category=category)
+        
+        page = keyset_paginate(jobs, ordering, cursor, with_count=True)
+        # Cards rendered here are cached with the page; unchanged jobs reuse
+        # their fragment after the jobs version moves on
+        attach_job_cards(page, 'job_list')
+        return page
     
+    params = {
+        'search': normalize_search(search_query),
+        'category': category,
+        'cursor': cursor,
+        'per_page': settings.PAGINATION_PAGE_SIZE,
+    }
     context = {
-        'jobs': jobs,
+        'jobs': attach_application_counts(cached_job_result('job_list', params, fetch_page)),
         'search_query': search_query,
         'selected_category': category,
         'categories': Job.CATEGORY_CHOICES,
@@ -154,36 +199,43 @@ def job_list(request):
 
 @login_required
 def apply_job(request, job_id):
-    job = get_object_or_404(Job, id=job_id)
-    
-    try:
-        profile = request.user.userprofile
-        if profile.user_type != 'jobseeker':
-            messages.error(request, 'Only job seekers can apply for jobs.')
-            return redirect('job_list')
-    except UserProfile.DoesNotExist:
+    profile = request.profile
+    if profile is None:
         messages.error(request, 'Please complete your profile first.')
         return redirect('profile')
+    if profile.user_type != 'jobseeker':
+        messages.error(request, 'Only job seekers can apply for jobs.')
+        return redirect('job_list')
     
-    # Check if already applied
-    already_applied = JobApplication.objects.filter(job=job, applicant=profile).exists()
-    
-    if request.method == 'POST' and not already_applied:
-        # Create application
-        JobApplication.objects.create(job=job, applicant=profile)
-        messages.success(request, f'Successfully applied for {job.title}!')
+    if request.method == 'POST':
+        title = Job.objects.filter(pk=job_id).values_list('title', flat=True).first()
+        if title is None:
+            raise Http404('No Job matches the given query.')
+        # The unique (job, applicant) constraint is the check, so a repeated or
+        # concurrent submit ends the same way as the first one
+        try:
+            with transaction.atomic():
+                # The counter updates commit with it
+                JobApplication.objects.create(job_id=job_id, applicant=profile)
+        except IntegrityError:
+            messages.info(request, f'You have already applied for {title}.')
+        else:
+            messages.success(request, f'Successfully applied for {title}!')
         return redirect('my_applications')
     
-    # Calculate skill match
-    user_skills = profile.get_skills_list()
-    job_skills = job.get_required_skills_list()
-    matched_skills = list(set(user_skills) & set(job_skills))
-    match_percentage = len(matched_skills) / len(job_skills) * 100 if job_skills else 0
+    # One query: the job, its recruiter, the precomputed match and whether this seeker applied
+    job = get_object_or_404(
+        with_seeker_match(Job.objects.select_related('recruiter'), profile).annotate(
+            already_applied=Exists(JobApplication.objects.filter(job=OuterRef('pk'), applicant=profile)),
+        ),
+        pk=job_id,
+    )
+    matched_skills, match_percentage = match_for_job(profile, job)
     
     context = {
         'job': job,
         'profile': profile,
-        'already_applied': already_applied,
+        'already_applied': job.already_applied,
         'matched_skills': matched_skills,
         'match_percentage': match_percentage,
     }
@@ -192,16 +244,18 @@ def apply_job(request, job_id):
 
 @login_required
 def my_applications(request):
-    try:
-        profile = request.user.userprofile
-        if profile.user_type != 'jobseeker':
-            messages.error(request, 'Only job seekers can view applications.')
-            return redirect('dashboard')
-    except UserProfile.DoesNotExist:
+    profile = request.profile
+    if profile is None:
         messages.error(request, 'Please complete your profile first.')
         return redirect('profile')
+    if profile.user_type != 'jobseeker':
+        messages.error(request, 'Only job seekers can view applications.')
+        return redirect('dashboard')
     
-    applications = JobApplication.objects.filter(applicant=profile).order_by('-applied_at')
+    applications = keyset_paginate(
+        JobApplication.objects.filter(applicant=profile).select_related('job__recruiter'),
+        ['-applied_at', '-id'], request.GET.get('cursor'), with_count=True,
+    )
     
     return render(request, 'jobportal/my_applications.html', {
         'applications': applications,
@@ -210,18 +264,17 @@ def my_applications(request):
 
 @login_required
 def job_applications(request, job_id=None):
-    try:
-        profile = request.user.userprofile
-        if profile.user_type != 'recruiter':
-            messages.error(request, 'Only recruiters can view job applications.')
-            return redirect('dashboard')
-    except UserProfile.DoesNotExist:
+    profile = request.profile
+    if profile is None:
         messages.error(request, 'Please complete your profile first.')
         return redirect('profile')
+    if profile.user_type != 'recruiter':
+        messages.error(request, 'Only recruiters can view job applications.')
+        return redirect('dashboard')
     
     if job_id:
         job = get_object_or_404(Job, id=job_id, recruiter=profile)
-        applications = JobApplication.objects.filter(job=job).order_by('-applied_at')
+        applications = JobApplication.objects.filter(job=job).select_related('applicant__user').order_by('-applied_at')
         context = {
             'job': job,
             'applications': applications,
@@ -231,7 +284,11 @@ def job_applications(request, job_id=None):
     else:
         # Show all applications for all recruiter's jobs
         recruiter_jobs = Job.objects.filter(recruiter=profile)
-        applications = JobApplication.objects.filter(job__in=recruiter_jobs).order_by('-applied_at')
+        # The total comes from profile.applications_received, so no COUNT query
+        applications = keyset_paginate(
+            JobApplication.objects.filter(job__recruiter=profile).select_related('job', 'applicant__user'),
+            ['-applied_at', '-id'], request.GET.get('cursor'),
+        )
         context = {
             'applications': applications,
             'profile': profile,
@@ -239,64 +296,219 @@ def job_applications(request, job_id=None):
         }
         return render(request, 'jobportal/all_applications.html', context)
 
+@login_required
+def export_applications(request, job_id=None):
+    profile = request.profile
+    if profile is None:
+        messages.error(request, 'Please complete your profile first.')
+        return redirect('profile')
+    if profile.user_type != 'recruiter':
+        messages.error(request, 'Only recruiters can export job applications.')
+        return redirect('dashboard')
+
+    export_format = request.GET.get('format', 'csv')
+    if export_format not in EXPORT_FORMATS:
+        export_format = 'csv'
+    job = get_object_or_404(Job, id=job_id, recruiter=profile) if job_id else None
+
+    # The download URL ends in "<profile_id>/": reverse it once and append each
+    # id, as reversing per row costs more than the rest of the row's formatting
+    resume_prefix = request.build_absolute_uri(reverse('resume_download', args=[0])).removesuffix('0/')
+    records = export_records(application_rows(profile, job), lambda profile_id: f'{resume_prefix}{profile_id}/')
+    stream = stream_csv(records) if export_format == 'csv' else stream_jsonl(records)
+    filename = f"applications-{job.id if job else 'all'}-{timezone.now():%Y%m%d}.{export_format}"
+    return StreamingHttpResponse(stream, content_type=EXPORT_FORMATS[export_format], headers={
+        'Content-Disposition': content_disposition_header(True, filename),
+    })
+
 @login_required
 def skill_match(request):
-    try:
-        profile = request.user.userprofile
-    except UserProfile.DoesNotExist:
+    profile = request.profile
+    if profile is None:
         messages.error(request, 'Please complete your profile first.')
         return redirect('profile')
     
     matched_jobs = []
     
     if profile.user_type == 'jobseeker':
-        user_skills = profile.get_skills_list()
-        if user_skills:
-            for job in Job.objects.all():
-                job_skills = job.get_required_skills_list()
-                matches = set(user_skills) & set(job_skills)
-                if matches:
-                    matched_jobs.append({
-                        'job': job,
-                        'matched_skills': list(matches),
-                        'match_percentage': len(matches) / len(job_skills) * 100 if job_skills else 0
-                    })
-        
-        matched_jobs.sort(key=lambda x: x['match_percentage'], reverse=True)
+        matched_jobs = matched_jobs_for_seeker(profile)
+        attach_job_cards([match.job for match in matched_jobs], 'skill_match')
     
     elif profile.user_type == 'recruiter':
         # For recruiters, show job seekers that match their job requirements
-        recruiter_jobs = Job.objects.filter(recruiter=profile)
-        for job in recruiter_jobs:
-            job_skills = job.get_required_skills_list()
-            if job_skills:
-                for seeker_profile in UserProfile.objects.filter(user_type='jobseeker'):
-                    seeker_skills = seeker_profile.get_skills_list()
-                    matches = set(job_skills) & set(seeker_skills)
-                    if matches:
-                        matched_jobs.append({
-                            'job': job,
-                            'seeker': seeker_profile,
-                            'matched_skills': list(matches),
-                            'match_percentage': len(matches) / len(job_skills) * 100
-                        })
-        
-        matched_jobs.sort(key=lambda x: x['match_percentage'], reverse=True)
+        matched_jobs = attach_resume_skills(matched_seekers_for_recruiter(profile))
     
     return render(request, 'jobportal/skill_match.html', {
         'matched_jobs': matched_jobs,
         'profile': profile
     })
 
+@login_required
+def candidate_search(request):
+    profile = request.profile
+    if profile is None:
+        messages.error(request, 'Please complete your profile first.')
+        return redirect('profile')
+    if profile.user_type != 'recruiter':
+        messages.error(request, 'Only recruiters can search candidates.')
+        return redirect('dashboard')
+
+    search_query = request.GET.get('q', '').strip()
+    candidates = None
+    if search_query:
+        seekers = search_candidates(UserProfile.objects.filter(user_type='jobseeker').select_related('user'), search_query)
+        ordering = ['search_rank', 'id'] if 'search_rank' in seekers.query.annotations else ['-updated_at', '-id']
+        candidates = keyset_paginate(seekers, ordering, request.GET.get('cursor'), with_count=True)
+        for candidate in candidates:
+            candidate.snippet_parts = split_snippet(getattr(candidate, 'resume_snippet', ''))
+    return render(request, 'jobportal/candidate_search.html', {
+        'candidates': candidates,
+        'search_query': search_query,
+        'profile': profile,
+    })
+
+@login_required
+def recruiter_analytics(request):
+    profile = request.profile
+    if profile is None:
+        messages.error(request, 'Please complete your profile first.')
+        return redirect('profile')
+    if profile.user_type != 'recruiter':
+        messages.error(request, 'Only recruiters can view analytics.')
+        return redirect('dashboard')
+
+    try:
+        days = int(request.GET.get('days', 30))
+    except ValueError:
+        days = 30
+    if days not in analytics.ANALYTICS_PERIODS:
+        days = 30
+    return render(request, 'jobportal/analytics.html', {
+        'report': analytics.recruiter_report(profile, days),
+        'periods': analytics.ANALYTICS_PERIODS,
+        'profile': profile,
+    })
+
+@require_safe
+@gzip_page
+def api_jobs(request):
+    search_query = request.GET.get('search')
+    category = request.GET.get('category')
+    cursor = request.GET.get('cursor')
+    try:
+        fields = api.parse_fields(request.GET.get('fields'), api.JOB_FIELDS, api.JOB_DEFAULT_FIELDS)
+        per_page = api.parse_limit(request.GET.get('limit')) or settings.PAGINATION_PAGE_SIZE
+    except api.ApiError as e:
+        return api.api_error(str(e), e.status)
+
+    def fetch_page():
+        jobs = Job.objects.all()
+        ordering = ['-created_at', '-id']
+        if search_query:
+            jobs = search_jobs(jobs, search_query)
+            if 'search_rank' in jobs.query.annotations:
+                ordering.insert(0, 'search_rank')
+        if category:
+            jobs = jobs.filter(category=category)
+        rows = api.select_fields(jobs, fields, api.JOB_FIELDS, ordering)
+        return api.page_payload(keyset_paginate(rows, ordering, cursor, per_page), fields)
+
+    params = {
+        'search': normalize_search(search_query),
+        'category': category,
+        'cursor': cursor,
+        'per_page': per_page,
+        'fields': ','.join(fields),
+    }
+    if 'application_count' in fields:
+        # Applications do not move the jobs version, so this field is never cached
+        return api.api_response(fetch_page())
+    return api.api_response(cached_job_result('api_jobs', params, fetch_page))
+
+@require_safe
+@gzip_page
+def api_matches(request):
+    try:
+        profile = api.request_profile(request)
+        if profile.user_type == 'recruiter':
+            # Candidates for one of the recruiter's jobs
+            job_id = request.GET.get('job', '')
+            if not job_id.isdigit():
+                raise api.ApiError('Recruiters must pass ?job=<job id>')
+            matches = JobMatch.objects.filter(job_id=job_id, job__recruiter=profile)
+            available, default = api.CANDIDATE_MATCH_FIELDS, api.CANDIDATE_MATCH_DEFAULT_FIELDS
+            ordering = ['-match_percentage', 'seeker_id']
+        else:
+            matches = JobMatch.objects.filter(seeker=profile)
+            available, default = api.SEEKER_MATCH_FIELDS, api.SEEKER_MATCH_DEFAULT_FIELDS
+            ordering = ['-match_percentage', 'job_id']
+        fields = api.parse_fields(request.GET.get('fields'), available, default)
+        per_page = api.parse_limit(request.GET.get('limit'))
+    except api.ApiError as e:
+        return api.api_error(str(e), e.status)
+
+    rows = api.select_fields(matches, fields, available, ordering)
+    page = keyset_paginate(rows, ordering, request.GET.get('cursor'), per_page)
+    return api.api_response(api.page_payload(page, fields))
+
+@require_safe
+@gzip_page
+def api_applications(request):
+    try:
+        profile = api.request_profile(request)
+        if profile.user_type == 'recruiter':
+            applications = JobApplication.objects.filter(job__recruiter=profile)
+            job_id = request.GET.get('job', '')
+            if job_id.isdigit():
+                applications = applications.filter(job_id=job_id)
+            available, default = api.RECRUITER_APPLICATION_FIELDS, api.RECRUITER_APPLICATION_DEFAULT_FIELDS
+        else:
+            applications = JobApplication.objects.filter(applicant=profile)
+            available, default = api.SEEKER_APPLICATION_FIELDS, api.SEEKER_APPLICATION_DEFAULT_FIELDS
+        fields = api.parse_fields(request.GET.get('fields'), available, default)
+        per_page = api.parse_limit(request.GET.get('limit'))
+    except api.ApiError as e:
+        return api.api_error(str(e), e.status)
+
+    ordering = ['-applied_at', '-id']
+    rows = api.select_fields(applications, fields, available, ordering)
+    page = keyset_paginate(rows, ordering, request.GET.get('cursor'), per_page)
+    return api.api_response(api.page_payload(page, fields))
+
+@login_required
+def resume_download(request, profile_id):
+    viewer = request.profile
+    if viewer is None:
+        messages.error(request, 'Please complete your profile first.')
+        return redirect('profile')
+    seeker = get_object_or_404(UserProfile, id=profile_id, user_type='jobseeker')
+    if seeker != viewer and viewer.user_type != 'recruiter':
+        messages.error(request, 'Only recruiters can view resumes.')
+        return redirect('dashboard')
+    if not seeker.resume:
+        raise Http404('No resume uploaded')
+    return serve_stored_file(request, seeker.resume.storage, seeker.resume.name, seeker.resume_filename)
+
+@staff_member_required
+def request_stats(request):
+    # Rolling latency histogram per URL name, for this worker process only
+    return JsonResponse({
+        'views': instrumentation.request_stats.snapshot(),
+        'result_cache': result_cache.cache_stats(),
+        'fragment_cache': fragments.cache_stats(),
+        'throttling': throttling.throttle_stats(),
+    })
+
 
 import random
 from django.conf import settings
 from django.core.cache import cache
-from django.core.mail import send_mail
 from django.shortcuts import render, redirect
 from django.contrib.auth.models import User
+from .outbox import enqueue_email
 
 # Step 1: Forgot Password - Send OTP
+@throttle('password_reset', ip=client_ip, email=post_value('email'))
 def forgot_password(request):
     if request.method == "POST":
         email = request.POST.get('email')
@@ -304,16 +516,13 @@ def forgot_password(request):
             otp = random.randint(1000, 9999)  # 4-digit OTP
             cache.set(email, otp, timeout=300)  # OTP valid for 5 minutes
 
-            try:
-                send_mail(
-                    'Forgot Password OTP',
-                    f"Your OTP is: {otp}",
-                    settings.EMAIL_HOST_USER,
-                    [email],
-                    fail_silently=False
-                )
-            except Exception as e:
-                return render(request, 'forgot_password/password_reset_request.html', {'error': f'Email sending failed: {e}'})
+            # Sent by manage.py run_mail_worker, not inside the request
+            enqueue_email(
+                'Forgot Password OTP',
+                f"Your OTP is: {otp}",
+                [email],
+                settings.EMAIL_HOST_USER,
+            )
 
             request.session['reset_email'] = email
             return redirect('otp_verify')
@@ -324,6 +533,7 @@ def forgot_password(request):
 
 
 # Step 2: OTP Verification
+@throttle('otp', ip=client_ip, email=session_value('reset_email'))
 def otp_verify(request):
     email = request.session.get('reset_email')
     if not email:
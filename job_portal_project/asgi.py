@@ -12,5 +12,7 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'job_portal_project.settings')
+# Serve the async versions of the read-heavy views (see settings.ROOT_URLCONF)
+os.environ.setdefault('ASYNC_VIEWS', 'True')
 
 application = get_asgi_application()
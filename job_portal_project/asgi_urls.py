@@ -0,0 +1,11 @@
+from django.contrib import admin
+from django.urls import path,include
+
+from django.conf import settings
+from django.conf.urls.static import static
+
+# URLconf used under ASGI (ASYNC_VIEWS=True): async read views
+urlpatterns = [
+    path('admin/', admin.site.urls),
+    path('', include('job_manage_app.async_urls')),
+]  + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
@@ -54,16 +54,21 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'job_manage_app.middleware.RequestTimingMiddleware',
+    'job_manage_app.middleware.ReadOnlyRequestMiddleware',
+    'job_manage_app.middleware.ProfileMiddleware',
 ]
 
 # ------------------------
 # URLS + TEMPLATES
 # ------------------------
-ROOT_URLCONF = 'job_portal_project.urls'
+# asgi.py sets ASYNC_VIEWS so ASGI servers get the async read views
+ASYNC_VIEWS = env.bool("ASYNC_VIEWS", default=False)
+ROOT_URLCONF = 'job_portal_project.asgi_urls' if ASYNC_VIEWS else 'job_portal_project.urls'
 
 TEMPLATES = [
     {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        'BACKEND': 'job_manage_app.instrumentation.TimedDjangoTemplates',   # DjangoTemplates + render timing
         'DIRS': [],           # Add templates folder path if you have one
         'APP_DIRS': True,
         'OPTIONS': {
@@ -81,7 +86,9 @@ WSGI_APPLICATION = 'job_portal_project.wsgi.application'
 # ------------------------
 # EMAIL SETTINGS (FROM .env)
 # ------------------------
-EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
+# run_mail_worker sends through this backend; use filebased or console to test without SMTP
+EMAIL_BACKEND = env("EMAIL_BACKEND", default='django.core.mail.backends.smtp.EmailBackend')
+EMAIL_FILE_PATH = BASE_DIR / '.cache' / 'emails'   # used by the filebased backend
 EMAIL_HOST = "smtp.gmail.com"
 EMAIL_PORT = 587
 EMAIL_USE_TLS = True
@@ -91,6 +98,13 @@ EMAIL_HOST_USER = env("EMAIL")               # from .env
 EMAIL_HOST_PASSWORD = env("EMAIL_PASSWORD")  # from .env
 DEFAULT_FROM_EMAIL = EMAIL_HOST_USER
 
+# Outbox drained by manage.py run_mail_worker
+MAIL_OUTBOX_BATCH_SIZE = 50
+MAIL_OUTBOX_MAX_ATTEMPTS = 5
+MAIL_OUTBOX_RETRY_BASE_SECONDS = 30    # doubles after each failed attempt
+MAIL_OUTBOX_RETRY_MAX_SECONDS = 3600
+MAIL_OUTBOX_LEASE_SECONDS = 300        # a claimed email is retried if its worker dies
+
 # ------------------------
 # DATABASE
 # ------------------------
@@ -101,6 +115,50 @@ DATABASES = {
     }
 }
 
+# DB_PROFILE=production tunes SQLite for several concurrent workers:
+# WAL lets readers run while one connection writes, IMMEDIATE transactions
+# take the write lock up front (a deferred read-then-write transaction
+# fails with "database is locked" instead of waiting), and busy_timeout
+# makes writers queue for the lock.
+DB_PROFILE = env("DB_PROFILE", default="development")
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',     # durable at checkpoints; safe from corruption in WAL mode
+    'busy_timeout': 20000,       # milliseconds
+    'cache_size': -20000,        # KiB of page cache per connection
+    'mmap_size': 268435456,
+    'temp_store': 'MEMORY',
+}
+SQLITE_PRODUCTION_OPTIONS = {
+    'init_command': '; '.join(f'PRAGMA {name}={value}' for name, value in SQLITE_PRAGMAS.items()),
+    'transaction_mode': 'IMMEDIATE',
+}
+READ_DATABASE = None   # alias used by ReadReplicaRouter for GET/HEAD requests
+if DB_PROFILE == "production":
+    DATABASES['default'].update({
+        # Persistent connections do not suit async views, which run the ORM on worker threads
+        'CONN_MAX_AGE': 0 if ASYNC_VIEWS else 600,
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': SQLITE_PRODUCTION_OPTIONS,
+    })
+
+# DB_READ_REPLICA sends the reads of GET/HEAD views through a second,
+# query-only connection: to a replica file kept up to date outside Django
+# (e.g. by Litestream), or to the primary file itself
+DB_READ_REPLICA = env("DB_READ_REPLICA", default=None)
+if DB_READ_REPLICA:
+    DATABASES['read'] = {
+        **DATABASES['default'],
+        'NAME': DB_READ_REPLICA,
+        'OPTIONS': {
+            **SQLITE_PRODUCTION_OPTIONS,
+            'init_command': SQLITE_PRODUCTION_OPTIONS['init_command'] + '; PRAGMA query_only=ON',
+        },
+        'TEST': {'MIRROR': 'default'},
+    }
+    READ_DATABASE = 'read'
+DATABASE_ROUTERS = ['job_manage_app.db_router.ReadReplicaRouter']
+
 # ------------------------
 # PASSWORD VALIDATION
 # ------------------------
@@ -128,11 +186,126 @@ STATICFILES_DIRS = [BASE_DIR / 'static']
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Resume downloads stream from Django with Range/ETag support. Behind nginx
+# set "X-Accel-Redirect" (with an internal location at the prefix below),
+# behind Apache "X-Sendfile", to hand the file transfer to the web server.
+RESUME_SENDFILE_HEADER = env("RESUME_SENDFILE_HEADER", default=None)
+RESUME_SENDFILE_PREFIX = '/protected-media/'
+
+# Processes parsing uploaded resumes for candidate search (0: parse in the request)
+RESUME_EXTRACTION_WORKERS = env.int("RESUME_EXTRACTION_WORKERS", default=2)
+
 # ------------------------
 # DEFAULT AUTO FIELD
 # ------------------------
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# ------------------------
+# SKILL MATCHING
+# ------------------------
+SKILL_MATCH_TOP_K = 50   # candidates shown per job on the recruiter skill match page
+
+# ------------------------
+# JOB SEARCH
+# ------------------------
+JOB_SEARCH_FTS = True   # rank job_list search with SQLite FTS5 when the index exists
+
+# ------------------------
+# CACHES
+# ------------------------
+# "results" holds job listing/search pages, "fragments" the rendered job
+# cards and "sessions" the throttle buckets and, when shared, the sessions
+# and signed-in users. LocMem is per process; with several workers use
+# RESULT_CACHE=file or a redis:// URL (any local Redis-protocol server) so
+# invalidations reach every worker.
+RESULT_CACHE = env("RESULT_CACHE", default="locmem")
+if RESULT_CACHE.startswith("redis://"):
+    RESULT_CACHE_BACKEND = {'BACKEND': 'django.core.cache.backends.redis.RedisCache', 'LOCATION': RESULT_CACHE}
+    FRAGMENT_CACHE_BACKEND = {**RESULT_CACHE_BACKEND, 'KEY_PREFIX': 'fragments'}
+    SESSION_CACHE_BACKEND = {**RESULT_CACHE_BACKEND, 'KEY_PREFIX': 'sessions'}
+elif RESULT_CACHE == "file":
+    RESULT_CACHE_BACKEND = {'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache', 'LOCATION': BASE_DIR / '.cache' / 'results'}
+    FRAGMENT_CACHE_BACKEND = {**RESULT_CACHE_BACKEND, 'LOCATION': BASE_DIR / '.cache' / 'fragments'}
+    SESSION_CACHE_BACKEND = {**RESULT_CACHE_BACKEND, 'LOCATION': BASE_DIR / '.cache' / 'sessions'}
+else:
+    RESULT_CACHE_BACKEND = {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'results'}
+    # One entry per job and layout, so more room than the 300 default
+    FRAGMENT_CACHE_BACKEND = {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'fragments',
+        'OPTIONS': {'MAX_ENTRIES': 20000},
+    }
+    SESSION_CACHE_BACKEND = {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'sessions',
+        'OPTIONS': {'MAX_ENTRIES': 20000},
+    }
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'results': RESULT_CACHE_BACKEND,
+    'fragments': FRAGMENT_CACHE_BACKEND,
+    'sessions': SESSION_CACHE_BACKEND,
+}
+RESULT_CACHE_TIMEOUT = 300   # seconds; writes invalidate sooner through the jobs version
+FRAGMENT_CACHE_TIMEOUT = 86400   # fragment keys change with the job, so this only bounds memory
+
+# With a shared cache (file or redis) sessions are read from it and written
+# through to the database, and ProfileBackend caches each user with its
+# profile there too. A per-process LocMem copy would outlive a logout,
+# password change or profile edit made on another worker, so without one
+# sessions stay in the database and users are loaded on every request.
+SHARED_SESSION_CACHE = RESULT_CACHE != "locmem"
+SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db' if SHARED_SESSION_CACHE else 'django.contrib.sessions.backends.db'
+SESSION_CACHE_ALIAS = 'sessions'
+AUTHENTICATION_BACKENDS = ['job_manage_app.auth.ProfileBackend']
+USER_CACHE_ALIAS = 'sessions' if SHARED_SESSION_CACHE else None   # None: no user cache
+USER_CACHE_TIMEOUT = 300   # seconds; saves drop the entry sooner
+
+# ------------------------
+# THROTTLING
+# ------------------------
+# Token buckets for the login and password reset POSTs, "<scope>:<key>":
+# "5/min" allows a burst of 5 and refills 5 tokens a minute. None turns a
+# bucket off. Buckets live in the sessions cache, shared like the sessions.
+THROTTLE_CACHE_ALIAS = 'sessions'
+THROTTLE_RATES = {
+    'login:ip': '30/min',
+    'login:username': '5/min',
+    'password_reset:ip': '10/h',
+    'password_reset:email': '3/h',
+    'otp:ip': '30/min',
+    'otp:email': '5/5min',   # a 4-digit OTP lives 5 minutes
+}
+
+# ------------------------
+# PAGINATION
+# ------------------------
+PAGINATION_PAGE_SIZE = 20
+PAGINATION_COUNT_CAP = 1000   # list counts stop here and show as "1000+"
+API_MAX_PAGE_SIZE = 100   # largest ?limit= the JSON API accepts
+
+# ------------------------
+# REQUEST INSTRUMENTATION
+# ------------------------
+SLOW_REQUEST_THRESHOLD_MS = env.int("SLOW_REQUEST_THRESHOLD_MS", default=500)
+REQUEST_STATS_WINDOW = 1000   # recent requests kept per URL name for /request-stats/
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'job_manage_app.slow_requests': {
+            'handlers': ['console'],
+            'level': 'WARNING',
+            'propagate': False,
+        },
+    },
+}
+
 # ------------------------
 # LOGIN REDIRECT
 # ------------------------